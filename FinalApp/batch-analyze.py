@@ -0,0 +1,10 @@
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(BASE_DIR)
+
+from core.batch import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,502 @@
+import itertools
+import json
+import threading
+
+from core.grammar_algorithms import AnalysisCancelled, Cancellation, GrammarAlgorithms
+from core.workspace import GrammarWorkspace
+
+
+class AppAPI:
+    """
+    API exposed to the frontend (pywebview on desktop, Pyodide in docs/).
+
+    Every method returns a dict with "status" ("success", "error" or
+    "cancelled") plus the data the frontend renders. It does not depend on
+    webview, so the batch mode (core.batch) and scripts use it as well.
+
+    run_algorithm() is synchronous. submit_algorithm() runs the same analysis
+    in a background thread and returns a job id; progress and the response
+    reach the frontend as events (window.onJobEvent), and cancel_job() stops
+    the job at the algorithms' next checkpoint.
+
+    Steps are sent in chunks of STEP_CHUNK as the algorithm produces them:
+    as "steps" job events on desktop, and through open_stream() /
+    read_stream() in the Pyodide build.
+
+    Loaded grammars are kept by name in a GrammarWorkspace: select_grammar()
+    switches between them without parsing again, and run_algorithm() /
+    compare_grammars() reuse the responses already computed for each one.
+
+    run_algorithm("all") returns the ALL_ANALYSES results in one response,
+    computed from a single pass over the productions (see analyze_all);
+    run_analyses() does the same for a subset of them.
+    """
+
+    STEP_CHUNK = 200
+
+    # Analyses computed together by run_algorithm("all") and run_analyses()
+    ALL_ANALYSES = GrammarAlgorithms.ALL_ANALYSES
+
+    def __init__(self):
+        self.grammar = None
+        self.alg = None
+        self.workspace = GrammarWorkspace()
+        self.current = None
+        self._window = None
+        self._jobs = {}
+        self._streams = {}
+        self._next_job = 1
+        self._jobs_lock = threading.Lock()
+
+    def load_grammar(self, productions_text, name=None):
+        """
+        Parses grammar from frontend input and stores it in the workspace.
+
+        `name` defaults to the current grammar, which is then replaced; a new
+        name adds another grammar and makes it the current one.
+        """
+        try:
+            name = name or self.current or self._new_name()
+            entry = self.workspace.add(name, productions_text)
+            self._select(entry)
+
+            return {
+                "status": "success", 
+                "message": "Gramatica guardada con exito.",
+                "data": self.grammar.to_dict(),
+                "name": name,
+                "grammars": self.workspace.names()
+            }
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
+    def select_grammar(self, name):
+        """Makes a workspace grammar the current one; returns its text and structure."""
+        try:
+            entry = self.workspace.get(name)
+        except KeyError:
+            return {"status": "error", "message": f"No existe la gramática {name}"}
+        self._select(entry)
+        return {
+            "status": "success",
+            "name": name,
+            "text": entry.text,
+            "data": self.grammar.to_dict(),
+            "grammars": self.workspace.names()
+        }
+
+    def remove_grammar(self, name):
+        """Removes a grammar from the workspace; the most recently added one becomes current."""
+        self.workspace.remove(name)
+        if name == self.current:
+            names = self.workspace.names()
+            if names:
+                self._select(self.workspace.get(names[-1]))
+            else:
+                self.current = self.grammar = self.alg = None
+        return {"status": "success", "name": self.current, "grammars": self.workspace.names()}
+
+    def list_grammars(self):
+        """Returns the workspace grammars with their estimated memory use."""
+        return {"status": "success", "current": self.current, **self.workspace.stats()}
+
+    def _select(self, entry):
+        self.current = entry.name
+        self.grammar = entry.grammar
+        self.alg = entry.alg
+
+    def _new_name(self):
+        number = len(self.workspace) + 1
+        while f"Gramática {number}" in self.workspace:
+            number += 1
+        return f"Gramática {number}"
+
+    def run_algorithm(self, name):
+        """Runs the requested algorithm and returns structured data."""
+        if not self.grammar or not self.alg:
+            return {"status": "error", "message": "Por favor cargue una gramatica primero."}
+        if self.current not in self.workspace:
+            return self._run(self.alg, name)
+        return self.workspace.result(self.current, name, lambda alg: self._run(alg, name))
+
+    def run_analyses(self, names):
+        """
+        Runs several of ALL_ANALYSES with one shared pass over the productions.
+
+        Only the requested analyses are computed. On success the response has
+        "results": {name: run_algorithm(name)["result"]}.
+        """
+        if not self.grammar or not self.alg:
+            return {"status": "error", "message": "Por favor cargue una gramatica primero."}
+        try:
+            results = self.alg.analyze_all(analyses=names)
+            return {"status": "success",
+                    "results": {n: self._format_result(self.alg, n, r) for n, r in results.items()}}
+        except AnalysisCancelled as e:
+            return {"status": "cancelled", "message": str(e)}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
+    def compare_grammars(self, names, algorithm):
+        """
+        Runs one algorithm over several workspace grammars.
+
+        Responses already computed for a grammar are reused, so comparing
+        again (or after run_algorithm) does not repeat the analysis.
+        """
+        results = {}
+        for name in names:
+            if name not in self.workspace:
+                return {"status": "error", "message": f"No existe la gramática {name}"}
+            results[name] = self.workspace.result(name, algorithm, lambda alg: self._run(alg, algorithm))
+        # Loading the compared grammars may have evicted the current one
+        if self.current in self.workspace:
+            self._select(self.workspace.get(self.current))
+        return {"status": "success", "algorithm": algorithm, "results": results}
+
+    def submit_algorithm(self, name, job_id=None):
+        """
+        Starts the requested algorithm in a background thread.
+
+        Returns {"status": "success", "job": id} immediately. Progress and the
+        final run_algorithm-shaped response are pushed to the frontend through
+        window.onJobEvent (see _emit), or can be polled with job_status().
+        Like run_algorithm(), responses are stored in (and reused from) the
+        workspace.
+
+        The events of a fast or cached job may be sent before this method
+        returns, so the page passes its own `job_id` to know it beforehand.
+        """
+        if not self.grammar or not self.alg:
+            return {"status": "error", "message": "Por favor cargue una gramatica primero."}
+
+        with self._jobs_lock:
+            if job_id is None:
+                job_id = self._next_job
+                self._next_job += 1
+            elif job_id in self._jobs:
+                return {"status": "error", "message": f"El trabajo {job_id} ya existe"}
+            cancellation = Cancellation(progress=lambda count: self._emit(job_id, "progress", {"checks": count}))
+            self._jobs[job_id] = {"state": "running", "cancellation": cancellation, "response": None}
+        # Each job gets its own GrammarAlgorithms (sharing the analysis cache)
+        alg = GrammarAlgorithms(self.grammar, cache=self.alg.cache, cancellation=cancellation)
+        worker = threading.Thread(target=self._run_job, args=(job_id, alg, name, self.current), daemon=True)
+        worker.start()
+        return {"status": "success", "job": job_id}
+
+    def cancel_job(self, job_id):
+        """Asks a running job to stop at its next checkpoint."""
+        with self._jobs_lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return {"status": "error", "message": f"No existe el trabajo {job_id}"}
+        job["cancellation"].cancel()
+        return {"status": "success"}
+
+    def job_status(self, job_id):
+        """Returns the state of a job and, once finished, its response (the job is then forgotten)."""
+        with self._jobs_lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return {"status": "error", "message": f"No existe el trabajo {job_id}"}
+            if job["state"] != "running":
+                del self._jobs[job_id]
+        return {"status": "success", "state": job["state"], "response": job["response"]}
+
+    def attach_window(self, window):
+        """Sets the pywebview window that receives job events."""
+        self._window = window
+
+    def _run_job(self, job_id, alg, name, current):
+        if self._window is None:
+            response = self._cached_run(current, alg.g, name, lambda: self._run(alg, name))
+        else:
+            response = self._cached(current, alg.g, name)
+            if response is not None:
+                response = self._stream_job(job_id, response)
+            else:
+                response = self._cached_run(current, alg.g, name,
+                                            lambda: self._stream_job(job_id, self._run(alg, name, stream=True)))
+            if response["status"] == "success":
+                # The result and steps were already sent as events
+                response = {"status": "success"}
+        with self._jobs_lock:
+            job = self._jobs[job_id]
+            job["state"] = response["status"]
+            job["response"] = response
+            if self._window is not None:
+                # The event delivers the response; nobody needs to poll for it
+                del self._jobs[job_id]
+        self._emit(job_id, "done", response)
+
+    def _cached_run(self, current, grammar, name, compute):
+        """
+        Runs compute() through the workspace cache of the grammar named
+        `current`, as long as that entry still holds `grammar`.
+        """
+        if current not in self.workspace:
+            return compute()
+        return self.workspace.result(current, name, lambda alg: compute(), grammar=grammar)
+
+    def _cached(self, current, grammar, name):
+        """Stored response of `name` for `grammar` (named `current`), or None."""
+        if current is None:
+            return None
+        return self.workspace.cached(current, name, grammar=grammar)
+
+    def _stream_job(self, job_id, response):
+        """
+        Pushes a job's output as soon as it exists: a "result" event without
+        the steps, then "steps" events of up to STEP_CHUNK steps as `response`
+        (possibly with a generator of steps, see _run) produces them. Returns
+        the complete response, with the steps that were sent.
+        """
+        if response["status"] != "success":
+            return response
+        result = dict(response["result"])
+        steps = iter(result.pop("steps", None) or ())
+        self._emit(job_id, "result", {"result": result})
+        sent = []
+        while True:
+            chunk = self._next_chunk(steps, self.STEP_CHUNK)
+            if chunk["status"] != "success":
+                return chunk
+            if chunk["steps"]:
+                sent.extend(chunk["steps"])
+                self._emit(job_id, "steps", {"steps": chunk["steps"]})
+            if chunk["done"]:
+                return {"status": "success", "result": {**result, "steps": sent}}
+
+    def open_stream(self, name):
+        """
+        Runs the requested algorithm and returns its result without the steps,
+        which are then read in chunks with read_stream(). Used by the Pyodide
+        build to render steps progressively.
+
+        A response stored in the workspace is streamed from there; otherwise
+        the complete response is stored once the stream is read to the end.
+        """
+        if not self.grammar or not self.alg:
+            return {"status": "error", "message": "Por favor cargue una gramatica primero."}
+        response = self._cached(self.current, self.grammar, name)
+        stored = response is not None
+        if not stored:
+            response = self._run(self.alg, name, stream=True)
+        if response["status"] != "success":
+            return response
+        result = dict(response["result"])
+        stream = {
+            "steps": iter(result.pop("steps", None) or ()),
+            # Steps read so far, to store the response at the end (None if already stored)
+            "sent": None if stored else [],
+            "result": result,
+            "key": (self.current, self.grammar, name),
+        }
+        with self._jobs_lock:
+            stream_id = self._next_job
+            self._next_job += 1
+            self._streams[stream_id] = stream
+        return {"status": "success", "stream": stream_id, "result": result}
+
+    def read_stream(self, stream_id, max_steps=None):
+        """Returns the next steps of a stream; the stream is closed once "done" is true."""
+        with self._jobs_lock:
+            stream = self._streams.get(stream_id)
+        if stream is None:
+            return {"status": "error", "message": f"No existe el flujo {stream_id}"}
+        chunk = self._next_chunk(stream["steps"], max_steps or self.STEP_CHUNK)
+        if chunk["status"] != "success" or chunk["done"]:
+            self.close_stream(stream_id)
+        sent = stream["sent"]
+        if chunk["status"] == "success" and sent is not None:
+            sent.extend(chunk["steps"])
+            if chunk["done"]:
+                response = {"status": "success", "result": {**stream["result"], "steps": sent}}
+                self._cached_run(*stream["key"], lambda: response)
+        return chunk
+
+    def close_stream(self, stream_id):
+        """Discards a stream that will not be read to the end."""
+        with self._jobs_lock:
+            self._streams.pop(stream_id, None)
+        return {"status": "success"}
+
+    @staticmethod
+    def _next_chunk(steps, size):
+        """Takes up to `size` steps from an iterator, reporting cancellation and errors."""
+        try:
+            chunk = list(itertools.islice(steps, size))
+        except AnalysisCancelled as e:
+            return {"status": "cancelled", "message": str(e)}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+        return {"status": "success", "steps": chunk, "done": len(chunk) < size}
+
+    def _emit(self, job_id, event, payload):
+        """Sends a job event to the frontend (window.onJobEvent), if a window is attached."""
+        if self._window is None:
+            return
+        message = json.dumps({"job": job_id, "event": event, **payload}, ensure_ascii=False)
+        try:
+            self._window.evaluate_js(f"window.onJobEvent && window.onJobEvent({message})")
+        except Exception:
+            # The window may have been closed while the job was running
+            pass
+
+    def _run(self, alg, name, stream=False):
+        """
+        Runs an algorithm with the given GrammarAlgorithms instance.
+
+        With stream=True, "steps" may be a generator that produces the steps
+        as it is consumed (see open_stream).
+        """
+        try:
+            result_data = None
+            
+            if name == "terminating":
+                result_data = self._format_result(alg, name, alg.compute_terminating_variables(stream=stream))
+
+            elif name == "nullable":
+                result_data = self._format_result(alg, name, alg.compute_nullable_variables(stream=stream))
+
+            elif name == "reachable":
+                result_data = self._format_result(alg, name, alg.compute_reachable_variables(stream=stream))
+
+            elif name == "unit":
+                result_data = self._format_result(alg, name, alg.compute_all_unit_closures())
+
+            elif name == "all":
+                # One shared pass over the productions (see analyze_all)
+                results = alg.analyze_all()
+                result_data = {
+                    "type": "all",
+                    "title": "Análisis completo",
+                    "value": {n: self._format_result(alg, n, results[n]) for n in self.ALL_ANALYSES}
+                }
+
+            elif name == "first":
+                res, steps = alg.compute_first_sets(stream=stream)
+                result_data = {
+                    "type": "dict", 
+                    "title": "Conjuntos PRIM (FIRST)", 
+                    "value": {v: sorted(s) for v, s in res.items()},
+                    "steps": steps
+                }
+
+            elif name == "follow":
+                res, steps = alg.compute_follow_sets(stream=stream)
+                result_data = {
+                    "type": "dict", 
+                    "title": "Conjuntos SIG (FOLLOW)", 
+                    "value": {v: sorted(s) for v, s in res.items()},
+                    "steps": steps
+                }
+
+            elif name == "ll1":
+                table, conflicts = alg.build_ll1_table()
+                columns = sorted(alg.g.terminals) + ['$']
+                steps = []
+                for i, conflict in enumerate(conflicts):
+                    steps.append({
+                        "iteration": f"Conflicto {i+1}",
+                        "variables": f"M[{conflict['variable']}, {conflict['terminal']}]",
+                        "explanation": f"{conflict['kind']}: {conflict['variable']} → {' | '.join(conflict['productions'])}",
+                        "type": "ll1"
+                    })
+                steps.append({
+                    "iteration": "Resultado Final",
+                    "variables": "Gramática LL(1)" if not conflicts else f"{len(conflicts)} conflictos",
+                    "explanation": "Cada celda de la tabla tiene a lo sumo una producción" if not conflicts
+                                   else "La gramática no es LL(1)",
+                    "type": "ll1"
+                })
+                result_data = {
+                    "type": "table", 
+                    "title": "Tabla LL(1)", 
+                    "value": {"columns": columns, "rows": table},
+                    "steps": steps
+                }
+
+            elif name == "useless":
+                result_data = self._format_result(alg, name, alg.eliminate_useless_variables())
+
+            elif name == "epsilon":
+                new_g, steps = alg.eliminate_epsilon_productions()
+                result_data = {
+                    "type": "grammar", 
+                    "title": "Gramática sin producciones λ", 
+                    "value": new_g.to_dict(),
+                    "steps": steps
+                }
+
+            elif name == "unit_productions":
+                new_g, steps = alg.eliminate_unit_productions()
+                result_data = {
+                    "type": "grammar", 
+                    "title": "Gramática sin producciones unitarias", 
+                    "value": new_g.to_dict(),
+                    "steps": steps
+                }
+
+            elif name == "cnf":
+                new_g, steps = alg.to_cnf()
+                result_data = {
+                    "type": "grammar", 
+                    "title": "Forma Normal de Chomsky", 
+                    "value": new_g.to_dict(),
+                    "steps": steps
+                }
+            
+            else:
+                return {"status": "error", "message": f"Unknown algorithm: {name}"}
+
+            return {"status": "success", "result": result_data}
+
+        except AnalysisCancelled as e:
+            return {"status": "cancelled", "message": str(e)}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
+    @staticmethod
+    def _format_result(alg, name, output):
+        """Builds the result data of one of ALL_ANALYSES from the algorithm's output."""
+        if name == "unit":
+            res = {}
+            steps = []
+            for i, v in enumerate(sorted(alg.g.variables)):
+                closure = sorted(output[v])
+                res[v] = closure
+                steps.append({
+                    "iteration": f"Clausura {i+1}",
+                    "variables": f"{v} → {{{', '.join(closure)}}}",
+                    "explanation": f"Clausura unitaria de {v}",
+                    "type": "unit"
+                })
+            return {
+                "type": "dict", 
+                "title": "Clausuras unitarias", 
+                "value": res,
+                "steps": steps
+            }
+
+        if name == "useless":
+            new_g, steps = output
+            return {
+                "type": "grammar", 
+                "title": "Gramatica Simplificada", 
+                "value": new_g.to_dict(),
+                "steps": steps
+            }
+
+        res, steps = output
+        titles = {
+            "terminating": "Variables Terminables",
+            "nullable": "Variables Anulables",
+            "reachable": "Variables Alcanzables",
+        }
+        return {
+            "type": "set", 
+            "title": titles[name], 
+            "value": sorted(list(res)),
+            "steps": steps
+        }
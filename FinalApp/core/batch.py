@@ -0,0 +1,210 @@
+import argparse
+import json
+import os
+import sys
+import time
+from core.app_api import AppAPI
+from core.grammar_algorithms import Cancellation
+from core.pool import process_pool, worker_state
+
+# Análisis que se ejecutan por omisión (nombres de AppAPI.run_algorithm)
+DEFAULT_ALGORITHMS = ("terminating", "nullable", "reachable", "unit", "useless")
+
+
+def analyze_grammar(text, algorithms=DEFAULT_ALGORITHMS, timeout=None, steps=True):
+    """
+    Ejecuta varios análisis sobre el texto de una gramática.
+
+    Usa AppAPI, así que cada resultado tiene la misma forma que en la
+    interfaz. El tiempo límite se aplica a la gramática completa (todos sus
+    análisis) de forma cooperativa (ver Cancellation).
+
+    Args:
+        text (str): Producciones, una regla por línea ("S -> aS | λ").
+        algorithms (iterable): Nombres de análisis de AppAPI.run_algorithm.
+        timeout (float, opcional): Segundos disponibles para la gramática.
+        steps (bool): Si es False, se omiten los pasos de cada resultado.
+
+    Retorna:
+        dict: {
+            "status": "success", "error" o "timeout",
+            "message": descripción del error (si lo hay),
+            "results": { análisis: resultado de run_algorithm },
+            "elapsed": segundos empleados
+        }
+    """
+    started = time.perf_counter()
+    api = AppAPI()
+    record = {"status": "success", "results": {}}
+    loaded = api.load_grammar(text)
+    if loaded["status"] != "success":
+        record["status"] = "error"
+        record["message"] = loaded["message"]
+    else:
+        api.alg.cancellation = Cancellation(timeout)
+        # Los análisis pedidos de AppAPI.ALL_ANALYSES se calculan juntos con
+        # una sola llamada a run_analyses(), que recorre las producciones una vez
+        algorithms = tuple(algorithms)
+        shared = list(dict.fromkeys(name for name in algorithms if name in AppAPI.ALL_ANALYSES))
+        combined = None
+        for name in algorithms:
+            label = name
+            if len(shared) > 1 and name in shared:
+                label = ", ".join(shared)
+                if combined is None:
+                    combined = api.run_analyses(shared)
+                res = combined
+                if res["status"] == "success":
+                    res = {"status": "success", "result": res["results"][name]}
+            else:
+                res = api.run_algorithm(name)
+            if res["status"] == "cancelled":
+                record["status"] = "timeout"
+                record["message"] = f"{res['message']} en {label}"
+                break
+            if res["status"] != "success":
+                record["status"] = "error"
+                record["message"] = f"{label}: {res['message']}"
+                break
+            result = res["result"]
+            if not steps:
+                result = _without_steps(result)
+            record["results"][name] = result
+    record["elapsed"] = round(time.perf_counter() - started, 6)
+    return record
+
+
+def _without_steps(result):
+    """Copia de un resultado sin sus pasos (también los anidados de "all")."""
+    result = {k: v for k, v in result.items() if k != "steps"}
+    if result.get("type") == "all":
+        result["value"] = {n: _without_steps(r) for n, r in result["value"].items()}
+    return result
+
+
+def analyze_file(path, algorithms=DEFAULT_ALGORITHMS, timeout=None, steps=True):
+    """
+    Lee una gramática de un archivo UTF-8 y la analiza con analyze_grammar.
+
+    Un archivo que no se puede leer o no está en UTF-8 da un registro con
+    estado "error" en lugar de interrumpir el lote.
+
+    Retorna:
+        dict: El registro de analyze_grammar con la ruta en "file".
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        return {"file": path, "status": "error", "message": str(e), "results": {}, "elapsed": 0.0}
+    return {"file": path, **analyze_grammar(text, algorithms, timeout, steps)}
+
+
+def collect_files(paths, pattern_suffixes=(".txt", ".cfg", ".glc")):
+    """
+    Expande archivos y directorios (recursivamente) en una lista ordenada de archivos.
+
+    Args:
+        paths (iterable): Archivos o directorios.
+        pattern_suffixes (tuple): Extensiones aceptadas dentro de los directorios.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                files.extend(os.path.join(root, name) for name in sorted(names)
+                             if name.endswith(pattern_suffixes))
+        else:
+            files.append(path)
+    return files
+
+
+def run_batch(files, output, algorithms=DEFAULT_ALGORITHMS, workers=None, chunksize=16,
+              timeout=None, steps=True):
+    """
+    Analiza muchos archivos y escribe un registro JSON por línea (JSON Lines).
+
+    Con más de un proceso, los archivos se reparten entre un pool en bloques
+    de hasta `chunksize` (más pequeños si no alcanzan para todos los
+    procesos); los registros se escriben en el orden de `files` a medida que
+    llegan, sin esperar al final del lote.
+
+    Args:
+        files (list): Rutas de las gramáticas.
+        output (archivo de texto): Destino de las líneas JSON.
+        algorithms (iterable): Análisis a ejecutar sobre cada gramática.
+        workers (int, opcional): Número de procesos; con 1 se analiza en el
+            proceso actual. Por omisión, el número de CPUs.
+        chunksize (int): Máximo de archivos por tarea enviada a cada proceso.
+        timeout (float, opcional): Segundos por gramática.
+        steps (bool): Incluir los pasos de cada análisis.
+
+    Retorna:
+        dict: Número de registros por estado ("success", "error", "timeout").
+    """
+    algorithms = tuple(algorithms)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    summary = {"success": 0, "error": 0, "timeout": 0}
+
+    def write(record):
+        summary[record["status"]] += 1
+        output.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    if workers <= 1:
+        for path in files:
+            write(analyze_file(path, algorithms, timeout, steps))
+        return summary
+
+    chunksize = max(1, min(chunksize, -(-len(files) // workers)))
+    with process_pool(workers, (algorithms, timeout, steps)) as executor:
+        for record in executor.map(_analyze_in_worker, files, chunksize=chunksize):
+            write(record)
+    return summary
+
+
+def _analyze_in_worker(path):
+    return analyze_file(path, *worker_state())
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos; devuelve el código de salida."""
+    parser = argparse.ArgumentParser(
+        description="Analiza por lotes archivos de gramáticas y escribe los resultados en JSON Lines.")
+    parser.add_argument("paths", nargs="+",
+                        help="Archivos de gramática o directorios (se recorren recursivamente).")
+    parser.add_argument("-o", "--output", help="Archivo de salida (por omisión, la salida estándar).")
+    parser.add_argument("-a", "--algorithms", default=",".join(DEFAULT_ALGORITHMS),
+                        help="Análisis separados por comas (por omisión: %(default)s).")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Número de procesos (por omisión, el número de CPUs).")
+    parser.add_argument("-c", "--chunksize", type=int, default=16,
+                        help="Archivos por tarea enviada a cada proceso (por omisión: %(default)s).")
+    parser.add_argument("-t", "--timeout", type=float, default=None,
+                        help="Segundos disponibles por gramática.")
+    parser.add_argument("--no-steps", action="store_true",
+                        help="Omitir los pasos de cada análisis.")
+    parser.add_argument("--suffixes", default=".txt,.cfg,.glc",
+                        help="Extensiones de archivo buscadas en los directorios (por omisión: %(default)s).")
+    args = parser.parse_args(argv)
+
+    if args.chunksize < 1:
+        parser.error("--chunksize debe ser al menos 1")
+    algorithms = [a.strip() for a in args.algorithms.split(",") if a.strip()]
+    files = collect_files(args.paths, tuple(s.strip() for s in args.suffixes.split(",") if s.strip()))
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        summary = run_batch(files, output, algorithms, args.workers, args.chunksize,
+                            args.timeout, not args.no_steps)
+    finally:
+        if args.output:
+            output.close()
+    print(f"{len(files)} gramáticas: {summary['success']} correctas, {summary['error']} con error, "
+          f"{summary['timeout']} fuera de tiempo", file=sys.stderr)
+    return 0 if summary["success"] == len(files) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
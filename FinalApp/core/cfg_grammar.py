@@ -1,3 +1,8 @@
+import hashlib
+import json
+import weakref
+
+
 class CFGGrammar:
     """
     Representación de una Gramática Libre de Contexto (GLC).
@@ -18,20 +23,243 @@ class CFGGrammar:
             Convierte las producciones en un formato interno y actualiza los conjuntos de
             variables y terminales.
 
+        add_production(lhs, rhs) / remove_production(lhs, rhs):
+            Agregan o quitan una única alternativa y avisan del cambio a los
+            observadores, que pueden actualizar sus resultados de forma
+            incremental (ver IncrementalAnalysis).
+
+        copy_with(productions, variables, terminals, start_symbol):
+            Crea una gramática nueva directamente a partir de un diccionario de
+            producciones, sin formatear ni volver a analizar texto. Las listas
+            de alternativas que no cambian se comparten con copia al escribir.
+
         to_dict():
             Devuelve una representación en diccionario de la gramática, útil para
             su uso en la interfaz o frontend.
+
+        compact():
+            Devuelve la vista compacta (CompactGrammar) con símbolos internados
+            como enteros, sobre la que trabajan los algoritmos.
+
+        fingerprint():
+            Devuelve una huella (hash SHA-256) del contenido de la gramática,
+            usada como clave de la caché de análisis.
+
+        invalidate():
+            Descarta la vista compacta y la huella, y avisa a los observadores
+            (cachés y análisis incrementales) de que la gramática cambió.
+            Se llama automáticamente al analizar o reasignar producciones; debe
+            llamarse a mano si se modifican directamente las listas de
+            producciones o los conjuntos de símbolos. Como las listas pueden
+            estar compartidas con otras gramáticas (ver copy_with), una lista
+            que se modifica directamente debe reemplazarse antes por una copia.
     """
 
     def __init__(self, variables=None, terminals=None, productions=None, start_symbol='S'):
         self.variables = set(variables or [])
         self.terminals = set(terminals or [])
-        self.productions = {}  # Format: { 'S': ['AB', 'a'], ... }
+        self._productions = {}  # Format: { 'S': ['AB', 'a'], ... }
+        self._shared = set()    # Lados izquierdos cuya lista comparte otra gramática
+        self._compact = None
+        self._fingerprint = None
+        self._observers = weakref.WeakSet()
         self.start_symbol = start_symbol
 
         if productions:
             self.parse_productions(productions)
 
+    @property
+    def productions(self):
+        """Diccionario de producciones { 'S': ['AB', 'a'], ... }."""
+        return self._productions
+
+    @productions.setter
+    def productions(self, value):
+        self._productions = value
+        self._shared = set()
+        self.invalidate()
+
+    def copy_with(self, productions=None, variables=None, terminals=None, start_symbol=None):
+        """
+        Crea una gramática nueva a partir de estructuras de producciones.
+
+        No se formatea ni se analiza texto: las alternativas deben estar ya
+        normalizadas ('λ' para la cadena vacía) y los conjuntos de símbolos no
+        se infieren. Los argumentos omitidos se toman de esta gramática.
+
+        Las listas de alternativas de `productions` que son las mismas listas
+        (no copias) de esta gramática se comparten entre ambas, y cualquiera de
+        las dos copia la suya antes de modificarla (add_production,
+        remove_production, parse_productions), así que encadenar
+        transformaciones no copia las producciones que no cambian.
+
+        Args:
+            productions (dict, opcional): { lhs: lista de alternativas }.
+            variables (iterable, opcional): Símbolos no terminales.
+            terminals (iterable, opcional): Símbolos terminales.
+            start_symbol (str, opcional): Símbolo inicial.
+
+        Retorna:
+            CFGGrammar: La gramática nueva.
+        """
+        grammar = CFGGrammar(
+            variables=self.variables if variables is None else variables,
+            terminals=self.terminals if terminals is None else terminals,
+            start_symbol=self.start_symbol if start_symbol is None else start_symbol,
+        )
+        grammar._productions = dict(self._productions if productions is None else productions)
+        owners = {id(rhs_list): lhs for lhs, rhs_list in self._productions.items()}
+        for lhs, rhs_list in grammar._productions.items():
+            owner = owners.get(id(rhs_list))
+            if owner is not None:
+                grammar._shared.add(lhs)
+                self._shared.add(owner)
+        return grammar
+
+    def _unshare(self, lhs):
+        """Reemplaza por una copia propia la lista de `lhs` si está compartida."""
+        if lhs in self._shared:
+            self._shared.discard(lhs)
+            if lhs in self._productions:
+                self._productions[lhs] = list(self._productions[lhs])
+
+    def invalidate(self):
+        """Descarta la vista compacta y la huella, y avisa a los observadores."""
+        self._changed(None)
+
+    def _changed(self, change):
+        """
+        Descarta los datos derivados y notifica el cambio a los observadores.
+
+        Args:
+            change (tuple o None): ('add', lhs, rhs) o ('remove', lhs, rhs) para
+                una sola alternativa; None si el cambio es arbitrario.
+        """
+        previous = self._fingerprint
+        self._compact = None
+        self._fingerprint = None
+        for observer in list(self._observers):
+            observer.grammar_changed(self, previous, change)
+
+    def add_observer(self, observer):
+        """
+        Registra un objeto con método `grammar_changed(grammar, fingerprint, change)`,
+        que se llama con la huella anterior (o None si no se había calculado) y
+        la descripción del cambio cada vez que la gramática se modifica.
+        """
+        self._observers.add(observer)
+
+    def remove_observer(self, observer):
+        """Deja de notificar cambios a un observador."""
+        self._observers.discard(observer)
+
+    def add_production(self, lhs, rhs):
+        """
+        Agrega la alternativa lhs → rhs.
+
+        Args:
+            lhs (str): Variable del lado izquierdo.
+            rhs (str): Lado derecho; 'λ', 'ε', 'epsilon' o '' representan λ.
+
+        Retorna:
+            str: El lado derecho normalizado que se agregó.
+        """
+        lhs = lhs.strip()
+        rhs = self._register_alternative(lhs, rhs.strip())
+        self._unshare(lhs)
+        self._productions.setdefault(lhs, []).append(rhs)
+        self._changed(('add', lhs, rhs))
+        return rhs
+
+    def remove_production(self, lhs, rhs):
+        """
+        Quita una aparición de la alternativa lhs → rhs.
+
+        Los símbolos siguen en los conjuntos de variables y terminales aunque ya
+        no aparezcan en ninguna producción. Si la variable se queda sin
+        alternativas, se elimina su entrada del diccionario.
+
+        Args:
+            lhs (str): Variable del lado izquierdo.
+            rhs (str): Lado derecho; 'λ', 'ε', 'epsilon' o '' representan λ.
+
+        Retorna:
+            str: El lado derecho normalizado que se quitó.
+        """
+        lhs = lhs.strip()
+        rhs = self._normalize_alternative(rhs.strip())
+        self._unshare(lhs)
+        alternatives = self._productions.get(lhs)
+        if not alternatives or rhs not in alternatives:
+            raise ValueError(f"No existe la producción {lhs} -> {rhs}")
+        alternatives.remove(rhs)
+        if not alternatives:
+            del self._productions[lhs]
+        self._changed(('remove', lhs, rhs))
+        return rhs
+
+    @staticmethod
+    def _normalize_alternative(alt):
+        """Normaliza las formas de epsilon/lambda como 'λ'."""
+        if alt in ['λ', 'ε', 'epsilon', '']:
+            return 'λ'
+        return alt
+
+    def _register_alternative(self, lhs, alt):
+        """
+        Agrega a los conjuntos de símbolos la variable `lhs` y los símbolos de
+        la alternativa `alt`.
+
+        Retorna:
+            str: La alternativa normalizada.
+        """
+        self.variables.add(lhs)
+        clean_alt = self._normalize_alternative(alt)
+        if clean_alt != 'λ':
+            # Inferir símbolos
+            for char in clean_alt:
+                if char.isupper():
+                    self.variables.add(char)
+                else:
+                    self.terminals.add(char)
+        return clean_alt
+
+    def fingerprint(self):
+        """
+        Devuelve la huella canónica de la gramática.
+
+        Incluye el símbolo inicial, los conjuntos de variables y terminales y
+        las producciones en su orden (el orden influye en la agrupación de los
+        pasos). Se calcula una vez y se conserva hasta la próxima invalidación.
+
+        Retorna:
+            str: Resumen hexadecimal SHA-256.
+        """
+        if self._fingerprint is None:
+            canonical = json.dumps(
+                [
+                    self.start_symbol,
+                    sorted(self.variables),
+                    sorted(self.terminals),
+                    list(self._productions.items()),
+                ],
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+            self._fingerprint = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        return self._fingerprint
+
+    def compact(self):
+        """
+        Devuelve la vista compacta de la gramática, construyéndola si hace falta.
+
+        Retorna:
+            CompactGrammar: Símbolos internados y producciones codificadas.
+        """
+        if self._compact is None:
+            self._compact = CompactGrammar(self)
+        return self._compact
+
     def parse_productions(self, lines):
         """
         Analiza una lista de cadenas de producción.
@@ -64,26 +292,18 @@ class CFGGrammar:
             # Separa alternativas del RHS por '|'
             alternatives = [alt.strip() for alt in rhs_block.split('|')]
 
+            self._unshare(lhs)
             if lhs not in self.productions:
                 self.productions[lhs] = []
 
             for alt in alternatives:
-                # Maneja epsilon/lambda explícitamente
-                if alt in ['λ', 'ε', 'epsilon', '']:
-                    clean_alt = 'λ'
-                else:
-                    clean_alt = alt
-                    # Inferir símbolos
-                    for char in clean_alt:
-                        if char.isupper():
-                            self.variables.add(char)
-                        else:
-                            self.terminals.add(char)
-                
+                # Maneja epsilon/lambda explícitamente e infiere los símbolos
+                clean_alt = self._register_alternative(lhs, alt)
                 self.productions[lhs].append(clean_alt)
 
         # Asegura que el símbolo inicial esté en el conjunto de variables
         self.variables.add(self.start_symbol)
+        self.invalidate()
 
     def to_dict(self):
         """
@@ -103,3 +323,87 @@ class CFGGrammar:
             "start": self.start_symbol,
             "productions": {k: v for k, v in self.productions.items()}
         }
+
+
+class Production:
+    """
+    Producción codificada con identificadores enteros de símbolos.
+
+    Atributos:
+        lhs (int): Identificador de la variable del lado izquierdo.
+        rhs (tuple): Identificadores de los símbolos del lado derecho
+            (tupla vacía para λ).
+        is_epsilon (bool): Indica si la producción es A → λ.
+    """
+
+    __slots__ = ("lhs", "rhs", "is_epsilon")
+
+    def __init__(self, lhs, rhs, is_epsilon=False):
+        self.lhs = lhs
+        self.rhs = rhs
+        self.is_epsilon = is_epsilon
+
+
+class CompactGrammar:
+    """
+    Vista compacta de una CFGGrammar con símbolos internados como enteros densos.
+
+    Los identificadores se asignan primero a los lados izquierdos, en el orden
+    del diccionario de producciones (así `lhs < lhs_count` y el orden de los
+    identificadores coincide con el de recorrido de las producciones), y luego
+    al resto de símbolos en orden alfabético.
+
+    Atributos:
+        symbols (list): Símbolo de cada identificador.
+        ids (dict): Identificador de cada símbolo.
+        is_variable (list): Indica, por identificador, si el símbolo es variable.
+        is_terminal (list): Indica, por identificador, si el símbolo es terminal.
+        lhs_count (int): Número de variables con producciones.
+        productions (list): Lista de Production en el orden del diccionario.
+        rules (list): Producciones de cada lado izquierdo (índice < lhs_count).
+        start (int): Identificador del símbolo inicial.
+    """
+
+    def __init__(self, grammar):
+        productions = grammar.productions
+        self.symbols = list(productions)
+        self.ids = {s: i for i, s in enumerate(self.symbols)}
+        self.lhs_count = len(self.symbols)
+
+        others = set(grammar.variables) | set(grammar.terminals) | {grammar.start_symbol}
+        for rhs_list in productions.values():
+            for rhs in rhs_list:
+                if rhs != 'λ':
+                    others.update(rhs)
+        for s in sorted(others - self.ids.keys()):
+            self.ids[s] = len(self.symbols)
+            self.symbols.append(s)
+
+        self.is_variable = [s in grammar.variables for s in self.symbols]
+        self.is_terminal = [s in grammar.terminals for s in self.symbols]
+        self.start = self.ids[grammar.start_symbol]
+
+        ids = self.ids
+        self.productions = []
+        self.rules = []
+        for lhs, rhs_list in productions.items():
+            lhs_id = ids[lhs]
+            rules = []
+            for rhs in rhs_list:
+                if rhs == 'λ':
+                    production = Production(lhs_id, (), True)
+                else:
+                    production = Production(lhs_id, tuple(ids[s] for s in rhs))
+                rules.append(production)
+            self.rules.append(rules)
+            self.productions.extend(rules)
+
+    def text(self, production):
+        """Devuelve el lado derecho de una producción como cadena ('λ' si es vacía)."""
+        if production.is_epsilon:
+            return 'λ'
+        return ''.join(self.symbols[s] for s in production.rhs)
+
+    def names(self, ids):
+        """Devuelve el conjunto de símbolos correspondiente a unos identificadores."""
+        return {self.symbols[i] for i in ids}
@@ -0,0 +1,224 @@
+import os
+
+from core.grammar_algorithms import GrammarAlgorithms, _digraph
+from core.pool import process_pool, worker_state
+
+
+class CYKRecognizer:
+    """
+    Reconocedor CYK para decidir si una cadena pertenece al lenguaje de una GLC.
+
+    Trabaja sobre una vista en forma normal binaria de la gramática, construida
+    una sola vez en tiempo lineal (variante de Lange y Leiß del algoritmo CYK):
+        - Los lados derechos de longitud >= 2 se binarizan con variables
+          internas, y sus terminales se sustituyen por variables T_a → a.
+        - Las producciones λ no se eliminan: se usan las variables anulables
+          (compute_nullable_variables) para convertir A → BC en la relación
+          unitaria A ⇒ B (si C es anulable) y A ⇒ C (si B es anulable).
+        - Las celdas se cierran bajo la relación unitaria inversa.
+
+    La tabla se guarda traspuesta: para cada variable y cada longitud, una
+    máscara de bits (un entero de Python) con las posiciones iniciales de los
+    segmentos que deriva. Así una regla A → BC combina, para cada partición,
+    todas las posiciones a la vez con un AND y un desplazamiento, en lugar de
+    recorrer celda por celda.
+
+    Atributos:
+        g (CFGGrammar): Gramática reconocida.
+
+    Métodos:
+        recognize(word):
+            Indica si `word` (cadena o secuencia de terminales) pertenece al lenguaje.
+
+        recognize_many(words, workers=None, chunksize=64, executor=None):
+            Reconoce muchas cadenas reutilizando las tablas precalculadas, en
+            un pool propio (las tablas se envían una sola vez a cada proceso)
+            o en uno ya creado por quien llama.
+    """
+
+    def __init__(self, grammar):
+        self.g = grammar
+        self._tables = _build_tables(grammar)
+
+    def recognize(self, word):
+        """
+        Indica si una cadena pertenece al lenguaje de la gramática.
+
+        Args:
+            word (str o secuencia): Cadena de terminales; 'λ' o '' es la cadena vacía.
+
+        Retorna:
+            bool: True si la cadena es derivable desde el símbolo inicial.
+        """
+        return _recognize(self._tables, word)
+
+    def recognize_many(self, words, workers=None, chunksize=64, executor=None):
+        """
+        Reconoce un lote de cadenas.
+
+        Args:
+            words (iterable): Cadenas a reconocer.
+            workers (int, opcional): Número de procesos del pool propio. Con 1
+                (o un lote que cabe en una sola tarea) se reconoce en el
+                proceso actual; por omisión se usa el número de CPUs.
+            chunksize (int): Cadenas por tarea enviada a cada proceso.
+            executor (Executor, opcional): Pool de quien llama, reutilizable
+                entre llamadas; las tablas viajan entonces con cada tarea y
+                `workers` se ignora.
+
+        Retorna:
+            list: Un bool por cadena, en el mismo orden.
+        """
+        words = list(words)
+        if executor is not None:
+            chunks = [words[i:i + chunksize] for i in range(0, len(words), chunksize)]
+            tables = [self._tables] * len(chunks)
+            return [result for chunk in executor.map(_recognize_chunk, tables, chunks)
+                    for result in chunk]
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 1 or len(words) <= chunksize:
+            return [_recognize(self._tables, w) for w in words]
+        with process_pool(workers, self._tables) as pool:
+            return list(pool.map(_recognize_in_worker, words, chunksize=chunksize))
+
+
+def _recognize_in_worker(word):
+    return _recognize(worker_state(), word)
+
+
+def _recognize_chunk(tables, words):
+    return [_recognize(tables, w) for w in words]
+
+
+def _build_tables(grammar):
+    """
+    Construye la vista binaria de la gramática y sus tablas de reconocimiento.
+
+    Retorna:
+        tuple: (variables que derivan cada terminal, lista de reglas binarias
+            (B, C, variables que derivan BC), número de variables,
+            identificador del símbolo inicial, si el símbolo inicial es anulable).
+    """
+    nullable_names, _ = GrammarAlgorithms(grammar).compute_nullable_variables(trace="off")
+
+    ids = {}
+    nullable = []
+
+    def new_variable(is_nullable):
+        nullable.append(is_nullable)
+        return len(nullable) - 1
+
+    def variable(name):
+        if name not in ids:
+            ids[name] = new_variable(name in nullable_names)
+        return ids[name]
+
+    pseudo_terminals = {}
+    terminal_heads = {}   # terminal → variables A con A → a
+    units = []            # (A, B): A ⇒ B
+    binary = []           # (A, B, C): A → BC
+
+    def operand(symbol):
+        if symbol in grammar.variables:
+            return variable(symbol)
+        # Terminal dentro de un lado derecho largo: T_a → a
+        if symbol not in pseudo_terminals:
+            t = new_variable(False)
+            pseudo_terminals[symbol] = t
+            terminal_heads.setdefault(symbol, []).append(t)
+        return pseudo_terminals[symbol]
+
+    variable(grammar.start_symbol)
+    for lhs, rhs_list in grammar.productions.items():
+        head = variable(lhs)
+        for rhs in rhs_list:
+            if rhs == 'λ':
+                continue
+            if len(rhs) == 1:
+                if rhs in grammar.variables:
+                    units.append((head, variable(rhs)))
+                else:
+                    terminal_heads.setdefault(rhs, []).append(head)
+                continue
+            # Binarización de derecha a izquierda: A → X1 N1, N1 → X2 N2, ...
+            operands = [operand(s) for s in rhs]
+            right = operands[-1]
+            for left in reversed(operands[1:-1]):
+                inner = new_variable(nullable[left] and nullable[right])
+                binary.append((inner, left, right))
+                right = inner
+            binary.append((head, operands[0], right))
+
+    for a, b, c in binary:
+        if nullable[c]:
+            units.append((a, b))
+        if nullable[b]:
+            units.append((a, c))
+
+    # Cierre unitario inverso: up[B] = { A : A ⇒* B }, sobre el grafo B → A
+    # condensado en componentes fuertemente conexas.
+    count = len(nullable)
+    reverse = [[] for _ in range(count)]
+    for a, b in units:
+        reverse[b].append(a)
+    up, _ = _digraph(reverse, [1 << v for v in range(count)])
+
+    def members(mask):
+        return tuple(v for v in range(count) if mask >> v & 1)
+
+    terminal_variables = {}
+    for terminal, heads in terminal_heads.items():
+        mask = 0
+        for h in heads:
+            mask |= up[h]
+        terminal_variables[terminal] = members(mask)
+
+    pair_heads = {}
+    for a, b, c in binary:
+        pair_heads[(b, c)] = pair_heads.get((b, c), 0) | up[a]
+    pairs = [(b, c, members(mask)) for (b, c), mask in pair_heads.items()]
+
+    start = ids[grammar.start_symbol]
+    return terminal_variables, pairs, count, start, nullable[start]
+
+
+def _recognize(tables, word):
+    """
+    Algoritmo CYK sobre la tabla traspuesta.
+
+    spans[v][l - 1] tiene el bit i si la variable v deriva word[i:i + l]. Para
+    A → BC y una partición en k, las posiciones donde se aplica la regla son
+    spans[B][k - 1] & (spans[C][l - k - 1] >> k).
+    """
+    terminal_variables, pairs, count, start, start_nullable = tables
+    if word == 'λ':
+        word = ''
+    n = len(word)
+    if n == 0:
+        return start_nullable
+
+    spans = [[0] for _ in range(count)]
+    for i, symbol in enumerate(word):
+        variables = terminal_variables.get(symbol)
+        if not variables:
+            return False
+        for v in variables:
+            spans[v][0] |= 1 << i
+
+    for length in range(2, n + 1):
+        row = [0] * count
+        for b, c, heads in pairs:
+            left, right = spans[b], spans[c]
+            found = 0
+            for split in range(1, length):
+                lefts = left[split - 1]
+                if lefts:
+                    found |= lefts & (right[length - split - 1] >> split)
+            if found:
+                for h in heads:
+                    row[h] |= found
+        for v in range(count):
+            spans[v].append(row[v])
+
+    return bool(spans[start][n - 1] & 1)
@@ -0,0 +1,260 @@
+from core.grammar_algorithms import GrammarAlgorithms
+
+
+class EarleyRecognizer:
+    """
+    Reconocedor de Earley en línea sobre las producciones de una CFGGrammar.
+
+    No requiere convertir la gramática a FNC: trabaja directamente sobre la
+    vista compacta y resuelve las producciones λ con la corrección de Aycock y
+    Horspool, es decir, al predecir una variable anulable también se avanza el
+    punto sobre ella. Las predicciones se precalculan por variable a partir de
+    compute_nullable_variables, de modo que predecir una variable en una
+    columna es copiar una tabla.
+
+    Solo se predicen las producciones productivas: las de variables
+    terminables (compute_terminating_variables) cuyos símbolos son todos
+    terminales o variables terminables. Así cualquier ítem puede completarse
+    con alguna cadena, y un símbolo aceptado por feed() siempre continúa un
+    prefijo de alguna cadena del lenguaje.
+
+    La entrada se consume símbolo a símbolo con feed(); en cuanto un símbolo no
+    puede continuar ningún prefijo viable, feed() devuelve False y la posición
+    queda en `failed_at`. Cada columna se conserva solo mientras algún ítem
+    vivo la use como origen (conteo de referencias) y se libera en cuanto deja
+    de usarse. Con recursión por la derecha (p. ej. S → aS) cada columna sigue
+    siendo origen de un ítem pendiente, así que en el peor caso la memoria
+    crece con la longitud de la entrada.
+
+    Atributos:
+        g (CFGGrammar): Gramática reconocida.
+        position (int): Número de símbolos consumidos.
+        failed_at (int o None): Posición del primer símbolo que no forma un
+            prefijo viable, o None.
+
+    Métodos:
+        feed(symbol):
+            Consume un símbolo terminal; devuelve False si la entrada ya no es
+            prefijo de ninguna cadena del lenguaje.
+
+        finish():
+            Indica si la entrada consumida pertenece al lenguaje.
+
+        reset():
+            Vuelve al estado inicial para reconocer otra entrada.
+
+        recognize(word):
+            Atajo que reconoce una cadena completa.
+    """
+
+    def __init__(self, grammar):
+        self.g = grammar
+        compact = grammar.compact()
+        self._compact = compact
+        alg = GrammarAlgorithms(grammar)
+        nullable_names, _ = alg.compute_nullable_variables(trace="off")
+        generating_names, _ = alg.compute_terminating_variables(trace="off")
+        self._nullable = [s in nullable_names for s in compact.symbols]
+        productive = [not compact.is_variable[i] or s in generating_names
+                      for i, s in enumerate(compact.symbols)]
+        # Índices en compact.productions de las producciones productivas de cada variable
+        self._offsets = [[] for _ in range(compact.lhs_count)]
+        for p, production in enumerate(compact.productions):
+            if productive[production.lhs] and all(productive[s] for s in production.rhs):
+                self._offsets[production.lhs].append(p)
+        self._predictions = [self._prediction_closure(v) for v in range(compact.lhs_count)]
+        self.reset()
+
+    def _prediction_closure(self, variable):
+        """
+        Ítems (producción, punto) con origen en la columna actual que se
+        obtienen al predecir `variable`, avanzando sobre variables anulables.
+
+        Retorna:
+            tuple: (ítems, variables predichas en el cierre).
+        """
+        compact = self._compact
+        productions = compact.productions
+        offsets = self._offsets
+        items = []
+        seen = set()
+        predicted = {variable}
+        queue = [(p, 0) for p in offsets[variable]]
+        while queue:
+            item = queue.pop()
+            if item in seen:
+                continue
+            seen.add(item)
+            items.append(item)
+            p, dot = item
+            rhs = productions[p].rhs
+            if dot == len(rhs):
+                continue
+            symbol = rhs[dot]
+            if not compact.is_variable[symbol]:
+                continue
+            if symbol not in predicted:
+                predicted.add(symbol)
+                if symbol < compact.lhs_count:
+                    queue.extend((q, 0) for q in offsets[symbol])
+            if self._nullable[symbol]:
+                queue.append((p, dot + 1))
+        return tuple(items), frozenset(predicted)
+
+    def reset(self):
+        """Descarta la entrada consumida y prepara la columna 0."""
+        self.position = 0
+        self.failed_at = None
+        self._columns = {}   # columna → { símbolo esperado: [ítems] }
+        self._refs = {}      # columna → ítems guardados con ese origen
+        self._accepting = False
+        start = self._compact.start
+        seed = []
+        if start < self._compact.lhs_count:
+            seed = [(p, dot, 0) for p, dot in self._predictions[start][0]]
+        self._build_column(0, seed, {start} if seed else set())
+
+    def feed(self, symbol):
+        """
+        Consume un símbolo terminal.
+
+        Args:
+            symbol (str): Símbolo de la entrada.
+
+        Retorna:
+            bool: True si la entrada sigue siendo prefijo de alguna cadena del
+                lenguaje; False en caso contrario.
+        """
+        if self.failed_at is not None:
+            return False
+        previous = self.position
+        compact = self._compact
+        symbol_id = compact.ids.get(symbol)
+        scanned = []
+        if symbol_id is not None and not compact.is_variable[symbol_id]:
+            scanned = [(p, dot + 1, origin)
+                       for p, dot, origin in self._columns[previous].get(symbol_id, ())]
+
+        if not scanned:
+            self.failed_at = previous
+            self._accepting = False
+            return False
+
+        self.position = previous + 1
+        self._build_column(self.position, scanned, set())
+        self._release_terminals(previous)
+        return True
+
+    def finish(self):
+        """
+        Indica si la entrada consumida hasta ahora pertenece al lenguaje.
+
+        Retorna:
+            bool: True si el símbolo inicial deriva la entrada completa.
+        """
+        return self.failed_at is None and self._accepting
+
+    def recognize(self, word):
+        """
+        Reconoce una cadena completa desde el estado inicial.
+
+        Args:
+            word (str o secuencia): Cadena de terminales; 'λ' es la cadena vacía.
+
+        Retorna:
+            bool: True si la cadena pertenece al lenguaje.
+        """
+        self.reset()
+        if word == 'λ':
+            word = ''
+        for symbol in word:
+            if not self.feed(symbol):
+                return False
+        return self.finish()
+
+    def _build_column(self, k, seed, predicted):
+        """Completa y predice la columna `k` a partir de los ítems iniciales."""
+        compact = self._compact
+        productions = compact.productions
+        is_variable = compact.is_variable
+        nullable = self._nullable
+        predictions = self._predictions
+        start = compact.start
+
+        waiting = {}
+        seen = set()
+        queue = list(seed)
+        accepting = False
+        while queue:
+            item = queue.pop()
+            if item in seen:
+                continue
+            seen.add(item)
+            p, dot, origin = item
+            production = productions[p]
+            rhs = production.rhs
+
+            if dot == len(rhs):
+                if origin == 0 and production.lhs == start:
+                    accepting = True
+                # Los ítems completos con origen k solo derivan λ; la
+                # corrección de Aycock-Horspool ya avanzó sobre ellos.
+                if origin != k:
+                    for wp, wdot, worigin in self._columns[origin].get(production.lhs, ()):
+                        queue.append((wp, wdot + 1, worigin))
+                continue
+
+            symbol = rhs[dot]
+            waiting.setdefault(symbol, []).append(item)
+            if origin != k:
+                self._refs[origin] = self._refs.get(origin, 0) + 1
+            if is_variable[symbol]:
+                if symbol not in predicted and symbol < compact.lhs_count:
+                    items, closure_vars = predictions[symbol]
+                    predicted |= closure_vars
+                    queue.extend((q, qdot, k) for q, qdot in items)
+                if nullable[symbol]:
+                    queue.append((p, dot + 1, origin))
+
+        self._columns[k] = waiting
+        self._refs.setdefault(k, 0)
+        self._accepting = accepting
+
+    def _release_terminals(self, k):
+        """
+        Descarta los ítems de la columna `k` que esperaban un terminal (ya se
+        usaron al leer el siguiente símbolo) y libera las columnas que quedan
+        sin referencias.
+        """
+        is_variable = self._compact.is_variable
+        waiting = self._columns[k]
+        released = []
+        for symbol in [s for s in waiting if not is_variable[s]]:
+            released.extend(origin for _, _, origin in waiting.pop(symbol) if origin != k)
+        self._drop_references(released)
+        if not self._refs[k]:
+            self._drop_column(k)
+
+    def _drop_references(self, origins):
+        """Resta una referencia a cada columna de origen y libera las que quedan sin uso."""
+        for origin in origins:
+            self._refs[origin] -= 1
+            if not self._refs[origin] and origin != self.position:
+                self._drop_column(origin)
+
+    def _drop_column(self, k):
+        """Elimina una columna sin referencias y, en cascada, las que solo ella usaba."""
+        stack = [k]
+        while stack:
+            column = stack.pop()
+            waiting = self._columns.pop(column, None)
+            if waiting is None:
+                continue
+            del self._refs[column]
+            for items in waiting.values():
+                for _, _, origin in items:
+                    if origin == column:
+                        continue
+                    self._refs[origin] -= 1
+                    if not self._refs[origin] and origin != self.position:
+                        stack.append(origin)
@@ -1,230 +1,368 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
 class GrammarAlgorithms:
     """
     Implementa algoritmos estándar para Gramáticas Libres de Contexto (GLC).
 
     Atributos:
         g (CFGGrammar): Instancia de la gramática sobre la cual se aplican los algoritmos.
+        engine (str): Motor de los cálculos de punto fijo:
+            - "worklist": contadores por producción, tiempo lineal.
+            - "bitset": conjuntos como máscaras de bits en un entero; cada
+              producción se comprueba con una sola operación de máscara.
+            - "auto": bitset para gramáticas pequeñas y worklist en el resto.
+
+    Los métodos que devuelven pasos aceptan `trace`:
+        - "full": cada paso incluye el conjunto acumulado (formato de la interfaz).
+        - "delta": cada paso incluye solo las variables nuevas (`newVariables`).
+        - "off": no se generan pasos; se devuelve una lista vacía.
+    Los pasos se producen con generadores, así que el modo "off" no paga el
+    formateo; con `stream=True` (TERM, ANUL, ALC, PRIM y SIG) se devuelve el
+    generador sin consumir, para enviar los pasos a la interfaz por partes.
+
+    Con `cancellation` (una Cancellation) los cálculos comprueban entre etapas,
+    pasos y variables si se canceló el análisis o se superó su tiempo límite,
+    y en ese caso lanzan AnalysisCancelled.
+
+    Los resultados de los análisis (TERM, ANUL, ALC y cierres unitarios) se
+    guardan en una AnalysisCache indexada por la huella de la gramática, de
+    modo que repetir un análisis sobre una gramática sin cambios, o sobre otra
+    con el mismo contenido, no vuelve a calcularlo.
 
     Métodos:
-        __init__(grammar):
+        __init__(grammar, engine="auto", cache=None, cancellation=None):
             Inicializa la clase con una instancia de CFGGrammar.
         
-        compute_terminating_variables():
+        compute_terminating_variables(trace="full"):
             Devuelve el conjunto de variables que eventualmente pueden derivar en
             una cadena de terminales (también conocidas como variables generadoras).
             Retorna además los pasos detallados del proceso.
         
-        compute_reachable_variables(grammar_instance=None):
+        compute_reachable_variables(grammar_instance=None, trace="full"):
             Devuelve el conjunto de variables alcanzables desde el símbolo inicial.
             Puede recibir una instancia de gramática específica para procesar.
             Retorna también los pasos detallados del cálculo.
         
-        compute_nullable_variables():
+        compute_nullable_variables(trace="full"):
             Devuelve el conjunto de variables que pueden derivar epsilon (λ).
             Incluye los pasos iterativos del cálculo.
         
         compute_unit_closure(variable):
             Devuelve el conjunto de variables alcanzables desde 'variable' a través
             de producciones unitarias (A → B).
+
+        compute_all_unit_closures():
+            Devuelve el cierre unitario de todas las variables, calculado en una
+            sola pasada sobre el grafo de producciones unitarias.
         
-        eliminate_useless_variables():
+        track_changes():
+            Devuelve un IncrementalAnalysis que mantiene TERM, ANUL y ALC
+            mientras la gramática se edita con add_production/remove_production.
+            Mientras exista, las consultas con trace="off" se responden desde él.
+
+        compute_first_sets(trace="full") / compute_follow_sets(trace="full"):
+            Devuelven los conjuntos PRIM (FIRST) y SIG (FOLLOW, con '$' como
+            fin de entrada) de cada variable, propagados por componentes
+            fuertemente conexas del grafo de dependencias.
+
+        build_ll1_table():
+            Construye la tabla LL(1) a partir de PRIM y SIG y devuelve además
+            la lista de celdas en conflicto.
+
+        analyze_all(trace="full", analyses=ALL_ANALYSES):
+            Calcula TERM, ANUL, ALC, los cierres unitarios y la eliminación de
+            variables inútiles (o solo los indicados) a partir de un índice de
+            producciones común, construido con un solo recorrido.
+
+        eliminate_useless_variables(trace="full"):
             Elimina variables inútiles en dos pasos:
                 1. Variables no generadoras (no terminables).
                 2. Variables inalcanzables desde el símbolo inicial.
             Devuelve un nuevo objeto CFGGrammar simplificado y los pasos detallados.
+
+        eliminate_epsilon_productions(trace="full", max_productions=None):
+            Elimina las producciones λ sin la expansión exponencial en
+            subconjuntos: los lados derechos con muchos símbolos anulables se
+            parten con variables auxiliares, así que el resultado es lineal.
+
+        eliminate_unit_productions(trace="full", max_productions=None):
+            Elimina las producciones unitarias copiando, a partir de los
+            cierres de compute_all_unit_closures, las producciones no unitarias
+            de cada miembro del cierre.
+
+        to_cnf(trace="full"):
+            Convierte la gramática a Forma Normal de Chomsky (START, TERM, BIN,
+            DEL, UNIT) y devuelve la nueva gramática con el crecimiento por etapa.
     """
 
-    def __init__(self, grammar):
+    ENGINES = ("auto", "worklist", "bitset")
+    TRACES = ("off", "delta", "full")
+
+    # Análisis que analyze_all calcula juntos
+    ALL_ANALYSES = ("terminating", "nullable", "reachable", "unit", "useless")
+
+    # Número máximo de lados izquierdos para el que "auto" elige bitset: con
+    # pocas variables las máscaras caben en pocas palabras y el recorrido por
+    # rondas es más barato que construir el índice de ocurrencias.
+    BITSET_MAX_VARIABLES = 64
+
+    # Límite de producciones de las transformaciones que generan variantes,
+    # para detectar a tiempo una gramática que crecería sin control.
+    MAX_PRODUCTIONS = 100000
+
+    def __init__(self, grammar, engine="auto", cache=None, cancellation=None):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Motor desconocido: {engine}")
         self.g = grammar
+        self.engine = engine
+        self.cache = cache if cache is not None else default_cache
+        self.cancellation = cancellation
+        self._incremental = None
+
+    def track_changes(self):
+        """
+        Activa el análisis incremental de la gramática.
+
+        Solo las consultas con trace="off" de TERM, ANUL y ALC se responden
+        desde el estado incremental. Las consultas con pasos necesitan las
+        rondas completas: tras una edición se reconstruyen la vista compacta y
+        la huella y el análisis se repite desde cero (después queda en caché).
+
+        Retorna:
+            IncrementalAnalysis: Estado que se actualiza con cada
+                add_production / remove_production de la gramática.
+        """
+        if self._incremental is None:
+            self._incremental = IncrementalAnalysis(self.g)
+        return self._incremental
+
+    def _cached(self, grammar, name, compute):
+        """Devuelve el análisis `name` de `grammar` desde la caché o calculándolo."""
+        return self.cache.get_or_compute(grammar, name, compute)
+
+    def _use_bitset(self, compact):
+        """Indica si los cálculos sobre `compact` deben usar el motor bitset."""
+        if self.engine == "auto":
+            return compact.lhs_count <= self.BITSET_MAX_VARIABLES
+        return self.engine == "bitset"
+
+    def _checkpoint(self):
+        """Lanza AnalysisCancelled si el análisis en curso se canceló o expiró."""
+        if self.cancellation is not None:
+            self.cancellation.check()
+
+    def _check_trace(self, trace):
+        """Valida el modo de pasos solicitado."""
+        if trace not in self.TRACES:
+            raise ValueError(f"Modo de pasos desconocido: {trace}")
+
+    def _rounds(self, compact, resolved=None):
+        """Calcula las rondas de punto fijo con el motor seleccionado."""
+        if self._use_bitset(compact):
+            return _fixpoint_rounds_bitset(compact, resolved)
+        return _fixpoint_rounds(compact, resolved)
 
-    def compute_terminating_variables(self):
+    def compute_terminating_variables(self, trace="full", stream=False):
         """
         Calcula las variables terminables (generadoras).
 
+        Usa un motor de lista de trabajo (ver `_fixpoint_rounds`) que recorre cada
+        producción una sola vez, en tiempo lineal en el tamaño de la gramática,
+        y reconstruye la misma agrupación por iteraciones TERM_i del algoritmo
+        iterativo clásico.
+
+        Args:
+            trace (str): Modo de pasos ("full", "delta" u "off").
+            stream (bool): Si es True, los pasos se devuelven como un generador
+                que los produce a medida que se consume (ver AppAPI.open_stream).
+
         Retorna:
             generating (set): Conjunto de variables que pueden derivar cadenas de terminales.
             steps (list): Lista de pasos iterativos detallando el cálculo.
         """
-        steps = []
-        generating = set()
-        
-        # 1. Identificar variables que producen directamente cadenas de terminales
-        step1_vars = set()
-        for lhs, rhs_list in self.g.productions.items():
-            for rhs in rhs_list:
-                if rhs == 'λ' or all(s in self.g.terminals for s in rhs):
-                    generating.add(lhs)
-                    step1_vars.add(lhs)
-        
-        steps.append({
-            "iteration": "TERM_2",
-            "variables": f"{{{', '.join(sorted(step1_vars))}}}" if step1_vars else "∅",
-            "explanation": "Variables con producción directa a terminales",
-            "newVariables": sorted(list(step1_vars))
-        })
-        
-        # 2. Iteración para añadir variables generadoras indirectas
-        iteration = 2
-        changed = True
-        while changed:
-            changed = False
-            new_vars = set()
-            
-            for lhs, rhs_list in self.g.productions.items():
-                if lhs in generating:
-                    continue
-                
-                for rhs in rhs_list:
-                    if rhs == 'λ':
-                        continue
-                    if all(s in self.g.terminals or s in generating for s in rhs):
-                        generating.add(lhs)
-                        new_vars.add(lhs)
-                        changed = True
-                        break
-            
-            if new_vars:
-                steps.append({
-                    "iteration": f"TERM_{iteration}",
-                    "variables": f"{{{', '.join(sorted(generating))}}}",
-                    "explanation": f"Variables con RHS en (Σ ∪ TERM_{iteration-1})*",
-                    "newVariables": sorted(list(new_vars))
-                })
-                iteration += 1
-        
-        steps.append({
+        self._check_trace(trace)
+        self._checkpoint()
+        if trace == "off" and self._incremental is not None:
+            return self._incremental.generating, []
+        generating, by_round = self._cached(self.g, "terminating", self._terminating_analysis)
+        generating = set(generating)
+        if trace == "off":
+            return generating, []
+        steps = self._terminating_steps(by_round, generating, trace)
+        return generating, steps if stream else list(steps)
+
+    def _terminating_analysis(self, index=None):
+        """Calcula TERM y su agrupación por rondas, en forma inmutable para la caché."""
+        compact = self.g.compact()
+        if index is not None:
+            rounds = index.terminating_rounds()
+        else:
+            rounds = self._rounds(compact, compact.is_terminal)
+        return frozenset(compact.names(rounds)), _group_by_round(rounds, compact.symbols)
+
+    def _terminating_steps(self, by_round, generating, trace):
+        """Genera los pasos TERM_i de `compute_terminating_variables`."""
+        # 1. Variables que producen directamente cadenas de terminales
+        # 2. Variables generadoras indirectas, agrupadas por iteración
+        for iteration, new_vars, known in _round_groups(by_round, trace):
+            self._checkpoint()
+            if iteration == 1:
+                step = {"iteration": "TERM_2"}
+                explanation = "Variables con producción directa a terminales"
+            else:
+                step = {"iteration": f"TERM_{iteration}"}
+                explanation = f"Variables con RHS en (Σ ∪ TERM_{iteration-1})*"
+            if known is not None:
+                step["variables"] = f"{{{', '.join(known)}}}" if known else "∅"
+            step["explanation"] = explanation
+            step["newVariables"] = new_vars
+            yield step
+
+        yield {
             "iteration": "Resultado Final",
             "variables": f"{{{', '.join(sorted(generating))}}}",
             "explanation": "Conjunto TERM de variables terminables",
             "type": "terminating"
-        })
-        
-        return generating, steps
+        }
 
-    def compute_reachable_variables(self, grammar_instance=None):
+    def compute_reachable_variables(self, grammar_instance=None, trace="full", stream=False):
         """
         Calcula las variables alcanzables desde el símbolo inicial.
 
         Args:
             grammar_instance (CFGGrammar, opcional): Instancia específica de gramática.
+            trace (str): Modo de pasos ("full", "delta" u "off").
+            stream (bool): Si es True, los pasos se devuelven como un generador
+                que los produce a medida que se consume (ver AppAPI.open_stream).
 
         Retorna:
             reachable (set): Conjunto de variables alcanzables.
             steps (list): Lista de pasos iterativos detallando el cálculo.
         """
+        self._check_trace(trace)
+        self._checkpoint()
         grammar = grammar_instance if grammar_instance else self.g
-        steps = []
+        if trace == "off" and self._incremental is not None and grammar is self.g:
+            return self._incremental.reachable, []
+
+        levels = self._cached(grammar, "reachable", lambda: self._reachable_levels(grammar))
+
         reachable = {grammar.start_symbol}
-        
-        steps.append({
+        for new_vars in levels[1:]:
+            reachable.update(new_vars)
+        if trace == "off":
+            return reachable, []
+        steps = self._reachable_steps(grammar, levels, reachable, trace)
+        return reachable, steps if stream else list(steps)
+
+    def _reachable_levels(self, grammar, index=None):
+        """Calcula los niveles ALC_i de `grammar`, en forma inmutable para la caché."""
+        # BFS por niveles: cada variable se expande una sola vez, cuando entra
+        # a la frontera; el nivel de BFS coincide con la iteración ALC_i.
+        compact = grammar.compact()
+        if index is not None:
+            levels = index.reachable_levels()
+        elif self._use_bitset(compact):
+            levels = _bfs_levels_bitset(compact)
+        else:
+            levels = _bfs_levels(compact)
+        return tuple(frozenset(level) for level in levels)
+
+    def _reachable_steps(self, grammar, levels, reachable, trace):
+        """Genera los pasos ALC_i de `compute_reachable_variables`."""
+        yield {
             "iteration": "ALC₁",
             "variables": f"{{{grammar.start_symbol}}}",
             "explanation": "Símbolo inicial",
             "newVariables": [grammar.start_symbol],
             "type": "reachable"
-        })
-        
-        iteration = 2
-        changed = True
-        while changed:
-            changed = False
-            new_vars = set()
-            current_reachable = list(reachable)
-            
-            for current in current_reachable:
-                if current in grammar.productions:
-                    for rhs in grammar.productions[current]:
-                        if rhs == 'λ': 
-                            continue
-                        for symbol in rhs:
-                            if symbol in grammar.variables and symbol not in reachable:
-                                reachable.add(symbol)
-                                new_vars.add(symbol)
-                                changed = True
-            
-            if new_vars:
-                steps.append({
-                    "iteration": f"ALC_{iteration}",
-                    "variables": f"{{{', '.join(sorted(reachable))}}}",
-                    "explanation": "Variables en producciones de variables alcanzables",
-                    "newVariables": sorted(list(new_vars)),
-                    "type": "reachable"
-                })
-                iteration += 1
-        
-        steps.append({
+        }
+
+        by_level = {i: tuple(sorted(new_vars)) for i, new_vars in enumerate(levels[1:], start=2)}
+        for iteration, new_vars, known in _round_groups(by_level, trace, first=2):
+            self._checkpoint()
+            step = {"iteration": f"ALC_{iteration}"}
+            if known is not None:
+                step["variables"] = f"{{{', '.join(sorted([grammar.start_symbol] + known))}}}"
+            step["explanation"] = "Variables en producciones de variables alcanzables"
+            step["newVariables"] = new_vars
+            step["type"] = "reachable"
+            yield step
+
+        yield {
             "iteration": "Resultado Final",
             "variables": f"{{{', '.join(sorted(reachable))}}}",
             "explanation": "Conjunto ALC de variables alcanzables",
             "type": "reachable"
-        })
-        
-        return reachable, steps
+        }
 
-    def compute_nullable_variables(self):
+    def compute_nullable_variables(self, trace="full", stream=False):
         """
         Calcula las variables anulables (que pueden derivar λ).
 
+        Comparte el motor de lista de trabajo de las variables terminables:
+        ningún símbolo está resuelto de antemano, así que cada producción espera
+        a que todos sus símbolos sean anulables y se visita una vez por cada
+        variable que se vuelve anulable.
+
+        Args:
+            trace (str): Modo de pasos ("full", "delta" u "off").
+            stream (bool): Si es True, los pasos se devuelven como un generador
+                que los produce a medida que se consume (ver AppAPI.open_stream).
+
         Retorna:
             nullable (set): Conjunto de variables anulables.
             steps (list): Lista de pasos iterativos detallando el cálculo.
         """
-        steps = []
-        nullable = set()
+        self._check_trace(trace)
+        self._checkpoint()
+        if trace == "off" and self._incremental is not None:
+            return self._incremental.nullable, []
+        nullable, by_round = self._cached(self.g, "nullable", self._nullable_analysis)
+        nullable = set(nullable)
+        if trace == "off":
+            return nullable, []
+        steps = self._nullable_steps(by_round, nullable, trace)
+        return nullable, steps if stream else list(steps)
 
+    def _nullable_analysis(self, index=None):
+        """Calcula ANUL y su agrupación por rondas, en forma inmutable para la caché."""
+        compact = self.g.compact()
+        if index is not None:
+            rounds = index.nullable_rounds()
+        else:
+            rounds = self._rounds(compact)
+        return frozenset(compact.names(rounds)), _group_by_round(rounds, compact.symbols)
+
+    def _nullable_steps(self, by_round, nullable, trace):
+        """Genera los pasos ANUL_i de `compute_nullable_variables`."""
         # 1. Producciones directas a λ
-        step1_vars = set()
-        for lhs, rhs_list in self.g.productions.items():
-            if 'λ' in rhs_list:
-                nullable.add(lhs)
-                step1_vars.add(lhs)
-        
-        steps.append({
-            "iteration": "ANUL₁",
-            "variables": f"{{{', '.join(sorted(step1_vars))}}}" if step1_vars else "∅",
-            "explanation": "Variables con producción A → λ",
-            "newVariables": sorted(list(step1_vars)),
-            "type": "nullable"
-        })
-        
-        # 2. Descubrimiento iterativo de variables anulables indirectas
-        iteration = 2
-        changed = True
-        while changed:
-            changed = False
-            new_vars = set()
-            
-            for lhs, rhs_list in self.g.productions.items():
-                if lhs in nullable:
-                    continue
-                
-                for rhs in rhs_list:
-                    if rhs == 'λ': 
-                        continue
-                    if all(s in nullable for s in rhs):
-                        nullable.add(lhs)
-                        new_vars.add(lhs)
-                        changed = True
-                        break
-            
-            if new_vars:
-                steps.append({
-                    "iteration": f"ANUL_{iteration}",
-                    "variables": f"{{{', '.join(sorted(nullable))}}}",
-                    "explanation": f"Variables con producción A → w, w ∈ (ANUL_{iteration-1})*",
-                    "newVariables": sorted(list(new_vars)),
-                    "type": "nullable"
-                })
-                iteration += 1
-        
-        steps.append({
+        # 2. Variables anulables indirectas, agrupadas por iteración
+        for iteration, new_vars, known in _round_groups(by_round, trace):
+            self._checkpoint()
+            if iteration == 1:
+                step = {"iteration": "ANUL₁"}
+                explanation = "Variables con producción A → λ"
+            else:
+                step = {"iteration": f"ANUL_{iteration}"}
+                explanation = f"Variables con producción A → w, w ∈ (ANUL_{iteration-1})*"
+            if known is not None:
+                step["variables"] = f"{{{', '.join(known)}}}" if known else "∅"
+            step["explanation"] = explanation
+            step["newVariables"] = new_vars
+            step["type"] = "nullable"
+            yield step
+
+        yield {
             "iteration": "Resultado Final",
             "variables": f"{{{', '.join(sorted(nullable))}}}",
             "explanation": "Conjunto ANUL de variables anulables",
             "type": "nullable"
-        })
-        
-        return nullable, steps
+        }
 
     def compute_unit_closure(self, variable):
         """
@@ -236,32 +374,353 @@ class GrammarAlgorithms:
         Retorna:
             closure (set): Conjunto de variables alcanzables mediante producciones unitarias (A → B).
         """
-        closure = {variable}
-        changed = True
-        while changed:
-            changed = False
-            current_set = list(closure)
-            for v in current_set:
-                if v in self.g.productions:
-                    for rhs in self.g.productions[v]:
-                        if len(rhs) == 1 and rhs in self.g.variables:
-                            if rhs not in closure:
-                                closure.add(rhs)
-                                changed = True
-        return closure
-
-    def eliminate_useless_variables(self):
+        compact = self.g.compact()
+        if variable not in compact.ids:
+            return {variable}
+        start = compact.ids[variable]
+        seen = {start}
+        stack = [start]
+        while stack:
+            v = stack.pop()
+            if v >= compact.lhs_count:
+                continue
+            for production in compact.rules[v]:
+                rhs = production.rhs
+                if len(rhs) == 1 and compact.is_variable[rhs[0]] and rhs[0] not in seen:
+                    seen.add(rhs[0])
+                    stack.append(rhs[0])
+        return compact.names(seen)
+
+    def compute_all_unit_closures(self):
+        """
+        Calcula el cierre unitario de todas las variables en una sola pasada.
+
+        Construye una vez el grafo de producciones unitarias (A → B), colapsa sus
+        componentes fuertemente conexas (todas sus variables comparten cierre) y
+        propaga los cierres sobre el DAG condensado como máscaras de bits, en
+        orden topológico inverso.
+
+        Retorna:
+            closures (dict): { variable: conjunto de variables alcanzables mediante
+                producciones unitarias }, para cada variable de la gramática.
+        """
+        self._checkpoint()
+        closures = self._cached(self.g, "unit", self._unit_closures_analysis)
+        return {v: set(closure) for v, closure in closures.items()}
+
+    def _unit_closures_analysis(self, index=None):
+        """Calcula todos los cierres unitarios, en forma inmutable para la caché."""
+        compact = self.g.compact()
+        if index is not None:
+            edges = index.unit_edges
+        else:
+            is_variable = compact.is_variable
+            edges = [[] for _ in compact.symbols]
+            for production in compact.productions:
+                rhs = production.rhs
+                if len(rhs) == 1 and is_variable[rhs[0]]:
+                    edges[production.lhs].append(rhs[0])
+
+        masks, _ = _digraph(edges, [1 << v for v in range(len(edges))])
+        return {
+            v: frozenset(_mask_to_set(masks[compact.ids[v]], compact.symbols))
+            for v in sorted(self.g.variables)
+        }
+
+    def compute_first_sets(self, trace="full", stream=False):
+        """
+        Calcula el conjunto PRIM (FIRST) de cada variable.
+
+        PRIM(A) contiene los terminales con los que puede empezar una cadena
+        derivada de A, y λ si A es anulable. Se construye la relación
+        A → X cuando X aparece en un lado derecho de A precedido solo por
+        variables anulables (compute_nullable_variables); cada conjunto es la
+        unión de los terminales directos y los conjuntos de sus sucesores, que
+        se propaga una sola vez por componente fuertemente conexa (algoritmo
+        Digraph de DeRemer y Pennello), en tiempo casi lineal.
+
+        Args:
+            trace (str): Modo de pasos ("full", "delta" u "off").
+            stream (bool): Si es True, los pasos se devuelven como un generador
+                que los produce a medida que se consume (ver AppAPI.open_stream).
+
+        Retorna:
+            first (dict): { variable: conjunto de terminales (y λ) }.
+            steps (list): Un paso por componente, en el orden de propagación.
+        """
+        self._check_trace(trace)
+        self._checkpoint()
+        first, order, _ = self._cached(self.g, "first", self._first_analysis)
+        result = {v: set(first[v]) for v in sorted(self.g.variables)}
+        if trace == "off":
+            return result, []
+        steps = self._set_steps(order, first, "PRIM", "first", trace)
+        return result, steps if stream else list(steps)
+
+    def _first_analysis(self):
+        """
+        Calcula PRIM en forma inmutable para la caché.
+
+        Retorna:
+            tuple: (PRIM por variable, componentes de variables en el orden de
+                propagación, máscaras PRIM por identificador compacto sin λ).
+        """
+        compact = self.g.compact()
+        nullable_ids = self._nullable_ids(compact)
+        is_variable = compact.is_variable
+        edges = [[] for _ in compact.symbols]
+        initial = [0 if is_variable[s] else 1 << s for s in range(len(compact.symbols))]
+        for production in compact.productions:
+            successors = edges[production.lhs]
+            for s in production.rhs:
+                successors.append(s)
+                if s not in nullable_ids:
+                    break
+        masks, components = _digraph(edges, initial)
+
+        symbols = compact.symbols
+        first = {}
+        for v in self.g.variables:
+            terminals = _mask_to_set(masks[compact.ids[v]], symbols)
+            if compact.ids[v] in nullable_ids:
+                terminals.add('λ')
+            first[v] = frozenset(terminals)
+        return first, _variable_components(components, compact), tuple(masks)
+
+    def compute_follow_sets(self, trace="full", stream=False):
+        """
+        Calcula el conjunto SIG (FOLLOW) de cada variable.
+
+        SIG(A) contiene los terminales que pueden aparecer inmediatamente
+        después de A en alguna forma sentencial, y '$' (fin de la entrada) si
+        A puede aparecer al final. Para cada producción B → αAβ se agrega
+        PRIM(β) sin λ a SIG(A), y si β es anulable se agrega la relación
+        A → B (SIG(B) ⊆ SIG(A)), que se propaga por componentes fuertemente
+        conexas igual que en compute_first_sets.
+
+        Args:
+            trace (str): Modo de pasos ("full", "delta" u "off").
+            stream (bool): Si es True, los pasos se devuelven como un generador
+                que los produce a medida que se consume (ver AppAPI.open_stream).
+
+        Retorna:
+            follow (dict): { variable: conjunto de terminales (y '$') }.
+            steps (list): Un paso por componente, en el orden de propagación.
+        """
+        self._check_trace(trace)
+        self._checkpoint()
+        follow, order = self._cached(self.g, "follow", self._follow_analysis)
+        result = {v: set(follow[v]) for v in sorted(self.g.variables)}
+        if trace == "off":
+            return result, []
+        steps = self._set_steps(order, follow, "SIG", "follow", trace)
+        return result, steps if stream else list(steps)
+
+    def _follow_analysis(self):
+        """Calcula SIG en forma inmutable para la caché."""
+        compact = self.g.compact()
+        _, _, first_masks = self._cached(self.g, "first", self._first_analysis)
+        nullable_ids = self._nullable_ids(compact)
+        is_variable = compact.is_variable
+        end = len(compact.symbols)   # bit de '$'
+        edges = [[] for _ in compact.symbols]
+        initial = [0] * len(compact.symbols)
+        initial[compact.start] |= 1 << end
+
+        for production in compact.productions:
+            # Recorrido de derecha a izquierda con PRIM del sufijo ya leído
+            trailer = 0
+            trailer_nullable = True
+            for s in reversed(production.rhs):
+                if is_variable[s]:
+                    initial[s] |= trailer
+                    if trailer_nullable:
+                        edges[s].append(production.lhs)
+                if s in nullable_ids:
+                    trailer |= first_masks[s]
+                else:
+                    trailer = first_masks[s]
+                    trailer_nullable = False
+        masks, components = _digraph(edges, initial)
+
+        symbols = compact.symbols + ['$']
+        follow = {v: frozenset(_mask_to_set(masks[compact.ids[v]], symbols))
+                  for v in self.g.variables}
+        return follow, _variable_components(components, compact)
+
+    def _nullable_ids(self, compact):
+        """Identificadores compactos de las variables anulables."""
+        nullable, _ = self.compute_nullable_variables(trace="off")
+        return {compact.ids[v] for v in nullable}
+
+    def _set_steps(self, order, sets, name, step_type, trace):
+        """Genera los pasos de PRIM o SIG, uno por componente propagada."""
+        for i, component in enumerate(order, 1):
+            self._checkpoint()
+            members = sorted(component)
+            step = {"iteration": f"{name}_{i}"}
+            if trace == "full":
+                values = sorted(sets[members[0]])
+                equal = " = ".join(f"{name}({v})" for v in members)
+                step["variables"] = f"{equal} = {{{', '.join(values)}}}" if values else f"{equal} = ∅"
+            if len(members) > 1:
+                step["explanation"] = f"Variables mutuamente dependientes: comparten {name}"
+            else:
+                step["explanation"] = f"{name}({members[0]}) a partir de sus dependencias ya calculadas"
+            step["newVariables"] = members
+            step["type"] = step_type
+            yield step
+
+        yield {
+            "iteration": "Resultado Final",
+            "variables": f"{len(sets)} variables",
+            "explanation": f"Conjuntos {name} de todas las variables",
+            "type": step_type
+        }
+
+    def build_ll1_table(self):
+        """
+        Construye la tabla de análisis LL(1) a partir de PRIM y SIG.
+
+        La producción A → α se coloca en M[A, a] para cada terminal a de
+        PRIM(α), y si α es anulable también en M[A, b] para cada b de SIG(A)
+        (incluido '$'). Una celda con más de una producción es un conflicto.
+
+        Retorna:
+            table (dict): { variable: { terminal: [lados derechos] } }, con las
+                variables en el orden de las producciones y los terminales en
+                orden alfabético ('$' al final).
+            conflicts (list): Un diccionario por celda en conflicto con
+                "variable", "terminal", "productions" y "kind"
+                ("PRIM/PRIM" o "PRIM/SIG"). La gramática es LL(1) si está vacía.
+        """
+        compact = self.g.compact()
+        _, _, first_masks = self._cached(self.g, "first", self._first_analysis)
+        follow, _ = self._cached(self.g, "follow", self._follow_analysis)
+        nullable_ids = self._nullable_ids(compact)
+        symbols = compact.symbols
+
+        table = {}
+        from_follow = set()
+        for lhs_id, rules in enumerate(compact.rules):
+            self._checkpoint()
+            lhs = symbols[lhs_id]
+            row = {}
+            entries = []
+            for production in rules:
+                mask = 0
+                nullable = True
+                for s in production.rhs:
+                    mask |= first_masks[s]
+                    if s not in nullable_ids:
+                        nullable = False
+                        break
+                rhs = compact.text(production)
+                for terminal in _mask_to_set(mask, symbols):
+                    entries.append((terminal, rhs))
+                if nullable:
+                    for terminal in follow[lhs]:
+                        entries.append((terminal, rhs))
+                        from_follow.add((lhs, terminal, rhs))
+            for terminal, rhs in sorted(entries, key=lambda e: (e[0] == '$', e[0])):
+                cell = row.setdefault(terminal, [])
+                if rhs not in cell:
+                    cell.append(rhs)
+            table[lhs] = row
+
+        conflicts = []
+        for lhs, row in table.items():
+            for terminal, cell in row.items():
+                if len(cell) > 1:
+                    by_follow = any((lhs, terminal, rhs) in from_follow for rhs in cell)
+                    conflicts.append({
+                        "variable": lhs,
+                        "terminal": terminal,
+                        "productions": list(cell),
+                        "kind": "PRIM/SIG" if by_follow else "PRIM/PRIM",
+                    })
+        return table, conflicts
+
+    def analyze_all(self, trace="full", analyses=ALL_ANALYSES):
+        """
+        Calcula TERM, ANUL, ALC, los cierres unitarios y la eliminación de
+        variables inútiles con un solo recorrido de las producciones.
+
+        Los cuatro análisis se derivan de un mismo _ProductionIndex (índice de
+        ocurrencias, grafo de sucesores y grafo de producciones unitarias),
+        construido una vez, y se guardan en la caché con las mismas claves que
+        los métodos individuales, que después los reutilizan; si ya estaban en
+        la caché el índice no se construye. La eliminación de variables
+        inútiles parte del TERM ya calculado. Las rondas y los niveles
+        coinciden con los de cualquier motor.
+
+        Args:
+            trace (str): Modo de pasos ("full", "delta" u "off").
+            analyses (iterable): Análisis de ALL_ANALYSES que se calculan; los
+                demás no se calculan ni se devuelven.
+
+        Retorna:
+            dict: Los análisis pedidos, entre {
+                "terminating": (variables terminables, pasos),
+                "nullable": (variables anulables, pasos),
+                "reachable": (variables alcanzables, pasos),
+                "unit": cierres de compute_all_unit_closures,
+                "useless": (gramática sin variables inútiles, pasos)
+            }
+
+        Raises:
+            ValueError: Si algún análisis no está en ALL_ANALYSES.
+        """
+        self._check_trace(trace)
+        analyses = set(analyses)
+        unknown = analyses - set(self.ALL_ANALYSES)
+        if unknown:
+            raise ValueError(f"Análisis desconocidos: {', '.join(sorted(unknown))}")
+        self._checkpoint()
+        shared = []
+
+        def index():
+            if not shared:
+                shared.append(_ProductionIndex(self.g.compact()))
+                self._checkpoint()
+            return shared[0]
+
+        # La eliminación de variables inútiles necesita TERM
+        if analyses & {"terminating", "useless"}:
+            self._cached(self.g, "terminating", lambda: self._terminating_analysis(index()))
+        if "nullable" in analyses:
+            self._cached(self.g, "nullable", lambda: self._nullable_analysis(index()))
+        if "reachable" in analyses:
+            self._cached(self.g, "reachable", lambda: self._reachable_levels(self.g, index()))
+        if "unit" in analyses:
+            self._cached(self.g, "unit", lambda: self._unit_closures_analysis(index()))
+
+        compute = {
+            "terminating": lambda: self.compute_terminating_variables(trace=trace),
+            "nullable": lambda: self.compute_nullable_variables(trace=trace),
+            "reachable": lambda: self.compute_reachable_variables(trace=trace),
+            "unit": self.compute_all_unit_closures,
+            "useless": lambda: self.eliminate_useless_variables(trace=trace),
+        }
+        return {name: compute[name]() for name in self.ALL_ANALYSES if name in analyses}
+
+    def eliminate_useless_variables(self, trace="full"):
         """
         Elimina variables inútiles de la gramática en dos pasos:
 
         1. Eliminación de variables no generadoras (no terminables).
         2. Eliminación de variables inalcanzables desde el símbolo inicial.
 
+        Args:
+            trace (str): Modo de pasos ("full", "delta" u "off"). Se aplica
+                también a los pasos de los cálculos TERM y ALC intermedios.
+
         Retorna:
             new_grammar (CFGGrammar): Nueva gramática simplificada.
             steps (list): Lista de pasos detallando la eliminación de variables.
         """
-        from core.cfg_grammar import CFGGrammar
+        self._check_trace(trace)
+        self._checkpoint()
         steps = []
 
         steps.append({
@@ -272,14 +731,9 @@ class GrammarAlgorithms:
         })
 
         # Paso 1: eliminar variables no generadoras
-        generating, gen_steps = self.compute_terminating_variables()
+        generating, gen_steps = self.compute_terminating_variables(trace=trace)
         for step in gen_steps[:-1]:
-            steps.append({
-                "iteration": f"Gen: {step['iteration']}",
-                "variables": step['variables'],
-                "explanation": step['explanation'],
-                "type": "terminating"
-            })
+            steps.append(_nested_step("Gen", step, "terminating"))
         
         steps.append({
             "iteration": "Paso 1",
@@ -288,29 +742,33 @@ class GrammarAlgorithms:
             "type": "useless"
         })
 
-        # Filtrar producciones según variables generadoras
+        # Filtrar producciones según variables generadoras; en la misma pasada
+        # se construye el grafo de sucesores de la gramática filtrada para ALC.
+        # Las listas sin producciones eliminadas se comparten con la original.
+        compact = self.g.compact()
+        is_variable = compact.is_variable
+        generating_ids = {compact.ids[v] for v in generating}
+        blocked = [is_variable[i] and i not in generating_ids
+                   for i in range(len(compact.symbols))]
         step1_productions = {}
-        removed_vars_step1 = []
-        for lhs in generating:
-            if lhs not in self.g.productions: 
+        successors = [()] * compact.lhs_count
+        for lhs_id, rules in enumerate(compact.rules):
+            self._checkpoint()
+            if lhs_id not in generating_ids:
                 continue
-            
+            lhs = compact.symbols[lhs_id]
+            rhs_list = self.g.productions[lhs]
             valid_rhs_list = []
-            for rhs in self.g.productions[lhs]:
-                if rhs == 'λ':
-                    valid_rhs_list.append(rhs)
-                    continue
-                
-                is_valid = True
-                for char in rhs:
-                    if char in self.g.variables and char not in generating:
-                        is_valid = False
-                        break
-                if is_valid:
+            reached = set()
+            for rhs, production in zip(rhs_list, rules):
+                if not any(blocked[s] for s in production.rhs):
                     valid_rhs_list.append(rhs)
-            
+                    reached.update(s for s in production.rhs if is_variable[s])
             if valid_rhs_list:
+                if len(valid_rhs_list) == len(rhs_list):
+                    valid_rhs_list = rhs_list
                 step1_productions[lhs] = valid_rhs_list
+                successors[lhs_id] = reached
         
         all_vars = set(self.g.variables)
         removed_vars_step1 = sorted(list(all_vars - generating))
@@ -337,24 +795,17 @@ class GrammarAlgorithms:
                 "explanation": "El símbolo inicial no es terminable",
                 "type": "useless"
             })
-            return CFGGrammar(variables=[], terminals=[], productions=[], start_symbol=self.g.start_symbol), steps
-
-        temp_grammar = CFGGrammar(
-            variables=list(generating),
-            terminals=list(self.g.terminals),
-            start_symbol=self.g.start_symbol
-        )
-        temp_grammar.productions = step1_productions
+            if trace == "off":
+                steps = []
+            return self.g.copy_with(productions={}, variables=(), terminals=()), steps
 
         # Paso 2: eliminar variables inalcanzables
-        reachable, reach_steps = self.compute_reachable_variables(grammar_instance=temp_grammar)
-        for step in reach_steps[:-1]:
-            steps.append({
-                "iteration": f"Alc: {step['iteration']}",
-                "variables": step['variables'],
-                "explanation": step['explanation'],
-                "type": "reachable"
-            })
+        levels = _successor_levels(successors, compact.start, compact)
+        reachable = set().union(*levels)
+        if trace != "off":
+            reach_steps = list(self._reachable_steps(self.g, levels, reachable, trace))
+            for step in reach_steps[:-1]:
+                steps.append(_nested_step("Alc", step, "reachable"))
         
         steps.append({
             "iteration": "Paso 2",
@@ -363,17 +814,19 @@ class GrammarAlgorithms:
             "type": "useless"
         })
 
-        final_productions = []
-        final_vars = set()
-        removed_vars_step2 = sorted(list(set(temp_grammar.variables) - reachable))
-
-        for lhs in reachable:
-            if lhs in temp_grammar.productions:
-                rhss = temp_grammar.productions[lhs]
-                if rhss:
-                    line = f"{lhs} -> {' | '.join(rhss)}"
-                    final_productions.append(line)
-                    final_vars.add(lhs)
+        final_productions = {
+            lhs: rhss for lhs, rhss in step1_productions.items() if lhs in reachable
+        }
+        final_vars = set(final_productions)
+        # Variables del resultado como al analizar su texto: los lados
+        # izquierdos, las mayúsculas de los lados derechos y, si queda alguna
+        # producción, el símbolo inicial
+        variables = final_vars | {self.g.start_symbol} if final_productions else set()
+        for rhss in final_productions.values():
+            for rhs in rhss:
+                if rhs != 'λ':
+                    variables.update(c for c in rhs if c.isupper())
+        removed_vars_step2 = sorted(list(generating - reachable))
         
         if removed_vars_step2:
             steps.append({
@@ -397,9 +850,1369 @@ class GrammarAlgorithms:
             "type": "useless"
         })
         
-        return CFGGrammar(
-            variables=list(final_vars),
-            terminals=list(self.g.terminals),
-            productions=final_productions,
-            start_symbol=self.g.start_symbol
-        ), steps
+        if trace == "off":
+            steps = []
+        return self.g.copy_with(productions=final_productions, variables=variables), steps
+
+    def eliminate_epsilon_productions(self, trace="full", max_productions=None):
+        """
+        Elimina las producciones λ preservando el lenguaje.
+
+        Cada producción con variables anulables (compute_nullable_variables)
+        se reemplaza por sus variantes sin esas variables. Para no enumerar los
+        2^k subconjuntos de una producción con k símbolos anulables:
+            - Con k <= 2 se generan directamente las (a lo sumo 4) variantes.
+            - Con k > 2 el lado derecho se parte en los símbolos anulables,
+              A → u0 N1 u1 ... Nk uk, y cada sufijo Ni ui ... Nk uk pasa a ser
+              una variable auxiliar con a lo sumo 4 variantes. Los sufijos
+              repetidos comparten variable, así que el tamaño del resultado es
+              lineal en el de la gramática.
+        Si el símbolo inicial es anulable se conserva S → λ; si además aparece
+        en algún lado derecho se agrega un símbolo inicial nuevo S' → S | λ.
+
+        Args:
+            trace (str): Modo de pasos ("full", "delta" u "off").
+            max_productions (int, opcional): Número máximo de producciones del
+                resultado; por omisión MAX_PRODUCTIONS.
+
+        Retorna:
+            new_grammar (CFGGrammar): Gramática equivalente sin producciones λ
+                (salvo, si corresponde, la del símbolo inicial).
+            steps (list): Lista de pasos del proceso.
+
+        Raises:
+            ValueError: Si el resultado supera `max_productions`.
+        """
+        self._check_trace(trace)
+        self._checkpoint()
+        limit = self.MAX_PRODUCTIONS if max_productions is None else max_productions
+        g = self.g
+        steps = []
+
+        steps.append({
+            "iteration": "Inicio",
+            "variables": "Gramática original",
+            "explanation": "Inicio del proceso de eliminación de producciones λ",
+            "type": "epsilon"
+        })
+
+        # Paso 1: variables anulables
+        nullable, null_steps = self.compute_nullable_variables(trace=trace)
+        for step in null_steps[:-1]:
+            steps.append(_nested_step("Anul", step, "nullable"))
+
+        steps.append({
+            "iteration": "Paso 1",
+            "variables": f"ANUL = {{{', '.join(sorted(nullable))}}}",
+            "explanation": f"Variables anulables encontradas: {len(nullable)} variables",
+            "type": "epsilon"
+        })
+
+        # Paso 2: variantes de cada producción sin los símbolos anulables
+        used = set(g.variables) | set(g.terminals) | {g.start_symbol}
+        for rhs_list in g.productions.values():
+            for rhs in rhs_list:
+                if rhs != 'λ':
+                    used.update(rhs)
+        fresh = _fresh_variables(used)
+        count = 0
+
+        def variants(prefix, optional, middle, tail, tail_nullable):
+            # prefix [optional] middle [tail]: el opcional y la cola pueden faltar
+            bodies = [prefix + optional + middle + tail, prefix + middle + tail]
+            if tail_nullable:
+                bodies += [prefix + optional + middle, prefix + middle]
+            return bodies
+
+        def add(target, bodies):
+            nonlocal count
+            for body in bodies:
+                if body and body not in target:
+                    target[body] = None
+                    count += 1
+                    if count > limit:
+                        raise ValueError(
+                            f"La eliminación de producciones λ supera el límite de {limit} producciones")
+
+        chains = {}        # sufijo → (variable auxiliar, es anulable)
+        chain_rules = {}
+        productions = {}
+        for lhs, rhs_list in g.productions.items():
+            self._checkpoint()
+            kept = {}
+            for rhs in rhs_list:
+                if rhs == 'λ':
+                    continue
+                positions = [i for i, s in enumerate(rhs) if s in nullable]
+                if len(positions) <= 2:
+                    bodies = ['']
+                    start = 0
+                    for i in positions:
+                        bodies = [b + rhs[start:i] + extra for b in bodies for extra in (rhs[i], '')]
+                        start = i + 1
+                    add(kept, [b + rhs[start:] for b in bodies])
+                    continue
+
+                tail, tail_nullable = '', True
+                bounds = positions[1:] + [len(rhs)]
+                for i, end in reversed(list(zip(positions, bounds))):
+                    if not tail and end == i + 1:
+                        # Un anulable final solo sirve de cola opcional
+                        tail = rhs[i]
+                        continue
+                    suffix = rhs[i:]
+                    if suffix not in chains:
+                        var = next(fresh)
+                        chains[suffix] = (var, tail_nullable and end == i + 1)
+                        chain_rules[var] = {}
+                        add(chain_rules[var], variants('', rhs[i], rhs[i + 1:end], tail, tail_nullable))
+                    tail, tail_nullable = chains[suffix]
+                add(kept, [rhs[:positions[0]] + tail] + ([rhs[:positions[0]]] if tail_nullable else []))
+            if kept:
+                kept = list(kept)
+                # Una lista sin cambios se comparte con la gramática original
+                productions[lhs] = rhs_list if kept == rhs_list else kept
+
+        for var, bodies in chain_rules.items():
+            productions[var] = list(bodies)
+        new_vars = list(chain_rules)
+
+        steps.append({
+            "iteration": "Paso 2",
+            "variables": f"{count} producciones sin λ",
+            "explanation": (f"Variantes sin los símbolos anulables; {len(chain_rules)} variables "
+                            f"auxiliares para lados derechos con más de 2 anulables"),
+            "newVariables": sorted(chain_rules),
+            "type": "epsilon"
+        })
+
+        # Paso 3: la cadena vacía sigue en el lenguaje si S es anulable
+        start_symbol = g.start_symbol
+        if start_symbol in nullable:
+            if any(start_symbol in rhs for rhs_list in productions.values() for rhs in rhs_list):
+                new_start = next(fresh)
+                productions = {new_start: [start_symbol, 'λ'], **productions}
+                start_symbol = new_start
+                new_vars.append(new_start)
+                explanation = f"Nuevo símbolo inicial {new_start} → {g.start_symbol} | λ"
+            else:
+                productions[start_symbol] = productions.get(start_symbol, []) + ['λ']
+                explanation = f"Se conserva {start_symbol} → λ"
+            steps.append({
+                "iteration": "Paso 3",
+                "variables": f"{g.start_symbol} es anulable",
+                "explanation": explanation,
+                "type": "epsilon"
+            })
+
+        before = _grammar_size(g.productions)
+        after = _grammar_size(productions)
+        steps.append({
+            "iteration": "Resultado Final",
+            "variables": f"Gramática sin producciones λ con {len(productions)} variables",
+            "explanation": (f"Producciones: {before[0]} → {after[0]}, "
+                            f"tamaño: {before[1]} → {after[1]}"),
+            "type": "epsilon"
+        })
+
+        if trace == "off":
+            steps = []
+        new_grammar = g.copy_with(productions=productions, variables=set(g.variables) | set(new_vars),
+                                  start_symbol=start_symbol)
+        return new_grammar, steps
+
+    def eliminate_unit_productions(self, trace="full", max_productions=None):
+        """
+        Elimina las producciones unitarias (A → B) preservando el lenguaje.
+
+        Los cierres unitarios se calculan una sola vez con
+        compute_all_unit_closures; después cada variable recibe las
+        producciones no unitarias de cada miembro de su cierre. Las producciones
+        no unitarias de cada variable se separan una vez al principio y las
+        listas resultantes se deduplican con diccionarios (orden de inserción),
+        no con búsquedas en listas.
+
+        Args:
+            trace (str): Modo de pasos ("full", "delta" u "off").
+            max_productions (int, opcional): Número máximo de producciones del
+                resultado; por omisión MAX_PRODUCTIONS.
+
+        Retorna:
+            new_grammar (CFGGrammar): Gramática equivalente sin producciones unitarias.
+            steps (list): Lista de pasos del proceso.
+
+        Raises:
+            ValueError: Si el resultado supera `max_productions`.
+        """
+        self._check_trace(trace)
+        self._checkpoint()
+        limit = self.MAX_PRODUCTIONS if max_productions is None else max_productions
+        g = self.g
+        variables = g.variables
+        steps = []
+
+        steps.append({
+            "iteration": "Inicio",
+            "variables": "Gramática original",
+            "explanation": "Inicio del proceso de eliminación de producciones unitarias",
+            "type": "unit"
+        })
+
+        closures = self.compute_all_unit_closures()
+        non_unit = {
+            lhs: [rhs for rhs in rhs_list if not (len(rhs) == 1 and rhs in variables)]
+            for lhs, rhs_list in g.productions.items()
+        }
+
+        productions = {}
+        count = 0
+        for lhs in g.productions:
+            self._checkpoint()
+            members = sorted(closures[lhs] - {lhs})
+            kept = dict.fromkeys(non_unit[lhs])
+            for member in members:
+                kept.update(dict.fromkeys(non_unit.get(member, ())))
+            count += len(kept)
+            if count > limit:
+                raise ValueError(
+                    f"La eliminación de producciones unitarias supera el límite de {limit} producciones")
+            if kept:
+                rhs_list = g.productions[lhs]
+                # Sin cierre ni producciones unitarias, la lista se comparte
+                productions[lhs] = rhs_list if not members and len(kept) == len(rhs_list) else list(kept)
+            if members and trace != "off":
+                step = {"iteration": f"Unit: {lhs}"}
+                if trace == "full":
+                    step["variables"] = f"{lhs} → {{{', '.join([lhs] + members)}}}"
+                step["explanation"] = (f"Se copian a {lhs} las producciones no unitarias "
+                                       f"de {', '.join(members)}")
+                step["newVariables"] = members
+                step["type"] = "unit"
+                steps.append(step)
+
+        before = _grammar_size(g.productions)
+        after = _grammar_size(productions)
+        steps.append({
+            "iteration": "Resultado Final",
+            "variables": f"Gramática sin producciones unitarias con {len(productions)} variables",
+            "explanation": (f"Producciones: {before[0]} → {after[0]}, "
+                            f"tamaño: {before[1]} → {after[1]}"),
+            "type": "unit"
+        })
+
+        if trace == "off":
+            steps = []
+        new_grammar = g.copy_with(productions=productions)
+        return new_grammar, steps
+
+    def to_cnf(self, trace="full"):
+        """
+        Convierte la gramática a Forma Normal de Chomsky (FNC).
+
+        Aplica las etapas en el orden que mantiene el tamaño polinómico:
+            1. START: nuevo símbolo inicial si el actual aparece en algún lado derecho.
+            2. TERM: terminales dentro de lados derechos largos → variables T → a.
+            3. BIN: lados derechos de longitud > 2 → cadenas de producciones
+               binarias (los sufijos repetidos comparten variable).
+            4. DEL: eliminación de producciones λ con
+               eliminate_epsilon_productions. Al binarizar antes, cada
+               producción genera a lo sumo 3 variantes en lugar de 2^k.
+            5. UNIT: eliminación de producciones unitarias con
+               eliminate_unit_productions.
+        Por último se eliminan las variables inútiles (eliminate_useless_variables).
+        Cada etapa informa el tamaño de la gramática resultante.
+
+        Args:
+            trace (str): Modo de pasos ("full", "delta" u "off").
+
+        Retorna:
+            new_grammar (CFGGrammar): Gramática equivalente en FNC (con S → λ
+                solo si el lenguaje contiene la cadena vacía).
+            steps (list): Un paso por etapa con el crecimiento de la gramática.
+        """
+        self._check_trace(trace)
+        self._checkpoint()
+        g = self.g
+        variables = set(g.variables)
+        terminals = set(g.terminals)
+        # Las etapas reemplazan las listas que cambian en lugar de modificarlas,
+        # así que las que no cambian se comparten con la gramática original
+        productions = dict(g.productions)
+        start = g.start_symbol
+        used = variables | terminals | {start}
+        for rhs_list in productions.values():
+            for rhs in rhs_list:
+                used.update(rhs)
+        fresh = _fresh_variables(used)
+
+        steps = []
+        sizes = [_grammar_size(productions)]
+
+        def record(stage, explanation, new_vars):
+            self._checkpoint()
+            size = _grammar_size(productions)
+            before = sizes[-1]
+            sizes.append(size)
+            step = {"iteration": stage}
+            if trace == "full":
+                step["variables"] = (f"{size[0]} producciones ({size[0] - before[0]:+d}), "
+                                     f"tamaño {size[1]} ({size[1] - before[1]:+d})")
+            step["explanation"] = explanation
+            step["newVariables"] = sorted(new_vars)
+            step["type"] = "cnf"
+            steps.append(step)
+
+        # 1. START
+        new_vars = []
+        if any(start in rhs for rhs_list in productions.values() for rhs in rhs_list if rhs != 'λ'):
+            new_start = next(fresh)
+            productions = {new_start: [start], **productions}
+            variables.add(new_start)
+            start = new_start
+            new_vars.append(new_start)
+        record("START", "Nuevo símbolo inicial que no aparece en ningún lado derecho", new_vars)
+
+        # 2. TERM
+        term_vars = {}
+        for lhs, rhs_list in productions.items():
+            replaced = None
+            for i, rhs in enumerate(rhs_list):
+                if rhs == 'λ' or len(rhs) < 2:
+                    continue
+                symbols = []
+                for s in rhs:
+                    if s not in variables:
+                        if s not in term_vars:
+                            term_vars[s] = next(fresh)
+                        s = term_vars[s]
+                    symbols.append(s)
+                new_rhs = ''.join(symbols)
+                if new_rhs != rhs:
+                    if replaced is None:
+                        replaced = list(rhs_list)
+                    replaced[i] = new_rhs
+            if replaced is not None:
+                productions[lhs] = replaced
+        for terminal, var in term_vars.items():
+            productions[var] = [terminal]
+            variables.add(var)
+        record("TERM", "Terminales en lados derechos largos reemplazados por variables T → a",
+               term_vars.values())
+
+        # 3. BIN
+        chains = {}
+        chain_rules = {}
+        for lhs, rhs_list in productions.items():
+            replaced = None
+            for i, rhs in enumerate(rhs_list):
+                if rhs == 'λ' or len(rhs) <= 2:
+                    continue
+                right = rhs[-1]
+                for j in range(len(rhs) - 2, 0, -1):
+                    suffix = rhs[j:]
+                    if suffix not in chains:
+                        chains[suffix] = next(fresh)
+                        chain_rules[chains[suffix]] = [rhs[j] + right]
+                    right = chains[suffix]
+                if replaced is None:
+                    replaced = list(rhs_list)
+                replaced[i] = rhs[0] + right
+            if replaced is not None:
+                productions[lhs] = replaced
+        productions.update(chain_rules)
+        variables.update(chain_rules)
+        record("BIN", "Lados derechos de longitud > 2 divididos en producciones binarias",
+               chain_rules)
+
+        # 4. DEL (tras BIN cada producción tiene a lo sumo 2 símbolos anulables)
+        staged = self._derived(g.copy_with(productions, variables, terminals, start))
+        nullable, _ = staged.compute_nullable_variables(trace="off")
+        epsilon_free, _ = staged.eliminate_epsilon_productions(trace="off")
+        productions = epsilon_free.productions
+        record("DEL", f"Producciones λ eliminadas; ANUL = {{{', '.join(sorted(nullable))}}}", [])
+
+        # 5. UNIT
+        staged = g.copy_with(productions, variables, terminals, start)
+        unit_free, _ = self._derived(staged).eliminate_unit_productions(trace="off")
+        productions = unit_free.productions
+        record("UNIT", "Producciones unitarias reemplazadas por las de su cierre unitario", [])
+
+        # Variables inútiles
+        staged = g.copy_with(productions, variables, terminals, start)
+        new_grammar, _ = self._derived(staged).eliminate_useless_variables(trace="off")
+        productions = new_grammar.productions
+        record("Inútiles", "Variables no generadoras o inalcanzables eliminadas", [])
+
+        total = sizes[-1]
+        steps.append({
+            "iteration": "Resultado Final",
+            "variables": f"Gramática en FNC con {len(new_grammar.productions)} variables",
+            "explanation": (f"Producciones: {sizes[0][0]} → {total[0]}, "
+                            f"tamaño: {sizes[0][1]} → {total[1]}"),
+            "type": "cnf"
+        })
+
+        if trace == "off":
+            steps = []
+        return new_grammar, steps
+
+    def _derived(self, grammar):
+        """GrammarAlgorithms para una gramática intermedia, con el mismo motor, caché y cancelación."""
+        return GrammarAlgorithms(grammar, engine=self.engine, cache=self.cache,
+                                 cancellation=self.cancellation)
+
+
+class AnalysisCache:
+    """
+    Caché LRU de resultados de análisis, indexada por la huella de la gramática.
+
+    Las claves son (huella, nombre del análisis); los valores deben ser
+    inmutables, ya que se comparten entre todas las gramáticas con el mismo
+    contenido. Cuando una gramática registrada se modifica (parse_productions,
+    reasignación de producciones o invalidate()), se descartan las entradas de
+    su huella anterior. Es segura para usarse desde varios hilos.
+
+    Atributos:
+        maxsize (int): Número máximo de entradas (0 desactiva la caché).
+        hits (int): Consultas resueltas desde la caché.
+        misses (int): Consultas que tuvieron que calcularse.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._by_fingerprint = {}   # huella → nombres de sus análisis en la caché
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, grammar, name, compute):
+        """
+        Devuelve el análisis `name` de `grammar`, calculándolo con `compute()` si
+        no está en la caché.
+        """
+        if self.maxsize <= 0:
+            return compute()
+        grammar.add_observer(self)
+        key = (grammar.fingerprint(), name)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        value = compute()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._by_fingerprint.setdefault(key[0], set()).add(name)
+            while len(self._entries) > self.maxsize:
+                (fingerprint, old), _ = self._entries.popitem(last=False)
+                self._forget(fingerprint, old)
+        return value
+
+    def _forget(self, fingerprint, name):
+        """Quita `name` del índice por huella (con el cerrojo tomado)."""
+        names = self._by_fingerprint.get(fingerprint)
+        if names is not None:
+            names.discard(name)
+            if not names:
+                del self._by_fingerprint[fingerprint]
+
+    def grammar_changed(self, grammar, fingerprint, change):
+        """Observador de CFGGrammar: descarta los análisis de la huella anterior."""
+        if fingerprint is not None:
+            self.invalidate(fingerprint)
+
+    def invalidate(self, fingerprint):
+        """Descarta todos los análisis asociados a una huella."""
+        # Con el índice por huella el coste depende de los análisis de esa
+        # gramática, no del tamaño de la caché
+        with self._lock:
+            for name in self._by_fingerprint.pop(fingerprint, ()):
+                self._entries.pop((fingerprint, name), None)
+
+    def clear(self):
+        """Vacía la caché."""
+        with self._lock:
+            self._entries.clear()
+            self._by_fingerprint.clear()
+
+    def values(self):
+        """Lista de los análisis guardados (p. ej. para estimar la memoria que ocupan)."""
+        with self._lock:
+            return list(self._entries.values())
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Caché compartida por defecto entre todas las instancias de GrammarAlgorithms
+default_cache = AnalysisCache()
+
+
+class AnalysisCancelled(Exception):
+    """Se lanza cuando un análisis se cancela o supera su tiempo límite."""
+
+
+class Cancellation:
+    """
+    Señal de cancelación cooperativa para GrammarAlgorithms.
+
+    Los algoritmos llaman a check() en puntos seguros (entre etapas, pasos y
+    variables); un cálculo ya iniciado no se interrumpe a la fuerza, así que
+    el tiempo límite se respeta con la granularidad de esos puntos.
+
+    Si se indica `progress`, check() lo llama con el número de puntos de
+    control alcanzados, como máximo una vez cada `interval` segundos, para
+    informar a la interfaz de que el análisis sigue avanzando.
+
+    Atributos:
+        deadline (float o None): Instante límite según time.monotonic().
+        cancelled (bool): Indica si se pidió la cancelación.
+        checks (int): Puntos de control alcanzados.
+    """
+
+    def __init__(self, timeout=None, progress=None, interval=0.1):
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        self.cancelled = False
+        self.checks = 0
+        self._progress = progress
+        self._interval = interval
+        self._last_report = time.monotonic()
+
+    def cancel(self):
+        """Pide la cancelación; el análisis se detiene en el próximo check()."""
+        self.cancelled = True
+
+    def check(self):
+        """
+        Raises:
+            AnalysisCancelled: Si se pidió la cancelación o venció el plazo.
+        """
+        if self.cancelled:
+            raise AnalysisCancelled("Análisis cancelado")
+        self.checks += 1
+        if self.deadline is None and self._progress is None:
+            return
+        now = time.monotonic()
+        if self.deadline is not None and now > self.deadline:
+            raise AnalysisCancelled("Tiempo límite excedido")
+        if self._progress is not None and now - self._last_report >= self._interval:
+            self._last_report = now
+            self._progress(self.checks)
+
+
+class IncrementalAnalysis:
+    """
+    Mantiene TERM, ANUL y ALC de una gramática mientras se editan sus producciones.
+
+    Se registra como observador de la CFGGrammar: `add_production` y
+    `remove_production` actualizan los conjuntos con un coste proporcional a la
+    parte de la gramática afectada, y cualquier otro cambio (parse_productions,
+    reasignación de producciones, invalidate()) provoca una reconstrucción.
+    Solo mantiene los conjuntos, no las rondas de los pasos: GrammarAlgorithms
+    lo usa para las consultas con trace="off" (ver track_changes).
+
+        - Agregar una producción es monótono: solo se propaga hacia adelante
+          con los mismos contadores de símbolos pendientes del motor worklist.
+        - Quitar una producción usa sobre-eliminación y re-derivación: se
+          retiran las variables cuyo soporte podría depender de ella y se
+          vuelven a derivar las que conservan alguna producción satisfecha.
+
+    Atributos:
+        g (CFGGrammar): Gramática observada.
+        generating (set): Variables terminables (TERM).
+        nullable (set): Variables anulables (ANUL).
+        reachable (set): Variables alcanzables desde el símbolo inicial (ALC).
+    """
+
+    def __init__(self, grammar):
+        self.g = grammar
+        self.rebuild()
+        grammar.add_observer(self)
+
+    def rebuild(self):
+        """Reconstruye todo el estado a partir de las producciones actuales."""
+        self._records = {}      # id → (lhs, rhs, símbolos distintos del rhs)
+        self._by_key = {}       # (lhs, rhs) → ids de registro
+        self._by_lhs = {}       # lhs → ids de registro
+        self._occurrences = {}  # símbolo → ids de registro que lo contienen
+        self._next_id = 0
+        terminals = self.g.terminals
+        self._generating = _DerivableSet(self, lambda s: s in terminals)
+        self._nullable = _DerivableSet(self, lambda s: False)
+        self._reachable = set()
+        self._variables = set(self.g.variables)
+
+        for lhs, rhs_list in self.g.productions.items():
+            for rhs in rhs_list:
+                self._insert_record(lhs, rhs)
+        self._generating.insert(self._records)
+        self._nullable.insert(self._records)
+        self._expand_reachable([self.g.start_symbol])
+
+    @property
+    def generating(self):
+        """Copia del conjunto TERM actual."""
+        return set(self._generating.members)
+
+    @property
+    def nullable(self):
+        """Copia del conjunto ANUL actual."""
+        return set(self._nullable.members)
+
+    @property
+    def reachable(self):
+        """Copia del conjunto ALC actual."""
+        return set(self._reachable)
+
+    def grammar_changed(self, grammar, fingerprint, change):
+        """Observador de CFGGrammar: aplica el cambio de forma incremental."""
+        if change is None:
+            self.rebuild()
+        elif change[0] == 'add':
+            self._production_added(change[1], change[2])
+        else:
+            self._production_removed(change[1], change[2])
+
+    def detach(self):
+        """Deja de observar la gramática."""
+        self.g.remove_observer(self)
+
+    def _insert_record(self, lhs, rhs):
+        """Registra una producción en los índices y devuelve su identificador."""
+        rid = self._next_id
+        self._next_id += 1
+        symbols = () if rhs == 'λ' else tuple(dict.fromkeys(rhs))
+        self._records[rid] = (lhs, rhs, symbols)
+        self._by_key.setdefault((lhs, rhs), []).append(rid)
+        self._by_lhs.setdefault(lhs, set()).add(rid)
+        for s in symbols:
+            self._occurrences.setdefault(s, set()).add(rid)
+        return rid
+
+    def _production_added(self, lhs, rhs):
+        """Propaga hacia adelante los efectos de una producción nueva."""
+        rid = self._insert_record(lhs, rhs)
+        self._generating.insert([rid])
+        self._nullable.insert([rid])
+
+        symbols = self._records[rid][2]
+        new_variables = {s for s in (lhs,) + symbols
+                         if s in self.g.variables and s not in self._variables}
+        self._variables.update(new_variables)
+        frontier = []
+        if lhs in self._reachable:
+            frontier.extend(s for s in symbols if s in self.g.variables)
+        # Un símbolo que pasa a ser variable (p. ej. un lado izquierdo en
+        # minúscula) crea aristas desde producciones ya registradas.
+        for v in new_variables:
+            if any(self._records[r][0] in self._reachable for r in self._occurrences.get(v, ())):
+                frontier.append(v)
+        self._expand_reachable(frontier)
+
+    def _production_removed(self, lhs, rhs):
+        """Retira una producción y rederiva la parte afectada de cada conjunto."""
+        rid = self._by_key[(lhs, rhs)].pop()
+        if not self._by_key[(lhs, rhs)]:
+            del self._by_key[(lhs, rhs)]
+        symbols = self._records[rid][2]
+        self._by_lhs[lhs].discard(rid)
+        for s in symbols:
+            self._occurrences[s].discard(rid)
+
+        self._generating.remove(rid)
+        self._nullable.remove(rid)
+        del self._records[rid]
+
+        if lhs in self._reachable:
+            self._shrink_reachable([s for s in symbols if s in self.g.variables])
+
+    def _successors(self, var):
+        """Variables que aparecen en las producciones de `var`."""
+        variables = self.g.variables
+        for rid in self._by_lhs.get(var, ()):
+            for s in self._records[rid][2]:
+                if s in variables:
+                    yield s
+
+    def _expand_reachable(self, frontier):
+        """Propaga la alcanzabilidad hacia adelante desde `frontier`."""
+        reachable = self._reachable
+        stack = [v for v in frontier if v not in reachable]
+        reachable.update(stack)
+        while stack:
+            for s in self._successors(stack.pop()):
+                if s not in reachable:
+                    reachable.add(s)
+                    stack.append(s)
+
+    def _shrink_reachable(self, candidates):
+        """
+        Retira las variables que podían depender de las aristas eliminadas y
+        vuelve a alcanzar las que siguen teniendo una arista desde ALC.
+        """
+        start = self.g.start_symbol
+        removed = set()
+        stack = [v for v in candidates if v != start and v in self._reachable]
+        while stack:
+            v = stack.pop()
+            if v in removed:
+                continue
+            removed.add(v)
+            for s in self._successors(v):
+                if s != start and s in self._reachable and s not in removed:
+                    stack.append(s)
+        self._reachable -= removed
+
+        frontier = [
+            v for v in removed
+            if any(self._records[r][0] in self._reachable for r in self._occurrences.get(v, ()))
+        ]
+        self._expand_reachable(frontier)
+
+
+class _DerivableSet:
+    """
+    Conjunto de menor punto fijo (TERM o ANUL) mantenido incrementalmente.
+
+    Una variable pertenece al conjunto si alguna de sus producciones tiene
+    todos sus símbolos resueltos (`is_resolved`) o en el conjunto; cada
+    producción guarda el número de símbolos distintos que aún le faltan.
+    Las producciones sin ningún símbolo por resolver son soporte directo: una
+    variable con alguna de ellas nunca se sobre-elimina.
+    """
+
+    def __init__(self, owner, is_resolved):
+        self.owner = owner
+        self.is_resolved = is_resolved
+        self.members = set()
+        self.pending = {}
+        self.direct = {}  # variable → número de producciones de soporte directo
+
+    def insert(self, rids):
+        """Registra producciones nuevas y propaga las variables que se derivan."""
+        records = self.owner._records
+        ready = []
+        for rid in rids:
+            lhs, _, symbols = records[rid]
+            count = 0
+            unresolved = [s for s in symbols if not self.is_resolved(s)]
+            if not unresolved:
+                self.direct[lhs] = self.direct.get(lhs, 0) + 1
+            for s in unresolved:
+                if s not in self.members:
+                    count += 1
+            self.pending[rid] = count
+            if count == 0:
+                ready.append(lhs)
+        self._propagate(ready)
+
+    def remove(self, rid):
+        """
+        Quita una producción (ya retirada de los índices del propietario) y
+        rederiva el conjunto afectado.
+        """
+        records = self.owner._records
+        occurrences = self.owner._occurrences
+        lhs, _, symbols = records[rid]
+        if not any(not self.is_resolved(s) for s in symbols):
+            self.direct[lhs] -= 1
+        if self.pending.pop(rid) != 0 or lhs not in self.members:
+            return
+
+        # 1. Sobre-eliminación: toda variable con una producción satisfecha
+        #    que use una variable retirada puede haber perdido su soporte.
+        removed = set()
+        stack = [lhs]
+        while stack:
+            v = stack.pop()
+            if v in removed or self.direct.get(v):
+                continue
+            removed.add(v)
+            if self.is_resolved(v):
+                continue
+            for r in occurrences.get(v, ()):
+                if self.pending[r] == 0:
+                    head = records[r][0]
+                    if head in self.members and head not in removed:
+                        stack.append(head)
+        self.members -= removed
+        for v in removed:
+            if self.is_resolved(v):
+                continue
+            for r in occurrences.get(v, ()):
+                self.pending[r] += 1
+
+        # 2. Re-derivación: las variables retiradas que aún tienen alguna
+        #    producción satisfecha vuelven a entrar y se propagan.
+        by_lhs = self.owner._by_lhs
+        ready = [v for v in removed
+                 if any(self.pending[r] == 0 for r in by_lhs.get(v, ()))]
+        self._propagate(ready)
+
+    def _propagate(self, ready):
+        """Agrega las variables de `ready` y las que se derivan de ellas."""
+        records = self.owner._records
+        occurrences = self.owner._occurrences
+        while ready:
+            v = ready.pop()
+            if v in self.members:
+                continue
+            self.members.add(v)
+            if self.is_resolved(v):
+                # Las producciones nunca contaron este símbolo como pendiente
+                continue
+            for r in occurrences.get(v, ()):
+                self.pending[r] -= 1
+                if self.pending[r] == 0:
+                    ready.append(records[r][0])
+
+
+def _fixpoint_rounds(compact, resolved=None):
+    """
+    Motor de lista de trabajo para los cálculos de punto fijo (TERM, ANUL).
+
+    Una variable entra al conjunto cuando alguna de sus producciones es 'λ' o
+    tiene todos sus símbolos resueltos (`resolved[s]`) o ya en el conjunto.
+    Cada producción guarda un contador de símbolos pendientes; un índice de
+    ocurrencias símbolo → producciones permite decrementarlo cuando el símbolo
+    entra al conjunto, así que cada producción se visita una vez por símbolo.
+
+    Además de la pertenencia se reconstruye la iteración en la que el algoritmo
+    iterativo clásico (que recorre las producciones en orden y actualiza el
+    conjunto dentro de la misma pasada) encontraría cada variable:
+        - Ronda 1: producciones directas ('λ' o sin símbolos pendientes).
+        - Ronda k >= 2: una variable B encontrada en la ronda r ya es visible
+          para A en la ronda r si B aparece antes que A en el diccionario de
+          producciones, y en la ronda r + 1 en caso contrario (las de la ronda 1
+          son visibles desde la ronda 2).
+    Las rondas se procesan con una cola por cubetas, por lo que el coste total
+    es lineal en el tamaño de la gramática.
+
+    Args:
+        compact (CompactGrammar): Vista compacta de la gramática. Los
+            identificadores de los lados izquierdos siguen el orden del
+            diccionario de producciones.
+        resolved (list, opcional): Indica, por identificador, si un símbolo se
+            considera resuelto de antemano.
+
+    Retorna:
+        rounds (dict): { identificador de variable: ronda en la que entra al conjunto }.
+    """
+    prod_lhs = []
+    pending = []
+    occurrences = {}
+    direct = []
+
+    for production in compact.productions:
+        lhs = production.lhs
+        if production.is_epsilon:
+            direct.append(lhs)
+            continue
+        if resolved is None:
+            missing = production.rhs
+        else:
+            missing = [s for s in production.rhs if not resolved[s]]
+        if not missing:
+            direct.append(lhs)
+            continue
+        index = len(prod_lhs)
+        prod_lhs.append(lhs)
+        pending.append(len(missing))
+        for s in missing:
+            occurrences.setdefault(s, []).append(index)
+
+    return _bucket_rounds(prod_lhs, pending, occurrences, direct)
+
+
+def _bucket_rounds(prod_lhs, pending, occurrences, direct):
+    """
+    Cola por cubetas de `_fixpoint_rounds`, a partir de un índice ya construido.
+
+    Args:
+        prod_lhs (list): Lado izquierdo de cada producción indexada.
+        pending (list): Símbolos pendientes de cada producción; se modifica.
+        occurrences (dict): { símbolo: producciones en las que está pendiente }.
+        direct (list): Variables de la ronda 1, en el orden de las producciones.
+
+    Retorna:
+        rounds (dict): { identificador de variable: ronda en la que entra al conjunto }.
+    """
+    needed = [2] * len(prod_lhs)
+    buckets = [[], list(direct)]
+    rounds = {}
+    current = 1
+    while current < len(buckets):
+        bucket = buckets[current]
+        i = 0
+        # La cubeta actual puede crecer mientras se procesa
+        while i < len(bucket):
+            var = bucket[i]
+            i += 1
+            if var in rounds:
+                continue
+            rounds[var] = current
+            for index in occurrences.get(var, ()):
+                lhs = prod_lhs[index]
+                if lhs in rounds:
+                    continue
+                if current == 1:
+                    visible = 2
+                elif var < lhs:
+                    visible = current
+                else:
+                    visible = current + 1
+                if visible > needed[index]:
+                    needed[index] = visible
+                pending[index] -= 1
+                if pending[index] == 0:
+                    target = needed[index]
+                    while len(buckets) <= target:
+                        buckets.append([])
+                    buckets[target].append(lhs)
+        current += 1
+
+    return rounds
+
+
+def _fixpoint_rounds_bitset(compact, resolved=None):
+    """
+    Variante de `_fixpoint_rounds` con conjuntos como máscaras de bits.
+
+    Cada producción se reduce a la máscara de sus símbolos no resueltos y el
+    conjunto conocido es un entero, así que la comprobación de una producción
+    es `(mask & ~known) == 0`. Recorre por rondas las variables aún pendientes,
+    en el orden del diccionario y actualizando `known` dentro de la misma
+    pasada, por lo que produce exactamente las mismas rondas.
+
+    Retorna:
+        rounds (dict): { identificador de variable: ronda en la que entra al conjunto }.
+    """
+    rounds = {}
+    known = 0
+    requirements = []
+    for lhs, rules in enumerate(compact.rules):
+        masks = []
+        direct = False
+        for production in rules:
+            mask = 0
+            for s in production.rhs:
+                if resolved is None or not resolved[s]:
+                    mask |= 1 << s
+            if production.is_epsilon or not mask:
+                direct = True
+                break
+            masks.append(mask)
+        if direct:
+            rounds[lhs] = 1
+            known |= 1 << lhs
+        requirements.append(masks)
+
+    waiting = [lhs for lhs in range(compact.lhs_count)
+               if lhs not in rounds and requirements[lhs]]
+    current = 2
+    while waiting:
+        remaining = []
+        for lhs in waiting:
+            if any(not (mask & ~known) for mask in requirements[lhs]):
+                rounds[lhs] = current
+                known |= 1 << lhs
+            else:
+                remaining.append(lhs)
+        if len(remaining) == len(waiting):
+            break
+        waiting = remaining
+        current += 1
+
+    return rounds
+
+
+def _bfs_levels(compact):
+    """
+    Niveles de BFS de las variables alcanzables desde el símbolo inicial.
+
+    Retorna:
+        levels (list): Conjuntos de variables por nivel; levels[0] es {inicial}.
+    """
+    is_variable = compact.is_variable
+    seen = {compact.start}
+    levels = [compact.names(seen)]
+    frontier = [compact.start]
+    while frontier:
+        new_ids = []
+        for current in frontier:
+            if current >= compact.lhs_count:
+                continue
+            for production in compact.rules[current]:
+                for symbol in production.rhs:
+                    if is_variable[symbol] and symbol not in seen:
+                        seen.add(symbol)
+                        new_ids.append(symbol)
+        if new_ids:
+            levels.append(compact.names(new_ids))
+        frontier = new_ids
+    return levels
+
+
+def _bfs_levels_bitset(compact):
+    """
+    Variante de `_bfs_levels` con la frontera y los visitados como máscaras.
+
+    Retorna:
+        levels (list): Conjuntos de variables por nivel; levels[0] es {inicial}.
+    """
+    variable_mask = 0
+    for i, flag in enumerate(compact.is_variable):
+        if flag:
+            variable_mask |= 1 << i
+    successors = []
+    for rules in compact.rules:
+        mask = 0
+        for production in rules:
+            for s in production.rhs:
+                mask |= 1 << s
+        successors.append(mask & variable_mask)
+
+    seen = frontier = 1 << compact.start
+    levels = [compact.names([compact.start])]
+    while frontier:
+        reached = 0
+        while frontier:
+            low = frontier & -frontier
+            current = low.bit_length() - 1
+            if current < compact.lhs_count:
+                reached |= successors[current]
+            frontier ^= low
+        frontier = reached & ~seen
+        seen |= frontier
+        if frontier:
+            levels.append(_mask_to_set(frontier, compact.symbols))
+    return levels
+
+
+def _successor_levels(successors, start, compact):
+    """
+    Niveles de BFS sobre un grafo de sucesores ya construido.
+
+    Args:
+        successors (list): Variables que aparecen en las producciones de cada
+            lado izquierdo, por identificador.
+        start (int): Identificador del símbolo inicial.
+        compact (CompactGrammar): Vista compacta que da nombre a los identificadores.
+
+    Retorna:
+        levels (list): Conjuntos de variables por nivel; levels[0] es {inicial}.
+    """
+    seen = {start}
+    levels = [compact.names(seen)]
+    frontier = [start]
+    while frontier:
+        new_ids = []
+        for current in frontier:
+            if current >= len(successors):
+                continue
+            for symbol in successors[current]:
+                if symbol not in seen:
+                    seen.add(symbol)
+                    new_ids.append(symbol)
+        if new_ids:
+            levels.append(compact.names(new_ids))
+        frontier = new_ids
+    return levels
+
+
+class _ProductionIndex:
+    """
+    Índice de las producciones compartido por los análisis de analyze_all.
+
+    Se construye con una sola pasada sobre la vista compacta y reúne lo que
+    TERM, ANUL, ALC y los cierres unitarios recorrían cada uno por su cuenta:
+    el índice de ocurrencias de `_fixpoint_rounds`, el grafo de sucesores
+    entre variables y el grafo de producciones unitarias.
+
+    Los símbolos no terminales de cada producción son los que TERM espera.
+    ANUL espera todos los símbolos del lado derecho: los que son solo
+    terminales nunca se vuelven anulables, pero un símbolo que es a la vez
+    variable y terminal (lado izquierdo en minúscula) sí puede serlo, así que
+    tiene su propio índice de ocurrencias sobre las variables.
+
+    Atributos:
+        prod_lhs (list): Lado izquierdo de cada producción no vacía.
+        pending_terminating (list): Símbolos no terminales de cada producción.
+        pending_nullable (list): Longitud del lado derecho de cada producción.
+        occurrences (dict): { símbolo no terminal: producciones en las que aparece }.
+        nullable_occurrences (dict): { variable: producciones en las que aparece }.
+        direct_terminating (list): Variables con una producción λ o solo de terminales.
+        direct_nullable (list): Variables con una producción λ.
+        successors (list): Variables de las producciones de cada lado izquierdo.
+        unit_edges (list): Destinos de las producciones unitarias (A → B) de cada símbolo.
+    """
+
+    def __init__(self, compact):
+        self.compact = compact
+        is_terminal = compact.is_terminal
+        is_variable = compact.is_variable
+        self.prod_lhs = []
+        self.pending_terminating = []
+        self.pending_nullable = []
+        self.occurrences = {}
+        self.nullable_occurrences = {}
+        self.direct_terminating = []
+        self.direct_nullable = []
+        self.successors = [set() for _ in range(compact.lhs_count)]
+        self.unit_edges = [[] for _ in compact.symbols]
+
+        for production in compact.productions:
+            lhs = production.lhs
+            if production.is_epsilon:
+                self.direct_terminating.append(lhs)
+                self.direct_nullable.append(lhs)
+                continue
+            rhs = production.rhs
+            index = len(self.prod_lhs)
+            missing = 0
+            for s in rhs:
+                if not is_terminal[s]:
+                    missing += 1
+                    self.occurrences.setdefault(s, []).append(index)
+                if is_variable[s]:
+                    self.nullable_occurrences.setdefault(s, []).append(index)
+                    self.successors[lhs].add(s)
+            if len(rhs) == 1 and is_variable[rhs[0]]:
+                self.unit_edges[lhs].append(rhs[0])
+            if not missing:
+                self.direct_terminating.append(lhs)
+            self.prod_lhs.append(lhs)
+            self.pending_terminating.append(missing)
+            self.pending_nullable.append(len(rhs))
+
+    def terminating_rounds(self):
+        """Rondas de TERM, iguales a las de `_fixpoint_rounds(compact, is_terminal)`."""
+        return _bucket_rounds(self.prod_lhs, list(self.pending_terminating),
+                              self.occurrences, self.direct_terminating)
+
+    def nullable_rounds(self):
+        """Rondas de ANUL, iguales a las de `_fixpoint_rounds(compact)`."""
+        return _bucket_rounds(self.prod_lhs, list(self.pending_nullable),
+                              self.nullable_occurrences, self.direct_nullable)
+
+    def reachable_levels(self):
+        """Niveles ALC_i, iguales a los de `_bfs_levels(compact)`."""
+        return _successor_levels(self.successors, self.compact.start, self.compact)
+
+
+def _round_groups(by_round, trace, first=1):
+    """
+    Recorre las rondas de un cálculo iterativo para generar sus pasos.
+
+    Las rondas van de `first` a la última, sin huecos; la ronda 1 se emite
+    aunque esté vacía. En modo "full" se entrega además la lista ordenada del
+    conjunto acumulado, que se mantiene fusionando listas ya ordenadas en lugar
+    de reordenar el conjunto completo en cada ronda.
+
+    Args:
+        by_round (dict): { ronda: secuencia ordenada de variables nuevas }.
+        trace (str): Modo de pasos ("full" o "delta").
+        first (int): Primera ronda.
+
+    Yields:
+        (ronda, variables nuevas, acumulado ordenado o None en modo "delta").
+    """
+    known = []
+    last = max(by_round, default=1)
+    for iteration in range(first, last + 1):
+        new_vars = list(by_round.get(iteration, ()))
+        if trace == "full":
+            known = sorted(known + new_vars)
+            yield iteration, new_vars, known
+        else:
+            yield iteration, new_vars, None
+
+
+def _nested_step(prefix, step, step_type):
+    """Copia un paso de un cálculo auxiliar dentro de los pasos de otro algoritmo."""
+    nested = {"iteration": f"{prefix}: {step['iteration']}"}
+    if "variables" in step:
+        nested["variables"] = step["variables"]
+    nested["explanation"] = step["explanation"]
+    if "variables" not in step:
+        # En modo "delta" el paso solo conserva las variables nuevas
+        nested["newVariables"] = step["newVariables"]
+    nested["type"] = step_type
+    return nested
+
+
+def _group_by_round(rounds, symbols):
+    """
+    Agrupa las variables por la ronda en la que fueron encontradas.
+
+    Args:
+        rounds (dict): { identificador: ronda }.
+        symbols (list): Símbolo de cada identificador.
+
+    Retorna:
+        dict: { ronda: tupla ordenada de variables }.
+    """
+    grouped = {}
+    for var, r in rounds.items():
+        grouped.setdefault(r, []).append(symbols[var])
+    return {r: tuple(sorted(vs)) for r, vs in sorted(grouped.items())}
+
+
+def _fresh_variables(used):
+    """
+    Genera símbolos nuevos para variables auxiliares.
+
+    Las variables deben ser un solo carácter en mayúscula (así las reconoce
+    parse_productions), por lo que se recorren primero 'A'..'Z' y después el
+    resto de letras mayúsculas de Unicode, omitiendo las ya usadas.
+
+    Args:
+        used (set): Símbolos ya presentes en la gramática.
+    """
+    for code in range(ord('A'), sys.maxunicode + 1):
+        symbol = chr(code)
+        if symbol.isupper() and symbol not in used:
+            used.add(symbol)
+            yield symbol
+    raise ValueError("No quedan símbolos disponibles para nuevas variables")
+
+
+def _grammar_size(productions):
+    """
+    Tamaño de un diccionario de producciones.
+
+    Retorna:
+        tuple: (número de producciones, suma de las longitudes de los lados
+            derechos, contando λ como 1).
+    """
+    count = 0
+    length = 0
+    for rhs_list in productions.values():
+        count += len(rhs_list)
+        for rhs in rhs_list:
+            length += 1 if rhs == 'λ' else len(rhs)
+    return count, length
+
+
+def _strongly_connected_components(edges):
+    """
+    Algoritmo de Tarjan (iterativo) sobre un grafo de nodos 0..n-1.
+
+    Args:
+        edges (list): Lista de adyacencia; edges[v] son los sucesores de v.
+
+    Retorna:
+        components (list): Componentes fuertemente conexas (listas de nodos) en
+            orden topológico inverso: toda componente aparece después de las
+            componentes alcanzables desde ella.
+        component_of (list): Índice de componente de cada nodo.
+    """
+    n = len(edges)
+    index_of = [-1] * n
+    lowlink = [0] * n
+    on_stack = [False] * n
+    component_of = [-1] * n
+    stack = []
+    components = []
+    counter = 0
+
+    for root in range(n):
+        if index_of[root] != -1:
+            continue
+        work = [(root, 0)]
+        while work:
+            v, child = work.pop()
+            if child == 0:
+                index_of[v] = lowlink[v] = counter
+                counter += 1
+                stack.append(v)
+                on_stack[v] = True
+            else:
+                # Regreso de la llamada sobre edges[v][child - 1]
+                w = edges[v][child - 1]
+                if lowlink[w] < lowlink[v]:
+                    lowlink[v] = lowlink[w]
+            descended = False
+            while child < len(edges[v]):
+                w = edges[v][child]
+                child += 1
+                if index_of[w] == -1:
+                    work.append((v, child))
+                    work.append((w, 0))
+                    descended = True
+                    break
+                if on_stack[w] and index_of[w] < lowlink[v]:
+                    lowlink[v] = index_of[w]
+            if descended:
+                continue
+            if lowlink[v] == index_of[v]:
+                component = []
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    component_of[w] = len(components)
+                    component.append(w)
+                    if w == v:
+                        break
+                components.append(component)
+
+    return components, component_of
+
+
+def _digraph(edges, initial):
+    """
+    Algoritmo Digraph de DeRemer y Pennello.
+
+    Calcula F(x) = F'(x) ∪ ⋃{ F(y) : x → y } para todos los nodos, con F'
+    dado por `initial`. Los nodos de una misma componente fuertemente conexa
+    comparten resultado, y las componentes se procesan en orden topológico
+    inverso, así que cada arista se recorre una sola vez.
+
+    Args:
+        edges (list): Lista de adyacencia; edges[v] son los sucesores de v.
+        initial (list): Máscara de bits inicial F'(v) de cada nodo.
+
+    Retorna:
+        masks (list): Máscara F(v) de cada nodo.
+        components (list): Componentes en el orden en que se propagaron.
+    """
+    components, component_of = _strongly_connected_components(edges)
+    component_masks = []
+    for c, component in enumerate(components):
+        mask = 0
+        for v in component:
+            mask |= initial[v]
+            for w in edges[v]:
+                if component_of[w] != c:
+                    mask |= component_masks[component_of[w]]
+        component_masks.append(mask)
+    return [component_masks[component_of[v]] for v in range(len(edges))], components
+
+
+def _variable_components(components, compact):
+    """Componentes reducidas a sus variables, como tuplas de nombres (sin las vacías)."""
+    result = []
+    for component in components:
+        names = tuple(compact.symbols[v] for v in component if compact.is_variable[v])
+        if names:
+            result.append(names)
+    return tuple(result)
+
+
+def _mask_to_set(mask, symbols):
+    """
+    Convierte una máscara de bits en el conjunto de símbolos correspondiente.
+
+    Args:
+        mask (int): Máscara; el bit i representa symbols[i].
+        symbols (list): Símbolos indexados por posición de bit.
+    """
+    result = set()
+    while mask:
+        low = mask & -mask
+        result.add(symbols[low.bit_length() - 1])
+        mask ^= low
+    return result
@@ -0,0 +1,515 @@
+from core.grammar_algorithms import GrammarAlgorithms, _digraph
+
+
+class LALRTable:
+    """
+    Tabla de análisis LALR(1) de una CFGGrammar.
+
+    El autómata LR(0) se construye sobre la vista compacta de la gramática
+    aumentada con S' → S. Cada ítem A → α·β se codifica como un entero
+    (desplazamiento de la producción + posición del punto) y cada estado se
+    identifica por la tupla ordenada de los ítems de su núcleo, que se interna
+    en un diccionario; así comparar y buscar estados es una sola consulta
+    hash. El cierre de un núcleo se obtiene de una tabla precalculada de
+    predicciones por variable.
+
+    Los símbolos de anticipación se calculan con el método de DeRemer y
+    Pennello sobre las transiciones con variables del autómata LR(0), sin
+    construir la colección canónica LR(1):
+        DR(p, A)      terminales leídos directamente tras la transición.
+        reads         (p, A) reads (r, C) si C es anulable.
+        includes      (p', B) ⊆ (p, A) si B → βAγ, γ anulable y p' --β--> p.
+        lookback      (q, A → ω) usa (p, A) si p --ω--> q.
+    Read y Follow se propagan con el algoritmo Digraph por componentes
+    fuertemente conexas (_digraph), igual que PRIM y SIG en GrammarAlgorithms.
+
+    Los conflictos se resuelven como yacc (desplazamiento sobre reducción, la
+    producción anterior en reducción/reducción, la aceptación sobre la
+    reducción) y quedan registrados.
+
+    Atributos:
+        g (CFGGrammar): Gramática analizada.
+        state_count (int): Número de estados del autómata.
+        conflicts (list): Un diccionario por conflicto con "state",
+            "terminal", "actions" y "kind". La gramática es LALR(1) si está vacía.
+
+    Métodos:
+        action(state, terminal):
+            Acción de la tabla: ("s", estado), ("r", "A -> ω"), ("acc",) o None.
+
+        goto(state, variable):
+            Estado destino de la transición con una variable, o None.
+
+        items(state):
+            Ítems del estado como cadenas "A → α·β".
+
+        to_arrays():
+            Exporta la tabla en arreglos compactos (desplazamiento de filas)
+            que LALRParser carga sin reconstruir el autómata.
+    """
+
+    def __init__(self, grammar):
+        self.g = grammar
+        compact = grammar.compact()
+        self._compact = compact
+        count = len(compact.symbols)
+        self._augmented = count       # S'
+        self._end = count + 1         # '$'
+        self._is_variable = compact.is_variable + [True, False]
+
+        self._productions = [(self._augmented, (compact.start,))]
+        self._productions += [(p.lhs, p.rhs) for p in compact.productions]
+        self._rules = [[] for _ in range(count + 2)]
+        self._offsets = []
+        self._item_production = []
+        for index, (lhs, rhs) in enumerate(self._productions):
+            self._rules[lhs].append(index)
+            self._offsets.append(len(self._item_production))
+            self._item_production.extend([index] * (len(rhs) + 1))
+
+        nullable_names, _ = GrammarAlgorithms(grammar).compute_nullable_variables(trace="off")
+        self._nullable = [s in nullable_names for s in compact.symbols] + [False, False]
+
+        self._build_automaton()
+        self._compute_lookaheads()
+        self._build_actions()
+
+    # Autómata LR(0)
+
+    def _dot(self, item):
+        return item - self._offsets[self._item_production[item]]
+
+    def _next_symbol(self, item):
+        """Símbolo tras el punto del ítem, o None si el ítem está completo."""
+        rhs = self._productions[self._item_production[item]][1]
+        dot = self._dot(item)
+        return rhs[dot] if dot < len(rhs) else None
+
+    def _prediction_masks(self):
+        """Variables predichas al esperar cada variable (A ⇒ Bγ ⇒ ...), como máscaras."""
+        edges = [[] for _ in self._is_variable]
+        for lhs, rhs in self._productions:
+            if rhs and self._is_variable[rhs[0]]:
+                edges[lhs].append(rhs[0])
+        initial = [1 << v if is_var else 0 for v, is_var in enumerate(self._is_variable)]
+        masks, _ = _digraph(edges, initial)
+        return masks
+
+    def _build_automaton(self):
+        """Construye los estados LR(0) internando los núcleos."""
+        predictions = self._prediction_masks()
+        closures = {}
+
+        def closure_items(mask):
+            if mask not in closures:
+                items = []
+                rest = mask
+                while rest:
+                    low = rest & -rest
+                    items.extend(self._offsets[p] for p in self._rules[low.bit_length() - 1])
+                    rest ^= low
+                closures[mask] = tuple(items)
+            return closures[mask]
+
+        self._kernels = [(0,)]
+        self._state_of = {(0,): 0}
+        self._transitions = []
+        self._completed = []
+        for state_kernel in self._kernels:
+            mask = 0
+            for item in state_kernel:
+                symbol = self._next_symbol(item)
+                if symbol is not None and self._is_variable[symbol]:
+                    mask |= predictions[symbol]
+            successors = {}
+            completed = []
+            for item in dict.fromkeys(state_kernel + closure_items(mask)):
+                symbol = self._next_symbol(item)
+                if symbol is None:
+                    completed.append(self._item_production[item])
+                else:
+                    successors.setdefault(symbol, []).append(item + 1)
+            transitions = {}
+            for symbol, kernel in successors.items():
+                kernel = tuple(sorted(kernel))
+                target = self._state_of.get(kernel)
+                if target is None:
+                    target = len(self._kernels)
+                    self._state_of[kernel] = target
+                    self._kernels.append(kernel)
+                transitions[symbol] = target
+            self._transitions.append(transitions)
+            self._completed.append(completed)
+        self.state_count = len(self._kernels)
+
+    # Símbolos de anticipación (DeRemer-Pennello)
+
+    def _compute_lookaheads(self):
+        """Calcula LA(q, A → ω) como máscaras de terminales."""
+        is_variable = self._is_variable
+        nullable = self._nullable
+        transitions = self._transitions
+
+        goto_index = {}
+        edges_from = []
+        for state, row in enumerate(transitions):
+            for symbol in row:
+                if is_variable[symbol]:
+                    goto_index[(state, symbol)] = len(edges_from)
+                    edges_from.append((state, symbol))
+
+        direct = []
+        reads = []
+        for state, symbol in edges_from:
+            target = transitions[state][symbol]
+            mask = 0
+            successors = []
+            for next_symbol in transitions[target]:
+                if not is_variable[next_symbol]:
+                    mask |= 1 << next_symbol
+                elif nullable[next_symbol]:
+                    successors.append(goto_index[(target, next_symbol)])
+            if state == 0 and symbol == self._productions[0][1][0]:
+                mask |= 1 << self._end
+            direct.append(mask)
+            reads.append(successors)
+        read, _ = _digraph(reads, direct)
+
+        includes = [[] for _ in edges_from]
+        lookback = {}
+        for t, (start_state, lhs) in enumerate(edges_from):
+            for p in self._rules[lhs]:
+                rhs = self._productions[p][1]
+                # nullable_suffix[i]: rhs[i + 1:] es anulable
+                nullable_suffix = [False] * len(rhs)
+                suffix = True
+                for i in range(len(rhs) - 1, -1, -1):
+                    nullable_suffix[i] = suffix
+                    suffix = suffix and nullable[rhs[i]]
+                state = start_state
+                for i, symbol in enumerate(rhs):
+                    if is_variable[symbol] and nullable_suffix[i]:
+                        includes[goto_index[(state, symbol)]].append(t)
+                    state = transitions[state][symbol]
+                lookback.setdefault((state, p), []).append(t)
+        follow, _ = _digraph(includes, read)
+
+        self._lookaheads = {}
+        for key, sources in lookback.items():
+            mask = 0
+            for t in sources:
+                mask |= follow[t]
+            self._lookaheads[key] = mask
+
+    # Tabla de acciones
+
+    def _build_actions(self):
+        """Llena ACTION resolviendo los conflictos como yacc."""
+        is_variable = self._is_variable
+        self._actions = []
+        self.conflicts = []
+        accept_state = self._transitions[0].get(self._productions[0][1][0])
+        for state, row in enumerate(self._transitions):
+            actions = {}
+            for symbol, target in row.items():
+                if not is_variable[symbol]:
+                    actions[symbol] = ("s", target)
+            for p in sorted(self._completed[state]):
+                if p == 0:
+                    continue
+                mask = self._lookaheads.get((state, p), 0)
+                while mask:
+                    low = mask & -mask
+                    terminal = low.bit_length() - 1
+                    mask ^= low
+                    self._set_action(state, actions, terminal, ("r", p))
+            if state == accept_state:
+                self._set_action(state, actions, self._end, ("acc",), replace=True)
+            self._actions.append(actions)
+
+    def _set_action(self, state, actions, terminal, action, replace=False):
+        """
+        Pone `action` en la celda (state, terminal) y registra el conflicto si
+        ya estaba ocupada. Sin `replace` se conserva la acción existente (como
+        yacc: desplazar antes que reducir y la producción anterior antes que la
+        posterior); la aceptación sí reemplaza a la reducción que hubiera.
+        """
+        existing = actions.get(terminal)
+        if existing is None:
+            actions[terminal] = action
+            return
+        first, second = (action, existing) if action[0] == "acc" else (existing, action)
+        kinds = {"s": "desplazamiento", "r": "reducción", "acc": "aceptación"}
+        self.conflicts.append({
+            "state": state,
+            "terminal": self._name(terminal),
+            "actions": [self._describe(existing), self._describe(action)],
+            "kind": f"{kinds[first[0]]}/{kinds[second[0]]}",
+        })
+        if replace:
+            actions[terminal] = action
+
+    def _name(self, symbol):
+        if symbol == self._end:
+            return '$'
+        if symbol == self._augmented:
+            return f"{self.g.start_symbol}'"
+        return self._compact.symbols[symbol]
+
+    def _production_text(self, p):
+        lhs, rhs = self._productions[p]
+        return f"{self._name(lhs)} -> {''.join(self._name(s) for s in rhs) or 'λ'}"
+
+    def _describe(self, action):
+        if action[0] == "s":
+            return f"s{action[1]}"
+        if action[0] == "r":
+            return f"r({self._production_text(action[1])})"
+        return "acc"
+
+    def action(self, state, terminal):
+        """
+        Acción para un estado y un terminal ('$' es el fin de la entrada).
+
+        Retorna:
+            tuple o None: ("s", estado), ("r", "A -> ω"), ("acc",) o None (error).
+        """
+        symbol = self._end if terminal == '$' else self._compact.ids.get(terminal)
+        if symbol is None:
+            return None
+        action = self._actions[state].get(symbol)
+        if action is not None and action[0] == "r":
+            return ("r", self._production_text(action[1]))
+        return action
+
+    def goto(self, state, variable):
+        """Estado destino de la transición con `variable`, o None."""
+        symbol = self._compact.ids.get(variable)
+        if symbol is None or not self._is_variable[symbol]:
+            return None
+        return self._transitions[state].get(symbol)
+
+    def items(self, state):
+        """Ítems del núcleo del estado, como cadenas "A → α·β"."""
+        result = []
+        for item in self._kernels[state]:
+            lhs, rhs = self._productions[self._item_production[item]]
+            dot = self._dot(item)
+            before = ''.join(self._name(s) for s in rhs[:dot])
+            after = ''.join(self._name(s) for s in rhs[dot:])
+            result.append(f"{self._name(lhs)} → {before}·{after}")
+        return result
+
+    def to_arrays(self):
+        """
+        Exporta la tabla en forma compacta y serializable (listas de enteros).
+
+        Las acciones se codifican como enteros: 0 es error, k > 0 desplaza al
+        estado k - 1 y k < 0 reduce por la producción -k - 1 (la producción 0
+        es S' → S, así que -1 es aceptar). Las filas de ACTION y GOTO se
+        comprimen por desplazamiento de filas: la entrada (estado, símbolo)
+        está en next[base[estado] + símbolo] si check en esa posición vale el
+        estado; si no, ACTION usa la reducción por omisión del estado.
+
+        Retorna:
+            dict: {
+                "terminals", "nonterminals": nombres por índice ('$' al final),
+                "productions": [índice de la variable, longitud del lado derecho],
+                "production_text": producciones como "A -> ω",
+                "action_base", "action_check", "action_next", "action_default",
+                "goto_base", "goto_check", "goto_next"
+            }
+        """
+        compact = self._compact
+        terminal_ids = sorted((s for s in range(len(compact.symbols)) if not self._is_variable[s]),
+                              key=lambda s: compact.symbols[s]) + [self._end]
+        variable_ids = [self._augmented] + sorted(
+            (s for s in range(len(compact.symbols)) if self._is_variable[s]),
+            key=lambda s: compact.symbols[s])
+        terminal_index = {s: i for i, s in enumerate(terminal_ids)}
+        variable_index = {s: i for i, s in enumerate(variable_ids)}
+
+        action_rows = []
+        defaults = []
+        for actions in self._actions:
+            row = {}
+            for symbol, action in actions.items():
+                if action[0] == "s":
+                    row[terminal_index[symbol]] = action[1] + 1
+                elif action[0] == "r":
+                    row[terminal_index[symbol]] = -action[1] - 1
+                else:
+                    row[terminal_index[symbol]] = -1
+            # Reducción por omisión: la más frecuente de la fila
+            counts = {}
+            for value in row.values():
+                if value < -1:
+                    counts[value] = counts.get(value, 0) + 1
+            default = max(counts, key=lambda v: (counts[v], v)) if counts else 0
+            defaults.append(default)
+            action_rows.append({k: v for k, v in row.items() if v != default})
+
+        goto_rows = []
+        for transitions in self._transitions:
+            goto_rows.append({variable_index[s]: target for s, target in transitions.items()
+                              if self._is_variable[s]})
+
+        action_base, action_check, action_next = _pack_rows(action_rows)
+        goto_base, goto_check, goto_next = _pack_rows(goto_rows)
+        return {
+            "terminals": [self._name(s) for s in terminal_ids],
+            "nonterminals": [self._name(s) for s in variable_ids],
+            "productions": [[variable_index[lhs], len(rhs)] for lhs, rhs in self._productions],
+            "production_text": [self._production_text(p) for p in range(len(self._productions))],
+            "action_base": action_base,
+            "action_check": action_check,
+            "action_next": action_next,
+            "action_default": defaults,
+            "goto_base": goto_base,
+            "goto_check": goto_check,
+            "goto_next": goto_next,
+        }
+
+
+class LALRParser:
+    """
+    Analizador guiado por la tabla exportada con LALRTable.to_arrays().
+
+    Solo necesita los arreglos (por ejemplo, cargados de un archivo JSON), no
+    la gramática ni el autómata.
+
+    Métodos:
+        parse(word):
+            Devuelve las producciones aplicadas (derivación más a la derecha en
+            orden inverso) o lanza ValueError con la posición del error.
+
+        recognize(word):
+            Indica si la cadena pertenece al lenguaje.
+    """
+
+    def __init__(self, arrays):
+        self.arrays = arrays
+        self._terminal_index = {t: i for i, t in enumerate(arrays["terminals"])}
+
+    def _action(self, state, terminal):
+        a = self.arrays
+        i = a["action_base"][state] + terminal
+        if 0 <= i < len(a["action_check"]) and a["action_check"][i] == state:
+            return a["action_next"][i]
+        return a["action_default"][state]
+
+    def _goto(self, state, variable):
+        a = self.arrays
+        i = a["goto_base"][state] + variable
+        if 0 <= i < len(a["goto_check"]) and a["goto_check"][i] == state:
+            return a["goto_next"][i]
+        return None
+
+    def parse(self, word):
+        """
+        Analiza una cadena.
+
+        Args:
+            word (str o secuencia): Cadena de terminales; 'λ' es la cadena vacía.
+
+        Retorna:
+            list: Producciones aplicadas, como cadenas "A -> ω", en el orden
+                de las reducciones.
+
+        Raises:
+            ValueError: Si la cadena no pertenece al lenguaje.
+        """
+        if word == 'λ':
+            word = ''
+        productions = self.arrays["productions"]
+        texts = self.arrays["production_text"]
+        end = len(self.arrays["terminals"]) - 1
+        symbols = list(word)
+        stack = [0]
+        reductions = []
+        position = 0
+        while True:
+            if position < len(symbols):
+                terminal = self._terminal_index.get(symbols[position])
+                if terminal is None or terminal == end:
+                    raise ValueError(f"Símbolo desconocido en la posición {position}: {symbols[position]}")
+            else:
+                terminal = end
+            value = self._action(stack[-1], terminal)
+            if value > 0:
+                stack.append(value - 1)
+                position += 1
+            elif value == -1:
+                return reductions
+            elif value < 0:
+                p = -value - 1
+                lhs, length = productions[p]
+                if length:
+                    del stack[-length:]
+                target = self._goto(stack[-1], lhs)
+                if target is None:
+                    raise ValueError(f"Error de sintaxis en la posición {position}")
+                stack.append(target)
+                reductions.append(texts[p])
+            else:
+                raise ValueError(f"Error de sintaxis en la posición {position}")
+
+    def recognize(self, word):
+        """Indica si la cadena pertenece al lenguaje de la tabla."""
+        try:
+            self.parse(word)
+        except ValueError:
+            return False
+        return True
+
+
+def _pack_rows(rows):
+    """
+    Compresión por desplazamiento de filas de una tabla dispersa.
+
+    Args:
+        rows (list): Una fila por estado, como { columna: valor }.
+
+    Retorna:
+        tuple: (base, check, next) tales que la entrada (fila, columna) está en
+            next[base[fila] + columna] cuando check en esa posición vale la fila.
+    """
+    base = [0] * len(rows)
+    check = []
+    values = []
+    free = 0   # primera posición libre de `check`
+    # Las posiciones solo se ocupan, así que un desplazamiento que falló para
+    # un patrón de columnas sigue fallando: cada patrón retoma donde quedó.
+    resume = {}
+    # Las filas más densas primero, para que las ralas llenen los huecos
+    for r in sorted(range(len(rows)), key=lambda r: -len(rows[r])):
+        row = rows[r]
+        if not row:
+            continue
+        columns = tuple(sorted(row))
+        first = columns[0]
+        while free < len(check) and check[free] != -1:
+            free += 1
+        offset = max(free - first, resume.get(columns, -first))
+        while True:
+            # Salta de hueco en hueco para la primera columna
+            position = offset + first
+            if position < len(check) and check[position] != -1:
+                try:
+                    position = check.index(-1, position)
+                except ValueError:
+                    position = len(check)
+                offset = position - first
+            if all(offset + c >= len(check) or check[offset + c] == -1 for c in columns):
+                break
+            offset += 1
+        needed = offset + columns[-1] + 1
+        if needed > len(check):
+            check.extend([-1] * (needed - len(check)))
+            values.extend([0] * (needed - len(values)))
+        for c in columns:
+            check[offset + c] = r
+            values[offset + c] = row[c]
+        base[r] = offset
+        resume[columns] = offset + 1
+    return base, check, values
@@ -0,0 +1,33 @@
+from concurrent.futures import ProcessPoolExecutor
+
+# Estado del proceso actual del pool (ver process_pool)
+_worker_state = None
+
+
+def process_pool(workers, state=None):
+    """
+    Crea un pool de procesos en el que cada proceso recibe una copia de `state`.
+
+    El estado se envía una sola vez por proceso, al iniciarlo, en lugar de con
+    cada tarea; las tareas lo leen con worker_state(). Cada proceso tiene su
+    propia copia, así que puede modificarla (p. ej. como caché) sin afectar a
+    los demás.
+
+    Args:
+        workers (int): Número de procesos.
+        state (objeto serializable, opcional): Estado inicial de cada proceso.
+
+    Retorna:
+        ProcessPoolExecutor: El pool; debe cerrarse con shutdown() o `with`.
+    """
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(state,))
+
+
+def worker_state():
+    """Devuelve el estado del proceso actual, recibido al crearse el pool."""
+    return _worker_state
+
+
+def _init_worker(state):
+    global _worker_state
+    _worker_state = state
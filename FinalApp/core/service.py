@@ -0,0 +1,275 @@
+import argparse
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import TimeoutError as FutureTimeout
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+import bottle
+
+from core.app_api import AppAPI
+from core.cfg_grammar import CFGGrammar
+from core.grammar_algorithms import Cancellation, GrammarAlgorithms
+from core.pool import process_pool, worker_state
+
+# Solo se escucha en la interfaz local: el servicio no tiene autenticación
+HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Margen sobre el tiempo límite cooperativo antes de abandonar la espera
+TIMEOUT_GRACE = 5.0
+
+
+class AnalysisService:
+    """
+    Servicio de análisis sin estado por petición, respaldado por un pool de procesos.
+
+    Las gramáticas se registran una vez con load_grammar(), que devuelve su
+    huella (CFGGrammar.fingerprint); las peticiones siguientes las nombran por
+    esa huella en lugar de reenviar el texto. El servicio guarda el texto de
+    las últimas `cache_size` gramáticas, y cada proceso del pool conserva las
+    gramáticas ya analizadas junto con la caché de análisis, de modo que
+    repetir un análisis no vuelve a analizar el texto ni a recalcularlo.
+
+    Como mucho `max_pending` peticiones se ejecutan o esperan en el pool; las
+    que superan ese límite se rechazan de inmediato (contrapresión) en lugar de
+    encolarse sin límite. Cada análisis tiene un tiempo límite cooperativo
+    (ver Cancellation).
+
+    Los métodos devuelven (código HTTP, cuerpo), con el cuerpo en la forma de
+    AppAPI ("status", "message", ...).
+
+    Args:
+        workers (int, opcional): Procesos del pool; por omisión, el número de CPUs.
+        max_pending (int, opcional): Peticiones admitidas a la vez; por
+            omisión, el doble de procesos.
+        timeout (float): Segundos por petición si la petición no indica otro.
+        cache_size (int): Gramáticas recordadas por el servicio y por proceso.
+    """
+
+    def __init__(self, workers=None, max_pending=None, timeout=30.0, cache_size=256):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 2 * self.workers
+        self.timeout = timeout
+        self.cache_size = cache_size
+        # Cada proceso recibe su propia caché de gramáticas analizadas (huella → gramática)
+        self._executor = process_pool(self.workers, {"grammars": OrderedDict(), "size": cache_size})
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._texts = OrderedDict()   # huella → texto de la gramática (LRU)
+        self._lock = threading.Lock()
+
+    def close(self):
+        """Detiene el pool de procesos."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def load_grammar(self, text):
+        """
+        Analiza el texto de una gramática y la registra por su huella.
+
+        Retorna:
+            tuple: (código HTTP, {"status", "grammar": huella, "data"}).
+        """
+        if not isinstance(text, str):
+            return 400, {"status": "error", "message": "Falta el texto de la gramática."}
+        code, response = self._submit(_load_in_worker, text, timeout=self.timeout)
+        if response["status"] == "success":
+            self._remember(response["grammar"], text)
+        return code, response
+
+    def run_algorithm(self, grammar, name, timeout=None):
+        """
+        Ejecuta un análisis sobre una gramática registrada.
+
+        Args:
+            grammar (str): Huella devuelta por load_grammar.
+            name (str): Nombre del análisis de AppAPI.run_algorithm.
+            timeout (float, opcional): Segundos disponibles; no puede superar
+                el tiempo límite del servicio.
+
+        Retorna:
+            tuple: (código HTTP, respuesta de AppAPI.run_algorithm).
+        """
+        with self._lock:
+            text = self._texts.get(grammar)
+            if text is not None:
+                self._texts.move_to_end(grammar)
+        if text is None:
+            return 404, {"status": "error",
+                         "message": "Gramática desconocida; regístrela primero con /load_grammar."}
+        if timeout is None or timeout > self.timeout:
+            timeout = self.timeout
+        return self._submit(_run_in_worker, grammar, text, name, timeout, timeout=timeout)
+
+    def _remember(self, grammar, text):
+        with self._lock:
+            self._texts[grammar] = text
+            self._texts.move_to_end(grammar)
+            while len(self._texts) > self.cache_size:
+                self._texts.popitem(last=False)
+
+    def _submit(self, function, *args, timeout):
+        """Envía una tarea al pool respetando el límite de peticiones pendientes."""
+        if not self._slots.acquire(blocking=False):
+            return 503, {"status": "busy", "message": "Servicio ocupado; reintente más tarde."}
+        try:
+            future = self._executor.submit(function, *args)
+        except Exception as e:
+            self._slots.release()
+            return 500, {"status": "error", "message": str(e)}
+        # La plaza se libera cuando el proceso termina, no cuando se deja de
+        # esperar, así que una tarea atascada sigue contando para el límite.
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            response = future.result(timeout + TIMEOUT_GRACE)
+        except FutureTimeout:
+            return 504, {"status": "timeout", "message": f"Tiempo límite agotado ({timeout} s)"}
+        except Exception as e:
+            return 500, {"status": "error", "message": str(e)}
+        if response["status"] == "cancelled":
+            return 504, {"status": "timeout", "message": response["message"]}
+        return (200 if response["status"] == "success" else 400), response
+
+
+def _parse(text):
+    lines = [ln.strip() for ln in text.split("\n") if ln.strip()]
+    if not lines:
+        raise ValueError("No hay ninguna regla.")
+    return CFGGrammar(productions=lines)
+
+
+def _cache_grammar(grammar):
+    state = worker_state()
+    grammars = state["grammars"]
+    key = grammar.fingerprint()
+    grammars[key] = grammar
+    grammars.move_to_end(key)
+    while len(grammars) > state["size"]:
+        grammars.popitem(last=False)
+    return key
+
+
+def _load_in_worker(text):
+    try:
+        grammar = _parse(text)
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+    key = _cache_grammar(grammar)
+    return {"status": "success", "grammar": key, "data": grammar.to_dict()}
+
+
+def _run_in_worker(key, text, name, timeout):
+    grammars = worker_state()["grammars"]
+    grammar = grammars.get(key)
+    if grammar is None:
+        grammar = _parse(text)
+        _cache_grammar(grammar)
+    else:
+        grammars.move_to_end(key)
+    api = AppAPI()
+    api.grammar = grammar
+    api.alg = GrammarAlgorithms(grammar, cancellation=Cancellation(timeout))
+    return api.run_algorithm(name)
+
+
+def create_app(service):
+    """
+    Aplicación bottle con los puntos de entrada del servicio (JSON sobre HTTP).
+
+        POST /load_grammar    {"text": "S -> aS | λ"}
+        POST /run_algorithm   {"grammar": huella, "algorithm": "nullable", "timeout": 5}
+        GET  /health
+    """
+    app = bottle.Bottle()
+
+    def reply(code, body):
+        bottle.response.status = code
+        bottle.response.content_type = "application/json; charset=utf-8"
+        if code == 503:
+            bottle.response.set_header("Retry-After", "1")
+        return json.dumps(body, ensure_ascii=False)
+
+    def payload():
+        try:
+            data = json.loads(bottle.request.body.read().decode("utf-8") or "{}")
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            data = None
+        return data if isinstance(data, dict) else None
+
+    @app.post("/load_grammar")
+    def load_grammar():
+        data = payload()
+        if data is None:
+            return reply(400, {"status": "error", "message": "Se esperaba un objeto JSON."})
+        return reply(*service.load_grammar(data.get("text")))
+
+    @app.post("/run_algorithm")
+    def run_algorithm():
+        data = payload()
+        if data is None or not data.get("grammar") or not data.get("algorithm"):
+            return reply(400, {"status": "error", "message": "Se requieren \"grammar\" y \"algorithm\"."})
+        timeout = data.get("timeout")
+        if timeout is not None and (not isinstance(timeout, (int, float)) or timeout <= 0):
+            return reply(400, {"status": "error", "message": "\"timeout\" debe ser un número positivo."})
+        return reply(*service.run_algorithm(data["grammar"], data["algorithm"], timeout))
+
+    @app.get("/health")
+    def health():
+        return reply(200, {"status": "success", "workers": service.workers,
+                           "max_pending": service.max_pending})
+
+    return app
+
+
+class _ThreadingWSGIServer(socketserver.ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class _ThreadingServer(bottle.ServerAdapter):
+    """Servidor wsgiref con un hilo por petición, para que varias esperen al pool a la vez."""
+
+    def run(self, handler):
+        quiet = self.quiet
+
+        class Handler(WSGIRequestHandler):
+            def log_request(self, *args, **kwargs):
+                if not quiet:
+                    super().log_request(*args, **kwargs)
+
+        self.server = make_server(self.host, self.port, handler, _ThreadingWSGIServer, Handler)
+        self.server.serve_forever()
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos; sirve hasta que se interrumpe."""
+    parser = argparse.ArgumentParser(
+        description=f"Servicio HTTP local ({HOST}) con los análisis de gramáticas.")
+    parser.add_argument("-p", "--port", type=int, default=DEFAULT_PORT,
+                        help="Puerto (por omisión: %(default)s).")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Número de procesos (por omisión, el número de CPUs).")
+    parser.add_argument("-q", "--max-pending", type=int, default=None,
+                        help="Peticiones admitidas a la vez (por omisión, el doble de procesos).")
+    parser.add_argument("-t", "--timeout", type=float, default=30.0,
+                        help="Segundos máximos por petición (por omisión: %(default)s).")
+    parser.add_argument("--cache-size", type=int, default=256,
+                        help="Gramáticas recordadas por el servicio y por proceso (por omisión: %(default)s).")
+    parser.add_argument("--quiet", action="store_true", help="No registrar cada petición.")
+    args = parser.parse_args(argv)
+
+    service = AnalysisService(args.workers, args.max_pending, args.timeout, args.cache_size)
+    # Con SIGTERM también se detiene el pool; si no, sus procesos quedarían huérfanos
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        bottle.run(create_app(service), server=_ThreadingServer, host=HOST, port=args.port,
+                   quiet=args.quiet)
+    finally:
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
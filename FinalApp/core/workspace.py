@@ -0,0 +1,253 @@
+import sys
+import threading
+from collections import OrderedDict
+
+from core.cfg_grammar import CFGGrammar
+from core.grammar_algorithms import AnalysisCache, GrammarAlgorithms
+
+
+class WorkspaceGrammar:
+    """
+    Gramática con nombre dentro de un GrammarWorkspace.
+
+    Atributos:
+        name (str): Nombre de la gramática.
+        text (str): Texto de las producciones, tal como se cargó.
+        grammar (CFGGrammar o None): Gramática analizada; None si se desalojó.
+        alg (GrammarAlgorithms o None): Algoritmos sobre `grammar`, con su
+            propia caché de análisis.
+        results (dict): Respuestas ya calculadas, por nombre de análisis.
+        size (int): Memoria estimada en bytes de la gramática y sus análisis.
+    """
+
+    def __init__(self, name, text):
+        self.name = name
+        self.text = text
+        self.grammar = None
+        self.alg = None
+        self.results = {}
+        self.size = 0
+
+    @property
+    def loaded(self):
+        """Indica si la gramática está analizada en memoria."""
+        return self.grammar is not None
+
+    def load(self, cache_entries):
+        """Analiza el texto y prepara los algoritmos con una caché propia."""
+        lines = [ln.strip() for ln in self.text.split("\n") if ln.strip()]
+        if not lines:
+            raise ValueError("No hay ninguna regla.")
+        self.grammar = CFGGrammar(productions=lines)
+        self.alg = GrammarAlgorithms(self.grammar, cache=AnalysisCache(cache_entries))
+
+    def unload(self):
+        """Descarta la gramática analizada y sus análisis; conserva el texto."""
+        self.grammar = None
+        self.alg = None
+        self.results = {}
+        self.size = 0
+
+    def measure(self):
+        """
+        Recalcula `size` a partir de la gramática, la caché de análisis y las
+        respuestas. Recorre todo lo que contiene la gramática, así que solo se
+        usa al cargarla; las respuestas posteriores suman su propio tamaño
+        (ver GrammarWorkspace.result).
+        """
+        if not self.loaded:
+            self.size = 0
+        else:
+            g = self.grammar
+            self.size = _footprint([g.productions, g.variables, g.terminals,
+                                    self.alg.cache.values(), self.results])
+        return self.size
+
+
+class GrammarWorkspace:
+    """
+    Conjunto de gramáticas con nombre, con sus análisis en memoria.
+
+    Cada gramática se analiza una vez al agregarla y conserva sus
+    GrammarAlgorithms (con una caché de análisis propia) y las respuestas ya
+    calculadas, de modo que cambiar de gramática o compararlas no repite el
+    análisis del texto ni los algoritmos.
+
+    La memoria se limita por tamaño estimado, no por número de gramáticas:
+    cuando el total supera `max_bytes` se desalojan las gramáticas usadas hace
+    más tiempo (LRU). Una gramática desalojada conserva su texto y se vuelve a
+    analizar la próxima vez que se usa. El total se lleva como una suma que
+    se actualiza con cada cambio, sin volver a medir las gramáticas. Es segura
+    para usarse desde varios hilos.
+
+    Args:
+        max_bytes (int): Memoria máxima estimada de las gramáticas analizadas.
+        cache_entries (int): Tamaño de la caché de análisis de cada gramática.
+
+    Atributos:
+        evictions (int): Gramáticas desalojadas desde la creación.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, cache_entries=64):
+        self.max_bytes = max_bytes
+        self.cache_entries = cache_entries
+        self.evictions = 0
+        self._total = 0                 # suma de los `size` de las gramáticas
+        self._entries = OrderedDict()   # nombre → WorkspaceGrammar, del menos al más reciente
+        self._names = []                # nombres en el orden en que se agregaron
+        self._lock = threading.RLock()
+
+    def add(self, name, text):
+        """
+        Agrega una gramática (o reemplaza la del mismo nombre) y la analiza.
+
+        Raises:
+            ValueError: Si el texto no contiene reglas válidas; en ese caso el
+                espacio de trabajo no cambia.
+        """
+        entry = WorkspaceGrammar(name, text)
+        entry.load(self.cache_entries)
+        entry.measure()
+        with self._lock:
+            old = self._entries.pop(name, None)
+            if old is None:
+                self._names.append(name)
+            else:
+                self._total -= old.size
+            self._entries[name] = entry
+            self._total += entry.size
+            self._evict(keep=name)
+        return entry
+
+    def get(self, name):
+        """
+        Devuelve la gramática `name`, analizándola de nuevo si se había desalojado.
+
+        Raises:
+            KeyError: Si no existe ninguna gramática con ese nombre.
+        """
+        with self._lock:
+            entry = self._entries[name]
+            self._entries.move_to_end(name)
+            if not entry.loaded:
+                entry.load(self.cache_entries)
+                self._total += entry.measure()
+                self._evict(keep=name)
+            return entry
+
+    def remove(self, name):
+        """Elimina una gramática; no hace nada si no existe."""
+        with self._lock:
+            entry = self._entries.pop(name, None)
+            if entry is not None:
+                self._names.remove(name)
+                self._total -= entry.size
+
+    def names(self):
+        """Nombres de las gramáticas, en el orden en que se agregaron."""
+        with self._lock:
+            return list(self._names)
+
+    def result(self, name, algorithm, compute, grammar=None):
+        """
+        Devuelve la respuesta de `algorithm` para la gramática `name`.
+
+        Si no está guardada, se calcula con `compute(alg)`, donde `alg` son los
+        GrammarAlgorithms de la gramática; solo se guardan las respuestas con
+        estado "success". El tamaño de la gramática aumenta en lo que ocupan la
+        respuesta y los análisis que el cálculo agregó a su caché, medidos
+        fuera del candado.
+
+        Con `grammar` (la CFGGrammar con la que quien llama hace el cálculo),
+        si la entrada ya no tiene esa gramática (se reemplazó o se volvió a
+        analizar) la respuesta se calcula con `compute(None)` y no se guarda.
+        """
+        with self._lock:
+            entry = self.get(name)
+            if grammar is not None and entry.grammar is not grammar:
+                return compute(None)
+            response = entry.results.get(algorithm)
+            alg = entry.alg
+        if response is not None:
+            return response
+        cached = {id(v) for v in alg.cache.values()}
+        response = compute(alg)
+        if response.get("status") == "success":
+            added = [v for v in alg.cache.values() if id(v) not in cached]
+            size = _footprint([algorithm, response, added])
+            with self._lock:
+                if self._entries.get(name) is entry and entry.loaded and algorithm not in entry.results:
+                    entry.results[algorithm] = response
+                    entry.size += size
+                    self._total += size
+                    self._evict(keep=name)
+        return response
+
+    def cached(self, name, algorithm, grammar=None):
+        """
+        Respuesta ya guardada de `algorithm` para `name`, o None (no analiza la
+        gramática). Con `grammar`, solo si la entrada sigue teniendo esa gramática.
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or not entry.loaded or (grammar is not None and entry.grammar is not grammar):
+                return None
+            self._entries.move_to_end(name)
+            return entry.results.get(algorithm)
+
+    def total_bytes(self):
+        """Memoria estimada de todas las gramáticas analizadas."""
+        with self._lock:
+            return self._total
+
+    def stats(self):
+        """Resumen del espacio de trabajo para la interfaz."""
+        with self._lock:
+            return {
+                "grammars": [{"name": n, "loaded": self._entries[n].loaded,
+                              "bytes": self._entries[n].size} for n in self._names],
+                "bytes": self.total_bytes(),
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+            }
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _evict(self, keep):
+        """Desaloja gramáticas LRU (salvo `keep`) hasta respetar el límite de memoria."""
+        for name in list(self._entries):
+            if self._total <= self.max_bytes:
+                break
+            entry = self._entries[name]
+            if name == keep or not entry.loaded:
+                continue
+            self._total -= entry.size
+            entry.unload()
+            self.evictions += 1
+
+
+def _footprint(obj):
+    """Estimación en bytes de un objeto y todo lo que contiene (sin contar objetos compartidos dos veces)."""
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif hasattr(item, "__slots__"):
+            stack.extend(getattr(item, s) for s in item.__slots__ if hasattr(item, s))
+        elif hasattr(item, "__dict__") and not isinstance(item, type):
+            stack.append(item.__dict__)
+    return total
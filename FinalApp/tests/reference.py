@@ -0,0 +1,142 @@
+"""Gramáticas aleatorias e implementaciones de referencia por fuerza bruta para las pruebas."""
+
+import itertools
+import random
+
+from core.cfg_grammar import CFGGrammar
+
+
+def random_grammar(seed, variables="SABCD", terminals="ab", max_alternatives=3, max_length=4,
+                   lowercase_lhs=False):
+    """
+    Genera las líneas de una gramática aleatoria pequeña.
+
+    Con `lowercase_lhs` algunas reglas tienen como lado izquierdo un símbolo
+    en minúscula, que el analizador acepta y que queda a la vez como variable
+    y como terminal.
+    """
+    rnd = random.Random(seed)
+    heads = list(variables)
+    if lowercase_lhs:
+        heads += rnd.sample(terminals, rnd.randint(1, len(terminals)))
+    lines = []
+    for head in heads:
+        alternatives = []
+        for _ in range(rnd.randint(1, max_alternatives)):
+            length = rnd.randint(0, max_length)
+            alternatives.append("".join(rnd.choice(variables + terminals) for _ in range(length)) or "λ")
+        lines.append(f"{head} -> {' | '.join(alternatives)}")
+    rnd.shuffle(lines)
+    return lines
+
+
+def grammar(lines):
+    return CFGGrammar(productions=list(lines))
+
+
+def _symbols(rhs):
+    return "" if rhs == "λ" else rhs
+
+
+def _fixpoint(grammar, max_length, expand):
+    """
+    Punto fijo de conjuntos de cadenas por variable: `expand(rhs, table)`
+    devuelve las cadenas que aporta un lado derecho con la tabla actual.
+    """
+    table = {v: set() for v in grammar.productions}
+    changed = True
+    while changed:
+        changed = False
+        for lhs, rhs_list in grammar.productions.items():
+            for rhs in rhs_list:
+                new = {s for s in expand(_symbols(rhs), table) if len(s) <= max_length} - table[lhs]
+                if new:
+                    table[lhs] |= new
+                    changed = True
+    return table
+
+
+def _concat(left, right, max_length):
+    return {a + b for a in left for b in right if len(a + b) <= max_length}
+
+
+def derived(grammar, max_length):
+    """{ variable: cadenas de terminales de longitud <= `max_length` que deriva }."""
+    productions = grammar.productions
+
+    def strings(symbol, table):
+        if symbol in productions:
+            return table[symbol]
+        return {symbol} if symbol in grammar.terminals else set()
+
+    def expand(symbols, table):
+        result = {""}
+        for symbol in symbols:
+            result = _concat(result, strings(symbol, table), max_length)
+        return result
+
+    return _fixpoint(grammar, max_length, expand)
+
+
+def language(grammar, max_length):
+    """Cadenas del lenguaje de longitud <= `max_length`."""
+    return derived(grammar, max_length).get(grammar.start_symbol, set())
+
+
+def prefixes(grammar, max_length):
+    """
+    Prefijos de longitud <= `max_length` de las cadenas del lenguaje.
+
+    Un prefijo de A → X1 ... Xn es u·v, con u derivada de X1 ... Xi-1 y v
+    prefijo de Xi, siempre que todos los Xj deriven alguna cadena. Las
+    longitudes están acotadas, así que el resultado es exacto.
+    """
+    productions = grammar.productions
+    complete = derived(grammar, max_length)
+    generating = generating_variables(grammar)
+
+    def usable(symbol):
+        return symbol in generating or (symbol not in productions and symbol in grammar.terminals)
+
+    def expand(symbols, table):
+        if not all(usable(s) for s in symbols):
+            return set()
+        found = {""}
+        done = {""}
+        for symbol in symbols:
+            if symbol in productions:
+                partial, full = table[symbol], complete[symbol]
+            else:
+                partial, full = {"", symbol}, {symbol}
+            found |= _concat(done, partial, max_length)
+            done = _concat(done, full, max_length)
+        return found | done
+
+    table = _fixpoint(grammar, max_length, expand)
+    if grammar.start_symbol not in generating:
+        return set()
+    return table.get(grammar.start_symbol, set())
+
+
+def generating_variables(grammar):
+    """Variables que derivan alguna cadena de terminales."""
+    productions = grammar.productions
+    generating = set()
+    changed = True
+    while changed:
+        changed = False
+        for lhs, rhs_list in productions.items():
+            if lhs not in generating and any(
+                    all(s in generating or (s not in productions and s in grammar.terminals)
+                        for s in _symbols(rhs))
+                    for rhs in rhs_list):
+                generating.add(lhs)
+                changed = True
+    return generating
+
+
+def words(terminals, max_length):
+    """Todas las cadenas sobre `terminals` de longitud <= `max_length`."""
+    for length in range(max_length + 1):
+        for word in itertools.product(sorted(terminals), repeat=length):
+            yield "".join(word)
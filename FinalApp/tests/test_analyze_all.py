@@ -0,0 +1,69 @@
+import pytest
+
+from core.grammar_algorithms import AnalysisCache, GrammarAlgorithms, _fixpoint_rounds
+from reference import derived, generating_variables, grammar, random_grammar
+
+MAX_LENGTH = 4
+
+
+def separate(g, engine, trace):
+    alg = GrammarAlgorithms(g, engine=engine, cache=AnalysisCache())
+    return {
+        "terminating": alg.compute_terminating_variables(trace=trace),
+        "nullable": alg.compute_nullable_variables(trace=trace),
+        "reachable": alg.compute_reachable_variables(trace=trace),
+        "unit": alg.compute_all_unit_closures(),
+    }
+
+
+@pytest.mark.parametrize("seed", range(150))
+@pytest.mark.parametrize("lowercase_lhs", [False, True])
+def test_analyze_all_matches_separate_analyses(seed, lowercase_lhs):
+    g = grammar(random_grammar(seed, lowercase_lhs=lowercase_lhs))
+    combined = GrammarAlgorithms(g, cache=AnalysisCache()).analyze_all()
+    for engine in ("bitset", "worklist"):
+        expected = separate(g, engine, "full")
+        for name, value in expected.items():
+            assert combined[name] == value, (engine, name)
+
+    compact = g.compact()
+    rounds = _fixpoint_rounds(compact)
+    assert combined["nullable"][0] == {compact.symbols[v] for v in rounds}
+    assert combined["nullable"][0] == {v for v, words in derived(g, MAX_LENGTH).items() if "" in words}
+    if not lowercase_lhs:
+        # TERM toma como resueltos los símbolos que también son terminales
+        assert combined["terminating"][0] == generating_variables(g)
+
+
+def test_lowercase_variable_is_nullable():
+    g = grammar(["S -> a", "a -> λ"])
+    cache = AnalysisCache()
+    nullable, _ = GrammarAlgorithms(g, cache=cache).analyze_all()["nullable"]
+    assert nullable == {"S", "a"}
+    # La caché compartida guarda el resultado correcto
+    assert GrammarAlgorithms(g, cache=cache).compute_nullable_variables()[0] == {"S", "a"}
+    assert GrammarAlgorithms(g, cache=AnalysisCache()).compute_nullable_variables()[0] == {"S", "a"}
+
+
+@pytest.mark.parametrize("analyses", [("nullable",), ("nullable", "reachable"), ("useless",),
+                                      ("terminating", "unit")])
+def test_subset_computes_only_the_requested_analyses(analyses):
+    g = grammar(random_grammar(3))
+    cache = AnalysisCache()
+    subset = GrammarAlgorithms(g, cache=cache).analyze_all(analyses=analyses)
+    full = GrammarAlgorithms(g, cache=AnalysisCache()).analyze_all()
+    assert subset.keys() == set(analyses)
+    for name in analyses:
+        if name == "useless":
+            assert subset[name][0].to_dict() == full[name][0].to_dict()
+            assert subset[name][1] == full[name][1]
+        else:
+            assert subset[name] == full[name]
+    computed = cache._by_fingerprint[g.fingerprint()]
+    skipped = {"nullable", "reachable", "unit"} - set(analyses)
+    assert not computed & skipped
+
+
+def test_unknown_analysis_is_rejected():
+    with pytest.raises(ValueError):
+        GrammarAlgorithms(grammar(["S -> a"])).analyze_all(analyses=("first",))
@@ -0,0 +1,73 @@
+import io
+import json
+
+from core import batch
+
+GRAMMARS = ["S -> aSb | λ", "S -> AB\nA -> a | λ\nB -> b", "S -> aA\nA -> bS | C", ""]
+
+
+def records(tmp_path, **kwargs):
+    files = []
+    for i, text in enumerate(GRAMMARS):
+        path = tmp_path / f"g{i}.txt"
+        path.write_text(text, encoding="utf-8")
+        files.append(str(path))
+    output = io.StringIO()
+    summary = batch.run_batch(files, output, **kwargs)
+    lines = [json.loads(line) for line in output.getvalue().splitlines()]
+    for record in lines:
+        record.pop("elapsed")
+    return summary, lines
+
+
+def test_parallel_matches_serial_with_fewer_files_than_chunksize(tmp_path, monkeypatch):
+    pools = []
+    create = batch.process_pool
+
+    def counting_pool(*args):
+        pools.append(args)
+        return create(*args)
+
+    monkeypatch.setattr(batch, "process_pool", counting_pool)
+    serial = records(tmp_path, workers=1)
+    parallel = records(tmp_path, workers=2, chunksize=16)
+    assert len(pools) == 1
+    assert parallel == serial
+    assert serial[0] == {"success": 3, "error": 1, "timeout": 0}
+
+
+def test_no_steps_strips_nested_steps():
+    record = batch.analyze_grammar("S -> aS | A\nA -> λ", ("all", "nullable"), steps=False)
+    assert record["status"] == "success"
+    combined = record["results"]["all"]
+    assert "steps" not in combined
+    assert combined["value"].keys() == set(batch.AppAPI.ALL_ANALYSES)
+    assert all("steps" not in r for r in combined["value"].values())
+    assert "steps" not in record["results"]["nullable"]
+
+    with_steps = batch.analyze_grammar("S -> aS | A\nA -> λ", ("all",))
+    assert all("steps" in r for r in with_steps["results"]["all"]["value"].values())
+
+
+def test_undecodable_file_is_an_error_record(tmp_path):
+    good = tmp_path / "good.txt"
+    good.write_text(GRAMMARS[0], encoding="utf-8")
+    bad = tmp_path / "latin1.txt"
+    bad.write_bytes("S -> ñS | a".encode("latin-1"))
+    files = [str(bad), str(good)]
+    for workers in (1, 2):
+        output = io.StringIO()
+        summary = batch.run_batch(files, output, workers=workers)
+        assert summary == {"success": 1, "error": 1, "timeout": 0}
+        first, second = (json.loads(line) for line in output.getvalue().splitlines())
+        assert first["file"] == str(bad) and first["status"] == "error"
+        assert second["file"] == str(good) and second["status"] == "success"
+
+
+def test_shared_pass_matches_separate_analyses():
+    text = "S -> aS | A | B\nA -> λ | AB\nB -> b"
+    algorithms = ("reachable", "nullable", "first")
+    record = batch.analyze_grammar(text, algorithms)
+    api = batch.AppAPI()
+    api.load_grammar(text)
+    assert record["results"] == {name: api.run_algorithm(name)["result"] for name in algorithms}
@@ -0,0 +1,47 @@
+import pytest
+
+from core.grammar_algorithms import AnalysisCache, GrammarAlgorithms
+from reference import grammar, language, random_grammar
+
+MAX_LENGTH = 5
+
+
+def assert_cnf(g):
+    """Cada producción es A → BC, A → a o S → λ (con S fuera de los lados derechos)."""
+    for lhs, rhs_list in g.productions.items():
+        for rhs in rhs_list:
+            if rhs == "λ":
+                assert lhs == g.start_symbol
+            elif len(rhs) == 1:
+                assert rhs in g.terminals and rhs not in g.variables, (lhs, rhs)
+            else:
+                assert len(rhs) == 2 and all(s in g.variables for s in rhs), (lhs, rhs)
+                assert g.start_symbol not in rhs or "λ" not in g.productions.get(g.start_symbol, ())
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_preserves_language_and_is_in_cnf(seed):
+    g = grammar(random_grammar(seed, max_length=5))
+    cnf, steps = GrammarAlgorithms(g, cache=AnalysisCache()).to_cnf()
+    assert_cnf(cnf)
+    assert language(cnf, MAX_LENGTH) == language(g, MAX_LENGTH)
+    assert [s["iteration"] for s in steps] == ["START", "TERM", "BIN", "DEL", "UNIT", "Inútiles",
+                                               "Resultado Final"]
+
+
+def test_long_nullable_right_hand_side_stays_polynomial():
+    # Con DEL antes que BIN, S → ABCDEFGHIJ daría 2^10 variantes
+    body = "ABCDEFGHIJ"
+    lines = [f"S -> {body}"] + [f"{v} -> {v.lower()} | λ" for v in body]
+    g = grammar(lines)
+    cnf, _ = GrammarAlgorithms(g, cache=AnalysisCache()).to_cnf(trace="off")
+    assert_cnf(cnf)
+    assert sum(len(rhs_list) for rhs_list in cnf.productions.values()) < 200
+    assert language(cnf, 3) == language(g, 3)
+
+
+def test_does_not_modify_the_original():
+    g = grammar(["S -> aSb | SS | λ", "A -> S"])
+    before = {lhs: list(rhs_list) for lhs, rhs_list in g.productions.items()}
+    GrammarAlgorithms(g, cache=AnalysisCache()).to_cnf()
+    assert g.productions == before
@@ -0,0 +1,38 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from core.cyk import CYKRecognizer
+from reference import grammar, language, random_grammar, words
+
+MAX_LENGTH = 5
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_matches_brute_force_language(seed):
+    g = grammar(random_grammar(seed))
+    expected = language(g, MAX_LENGTH)
+    recognizer = CYKRecognizer(g)
+    for word in words("ab", MAX_LENGTH):
+        assert recognizer.recognize(word) == (word in expected), word
+
+
+def test_empty_word_and_unknown_terminal():
+    recognizer = CYKRecognizer(grammar(["S -> aSb | λ"]))
+    assert recognizer.recognize("λ")
+    assert recognizer.recognize("")
+    assert recognizer.recognize("aabb")
+    assert not recognizer.recognize("abc")
+
+
+def test_recognize_many_with_own_and_caller_pool():
+    g = grammar(["S -> aSb | SS | λ"])
+    recognizer = CYKRecognizer(g)
+    batch = list(words("ab", 6))
+    expected = [recognizer.recognize(w) for w in batch]
+    assert recognizer.recognize_many(batch, workers=2, chunksize=8) == expected
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        assert recognizer.recognize_many(batch, chunksize=8, executor=executor) == expected
+        # El mismo pool sirve para otro reconocedor
+        other = CYKRecognizer(grammar(["S -> ab"]))
+        assert other.recognize_many(["ab", "ba"], executor=executor) == [True, False]
@@ -0,0 +1,43 @@
+import pytest
+
+from core.cyk import CYKRecognizer
+from core.earley import EarleyRecognizer
+from reference import grammar, language, prefixes, random_grammar, words
+
+MAX_LENGTH = 5
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_matches_brute_force_language(seed):
+    g = grammar(random_grammar(seed))
+    expected = language(g, MAX_LENGTH)
+    recognizer = EarleyRecognizer(g)
+    for word in words("ab", MAX_LENGTH):
+        assert recognizer.recognize(word) == (word in expected), word
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_feed_accepts_exactly_the_viable_prefixes(seed):
+    g = grammar(random_grammar(seed))
+    viable = prefixes(g, MAX_LENGTH)
+    recognizer = EarleyRecognizer(g)
+    for word in words("ab", MAX_LENGTH):
+        if not word:
+            continue
+        recognizer.reset()
+        accepted = all(recognizer.feed(symbol) for symbol in word)
+        assert accepted == (word in viable), word
+
+
+def test_prefix_through_non_generating_variable_is_rejected():
+    recognizer = EarleyRecognizer(grammar(["S -> aX | b", "X -> Xc"]))
+    assert not recognizer.feed("a")
+    assert recognizer.failed_at == 0
+    assert recognizer.recognize("b")
+
+
+def test_agrees_with_cyk_on_longer_words():
+    g = grammar(["S -> aSb | SS | λ"])
+    earley, cyk = EarleyRecognizer(g), CYKRecognizer(g)
+    for word in words("ab", 8):
+        assert earley.recognize(word) == cyk.recognize(word), word
@@ -0,0 +1,36 @@
+import pytest
+
+from core.grammar_algorithms import AnalysisCache, GrammarAlgorithms
+from reference import grammar, language, random_grammar
+
+MAX_LENGTH = 5
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_preserves_language_without_lambda_productions(seed):
+    g = grammar(random_grammar(seed, max_length=6))
+    result, _ = GrammarAlgorithms(g, cache=AnalysisCache()).eliminate_epsilon_productions()
+    start = result.start_symbol
+    for lhs, rhs_list in result.productions.items():
+        assert len(rhs_list) == len(set(rhs_list))
+        if "λ" in rhs_list:
+            # Solo el símbolo inicial conserva λ, y entonces no aparece a la derecha
+            assert lhs == start
+            assert all(start not in rhs for rhs_list in result.productions.values() for rhs in rhs_list)
+    assert language(result, MAX_LENGTH) == language(g, MAX_LENGTH)
+
+
+def test_many_nullable_symbols_grow_linearly():
+    # La expansión en subconjuntos daría 2^16 variantes de S
+    body = "ABCDEFGHIJKLMNOP"
+    lines = [f"S -> {body}"] + [f"{v} -> {v.lower()} | λ" for v in body]
+    g = grammar(lines)
+    result, _ = GrammarAlgorithms(g, cache=AnalysisCache()).eliminate_epsilon_productions(trace="off")
+    assert sum(len(rhs_list) for rhs_list in result.productions.values()) <= 6 * len(body)
+    assert language(result, 3) == language(g, 3)
+
+
+def test_production_limit():
+    g = grammar(["S -> ABC", "A -> a | λ", "B -> b | λ", "C -> c | λ"])
+    with pytest.raises(ValueError):
+        GrammarAlgorithms(g, cache=AnalysisCache()).eliminate_epsilon_productions(max_productions=3)
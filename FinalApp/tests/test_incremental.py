@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+from core.grammar_algorithms import AnalysisCache, GrammarAlgorithms
+from reference import grammar, random_grammar
+
+
+def from_scratch(g):
+    """TERM, ANUL y ALC recalculados sin estado incremental ni caché compartida."""
+    copy = grammar(f"{lhs} -> {' | '.join(rhs_list)}" for lhs, rhs_list in g.productions.items())
+    copy.start_symbol = g.start_symbol
+    copy.variables |= g.variables
+    copy.terminals |= g.terminals
+    alg = GrammarAlgorithms(copy, cache=AnalysisCache())
+    return (alg.compute_terminating_variables(trace="off")[0],
+            alg.compute_nullable_variables(trace="off")[0],
+            alg.compute_reachable_variables(trace="off")[0])
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_edits_match_recomputation(seed):
+    rnd = random.Random(seed)
+    g = grammar(random_grammar(seed))
+    alg = GrammarAlgorithms(g, cache=AnalysisCache())
+    inc = alg.track_changes()
+    for _ in range(30):
+        existing = [(lhs, rhs) for lhs, rhs_list in g.productions.items() for rhs in rhs_list]
+        if existing and rnd.random() < 0.5:
+            g.remove_production(*rnd.choice(existing))
+        else:
+            rhs = "".join(rnd.choice("SABCDab") for _ in range(rnd.randint(0, 3)))
+            g.add_production(rnd.choice("SABCD"), rhs)
+        assert (inc.generating, inc.nullable, inc.reachable) == from_scratch(g)
+        assert alg.compute_nullable_variables(trace="off")[0] == inc.nullable
+
+
+def test_traced_query_after_edit_is_not_stale():
+    g = grammar(["S -> A", "A -> a"])
+    alg = GrammarAlgorithms(g, cache=AnalysisCache())
+    alg.track_changes()
+    assert alg.compute_nullable_variables()[0] == set()
+    g.add_production("A", "λ")
+    nullable, steps = alg.compute_nullable_variables()
+    assert nullable == {"A", "S"}
+    assert steps[-1]["variables"] == "{A, S}"
+
+
+def test_edit_invalidates_only_its_own_cache_entries():
+    cache = AnalysisCache()
+    edited = grammar(["S -> aS | b"])
+    other = grammar(["S -> λ"])
+    GrammarAlgorithms(edited, cache=cache).compute_terminating_variables()
+    GrammarAlgorithms(other, cache=cache).compute_nullable_variables()
+    assert len(cache) == 2
+    edited.add_production("S", "c")
+    assert len(cache) == 1
+    GrammarAlgorithms(other, cache=cache).compute_nullable_variables()
+    assert cache.hits == 1
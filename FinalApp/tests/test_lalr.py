@@ -0,0 +1,49 @@
+import pytest
+
+from core.lalr import LALRParser, LALRTable
+from reference import grammar, language, random_grammar, words
+
+MAX_LENGTH = 5
+
+
+def parser(g):
+    table = LALRTable(g)
+    return table, LALRParser(table.to_arrays())
+
+
+@pytest.mark.parametrize("seed", range(400))
+def test_parser_matches_language(seed):
+    g = grammar(random_grammar(seed, max_alternatives=2))
+    table, lalr = parser(g)
+    if table.conflicts:
+        # Solo las gramáticas LALR(1): con conflictos y ciclos de
+        # reducciones el analizador no tiene por qué terminar
+        return
+    expected = language(g, MAX_LENGTH)
+    for word in words(g.terminals, MAX_LENGTH):
+        assert lalr.recognize(word) == (word in expected), word
+
+
+@pytest.mark.parametrize("lines", [
+    ["S -> SaS | b"],
+    ["S -> A | a", "A -> S"],
+    ["S -> AB | λ", "A -> a | λ", "B -> b | λ"],
+])
+def test_conflicts_are_reported(lines):
+    assert LALRTable(grammar(lines)).conflicts
+
+
+def test_reduce_accept_conflict():
+    table = LALRTable(grammar(["S -> A | a", "A -> S"]))
+    kinds = {(c["terminal"], c["kind"]) for c in table.conflicts}
+    assert ("$", "aceptación/reducción") in kinds
+    state = table.goto(0, "S")
+    assert table.action(state, "$") == ("acc",)
+
+
+def test_expression_grammar_is_lalr():
+    g = grammar(["S -> S+T | T", "T -> T*F | F", "F -> (S) | x"])
+    table, lalr = parser(g)
+    assert table.conflicts == []
+    assert lalr.recognize("x+x*(x+x)")
+    assert not lalr.recognize("x+*x")
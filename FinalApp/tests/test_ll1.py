@@ -0,0 +1,131 @@
+import pytest
+
+from core.grammar_algorithms import AnalysisCache, GrammarAlgorithms
+from reference import grammar, language, random_grammar, words
+
+MAX_LENGTH = 5
+
+
+def textbook_sets(g):
+    """PRIM y SIG con el algoritmo iterativo de los libros de texto."""
+    variables = g.variables
+    first = {v: set() for v in variables}
+
+    def first_of(symbols):
+        result = set()
+        for s in symbols:
+            if s not in variables:
+                result.add(s)
+                return result
+            result |= first[s] - {"λ"}
+            if "λ" not in first[s]:
+                return result
+        result.add("λ")
+        return result
+
+    changed = True
+    while changed:
+        changed = False
+        for lhs, rhs_list in g.productions.items():
+            for rhs in rhs_list:
+                new = first_of("" if rhs == "λ" else rhs) - first[lhs]
+                if new:
+                    first[lhs] |= new
+                    changed = True
+
+    follow = {v: set() for v in variables}
+    follow[g.start_symbol].add("$")
+    changed = True
+    while changed:
+        changed = False
+        for lhs, rhs_list in g.productions.items():
+            for rhs in rhs_list:
+                symbols = "" if rhs == "λ" else rhs
+                for i, s in enumerate(symbols):
+                    if s not in variables:
+                        continue
+                    rest = first_of(symbols[i + 1:])
+                    new = rest - {"λ"}
+                    if "λ" in rest:
+                        new |= follow[lhs]
+                    if new - follow[s]:
+                        follow[s] |= new
+                        changed = True
+    return first, follow, first_of
+
+
+def textbook_table(g):
+    first, follow, first_of = textbook_sets(g)
+    table = {}
+    for lhs, rhs_list in g.productions.items():
+        for rhs in rhs_list:
+            prediction = first_of("" if rhs == "λ" else rhs)
+            lookaheads = prediction - {"λ"}
+            if "λ" in prediction:
+                lookaheads |= follow[lhs]
+            for terminal in lookaheads:
+                table.setdefault((lhs, terminal), set()).add(rhs)
+    return table
+
+
+def predictive_parse(table, g, word):
+    """Analizador LL(1) dirigido por la tabla (sin conflictos)."""
+    stack = ["$", g.start_symbol]
+    tokens = list(word) + ["$"]
+    position = 0
+    while stack:
+        top = stack.pop()
+        lookahead = tokens[position]
+        if top not in g.variables:
+            if top != lookahead:
+                return False
+            position += 1
+            continue
+        cell = table.get(top, {}).get(lookahead)
+        if not cell:
+            return False
+        rhs = cell[0]
+        if rhs != "λ":
+            stack.extend(reversed(rhs))
+    return position == len(tokens)
+
+
+@pytest.mark.parametrize("seed", range(80))
+def test_first_follow_and_table_match_textbook_algorithm(seed):
+    g = grammar(random_grammar(seed))
+    alg = GrammarAlgorithms(g, cache=AnalysisCache())
+    first, follow, _ = textbook_sets(g)
+    assert alg.compute_first_sets()[0] == first
+    assert alg.compute_follow_sets()[0] == follow
+
+    table, conflicts = alg.build_ll1_table()
+    flat = {(lhs, t): set(cell) for lhs, row in table.items() for t, cell in row.items()}
+    assert flat == textbook_table(g)
+    assert {(c["variable"], c["terminal"]) for c in conflicts} == {
+        key for key, cell in flat.items() if len(cell) > 1}
+
+
+LL1_GRAMMARS = [
+    ["S -> aSb | λ"],
+    ["S -> AB", "A -> aA | λ", "B -> bB | c"],
+    ["S -> TR", "R -> aTR | λ", "T -> FU", "U -> bFU | λ", "F -> cSd | e"],
+]
+
+
+@pytest.mark.parametrize("lines", LL1_GRAMMARS)
+def test_predictive_parser_recognizes_the_language(lines):
+    g = grammar(lines)
+    table, conflicts = GrammarAlgorithms(g, cache=AnalysisCache()).build_ll1_table()
+    assert conflicts == []
+    expected = language(g, MAX_LENGTH)
+    for word in words(g.terminals, MAX_LENGTH):
+        assert predictive_parse(table, g, word) == (word in expected), word
+
+
+def test_conflict_kinds():
+    g = grammar(["S -> aA | aB", "A -> λ | b", "B -> b"])
+    _, conflicts = GrammarAlgorithms(g, cache=AnalysisCache()).build_ll1_table()
+    assert {(c["variable"], c["terminal"], c["kind"]) for c in conflicts} == {("S", "a", "PRIM/PRIM")}
+    g = grammar(["S -> Ab", "A -> b | λ"])
+    _, conflicts = GrammarAlgorithms(g, cache=AnalysisCache()).build_ll1_table()
+    assert [(c["variable"], c["terminal"], c["kind"]) for c in conflicts] == [("A", "b", "PRIM/SIG")]
@@ -0,0 +1,127 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from wsgiref.simple_server import WSGIRequestHandler, make_server
+
+import pytest
+
+from core.app_api import AppAPI
+from core.cfg_grammar import CFGGrammar
+from core.service import AnalysisService, _ThreadingWSGIServer, create_app
+
+TEXT = "S -> aS | B\nB -> λ"
+
+
+def big_grammar(extra=""):
+    """
+    Gramática grande cuya forma normal de Chomsky tarda unas décimas de
+    segundo. `extra` añade una regla para obtener otra huella (y evitar la
+    caché de análisis del proceso).
+    """
+    names = [chr(c) for c in range(65, 0x10000) if chr(c).isupper()][:1000]
+    rules = [f"{names[i]} -> {names[i + 1]}{names[(i * 7) % 1000]} | {names[(i * 3) % 1000]}a | λ"
+             for i in range(999)]
+    return "\n".join(rules + [f"{names[999]} -> c", extra])
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server():
+    service = AnalysisService(workers=1, max_pending=1, timeout=2.0)
+    httpd = make_server("127.0.0.1", 0, create_app(service), _ThreadingWSGIServer, _QuietHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{httpd.server_port}", service
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        service.close()
+
+
+def call(base, path, body=None):
+    data = None if body is None else json.dumps(body).encode("utf-8")
+    request = urllib.request.Request(base + path, data=data, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.status, dict(response.headers), json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, dict(e.headers), json.load(e)
+
+
+def wait_idle(service):
+    """Espera a que el pool libere todas las plazas."""
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if service._slots.acquire(blocking=False):
+            service._slots.release()
+            return
+        time.sleep(0.05)
+    raise AssertionError("el servicio no quedó libre")
+
+
+def test_load_then_run_by_fingerprint(server):
+    base, _ = server
+    code, _, loaded = call(base, "/load_grammar", {"text": TEXT})
+    assert code == 200
+    assert loaded["grammar"] == CFGGrammar(productions=TEXT.split("\n")).fingerprint()
+
+    api = AppAPI()
+    api.load_grammar(TEXT)
+    for name in ("nullable", "useless", "cnf"):
+        code, _, result = call(base, "/run_algorithm", {"grammar": loaded["grammar"], "algorithm": name})
+        assert code == 200
+        assert result == json.loads(json.dumps(api.run_algorithm(name), ensure_ascii=False))
+
+
+def test_bad_requests(server):
+    base, _ = server
+    assert call(base, "/run_algorithm", {"grammar": "0" * 16, "algorithm": "nullable"})[0] == 404
+    assert call(base, "/load_grammar", {"text": ""})[0] == 400
+    assert call(base, "/load_grammar", [1])[0] == 400
+    assert call(base, "/run_algorithm", {"grammar": "x"})[0] == 400
+
+
+def test_timeout(server):
+    base, service = server
+    wait_idle(service)
+    loaded = call(base, "/load_grammar", {"text": big_grammar()})[2]
+    started = time.monotonic()
+    code, _, body = call(base, "/run_algorithm", {"grammar": loaded["grammar"], "algorithm": "cnf",
+                                                  "timeout": 0.05})
+    assert code == 504 and body["status"] == "timeout"
+    assert time.monotonic() - started < 5
+
+
+def test_busy_when_all_slots_are_taken(server):
+    base, service = server
+    wait_idle(service)
+    big = call(base, "/load_grammar", {"text": big_grammar("S -> d")})[2]["grammar"]
+    small = call(base, "/load_grammar", {"text": TEXT})[2]["grammar"]
+
+    slow = []
+    thread = threading.Thread(target=lambda: slow.append(
+        call(base, "/run_algorithm", {"grammar": big, "algorithm": "cnf"})))
+    thread.start()
+    try:
+        # Espera a que el análisis lento ocupe la única plaza
+        deadline = time.monotonic() + 5
+        while service._slots.acquire(blocking=False):
+            service._slots.release()
+            assert time.monotonic() < deadline, "el análisis lento no llegó al pool"
+            time.sleep(0.001)
+        code, headers, body = call(base, "/run_algorithm", {"grammar": small, "algorithm": "nullable"})
+        assert code == 503 and body["status"] == "busy"
+        assert headers.get("Retry-After") == "1"
+    finally:
+        thread.join()
+    # Termina por el límite de producciones o por el tiempo límite
+    assert slow[0][0] in (400, 504)
+    wait_idle(service)
+    assert call(base, "/run_algorithm", {"grammar": small, "algorithm": "nullable"})[0] == 200
@@ -0,0 +1,42 @@
+import pytest
+
+from core.grammar_algorithms import AnalysisCache, GrammarAlgorithms
+from reference import grammar, language, random_grammar
+
+MAX_LENGTH = 5
+
+
+def unit_closure(g, variable):
+    """Variables alcanzables desde `variable` con producciones A → B, por búsqueda directa."""
+    seen = {variable}
+    stack = [variable]
+    while stack:
+        for rhs in g.productions.get(stack.pop(), ()):
+            if len(rhs) == 1 and rhs in g.variables and rhs not in seen:
+                seen.add(rhs)
+                stack.append(rhs)
+    return seen
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_closures_match_direct_search(seed):
+    g = grammar(random_grammar(seed, max_length=2))
+    closures = GrammarAlgorithms(g, cache=AnalysisCache()).compute_all_unit_closures()
+    assert closures == {v: unit_closure(g, v) for v in g.variables}
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_preserves_language_without_unit_productions(seed):
+    g = grammar(random_grammar(seed, max_length=2))
+    result, _ = GrammarAlgorithms(g, cache=AnalysisCache()).eliminate_unit_productions()
+    for rhs_list in result.productions.values():
+        assert len(rhs_list) == len(set(rhs_list))
+        assert not any(len(rhs) == 1 and rhs in result.variables for rhs in rhs_list)
+    assert language(result, MAX_LENGTH) == language(g, MAX_LENGTH)
+
+
+def test_unit_cycle_shares_closure():
+    g = grammar(["S -> A | s", "A -> B | a", "B -> S | b"])
+    result, _ = GrammarAlgorithms(g, cache=AnalysisCache()).eliminate_unit_productions()
+    assert {lhs: sorted(rhs_list) for lhs, rhs_list in result.productions.items()} == {
+        "S": ["a", "b", "s"], "A": ["a", "b", "s"], "B": ["a", "b", "s"]}
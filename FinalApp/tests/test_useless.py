@@ -0,0 +1,72 @@
+import pytest
+
+from core.cfg_grammar import CFGGrammar
+from core.grammar_algorithms import AnalysisCache, GrammarAlgorithms
+from reference import grammar, random_grammar
+
+
+def baseline_useless(g):
+    """
+    Eliminación de variables inútiles como la hacía la versión que volvía a
+    analizar el texto del resultado: TERM, filtrado, ALC y reconstrucción de
+    la gramática a partir de sus líneas.
+    """
+    def symbols(rhs):
+        return "" if rhs == "λ" else rhs
+
+    generating = set()
+    changed = True
+    while changed:
+        changed = False
+        for lhs, rhs_list in g.productions.items():
+            if lhs not in generating and any(
+                    all(s in g.terminals or s in generating for s in symbols(rhs)) for rhs in rhs_list):
+                generating.add(lhs)
+                changed = True
+    if g.start_symbol not in generating:
+        return CFGGrammar(variables=[], terminals=[], productions=[], start_symbol=g.start_symbol)
+
+    kept = {}
+    for lhs, rhs_list in g.productions.items():
+        if lhs in generating:
+            valid = [rhs for rhs in rhs_list
+                     if not any(s in g.variables and s not in generating for s in symbols(rhs))]
+            if valid:
+                kept[lhs] = valid
+
+    reachable = {g.start_symbol}
+    pending = [g.start_symbol]
+    while pending:
+        for rhs in kept.get(pending.pop(), ()):
+            for s in symbols(rhs):
+                if s in g.variables and s not in reachable:
+                    reachable.add(s)
+                    pending.append(s)
+
+    lines = [f"{lhs} -> {' | '.join(rhs_list)}" for lhs, rhs_list in kept.items() if lhs in reachable]
+    return CFGGrammar(variables=[line.split(" -> ")[0] for line in lines], terminals=list(g.terminals),
+                      productions=lines, start_symbol=g.start_symbol)
+
+
+@pytest.mark.parametrize("seed", range(200))
+@pytest.mark.parametrize("lowercase_lhs", [False, True])
+def test_matches_baseline(seed, lowercase_lhs):
+    g = grammar(random_grammar(seed, lowercase_lhs=lowercase_lhs))
+    result, _ = GrammarAlgorithms(g, cache=AnalysisCache()).eliminate_useless_variables()
+    assert result.to_dict() == baseline_useless(g).to_dict()
+
+
+def test_variables_only_on_right_hand_sides_are_kept():
+    g = grammar(["F -> cbbA | a", "a -> DaB", "S -> ca | F | λ", "G -> aG"])
+    result, _ = GrammarAlgorithms(g, cache=AnalysisCache()).eliminate_useless_variables()
+    assert result.productions == {"S": ["F", "λ"]}
+    assert result.variables == {"F", "S"}
+    assert result.to_dict() == baseline_useless(g).to_dict()
+
+
+def test_original_grammar_is_not_modified():
+    lines = ["S -> aA | B", "A -> a | C", "B -> Bb", "C -> CA"]
+    g = grammar(lines)
+    result, _ = GrammarAlgorithms(g, cache=AnalysisCache()).eliminate_useless_variables()
+    result.add_production("S", "b")
+    assert g.to_dict() == grammar(lines).to_dict()
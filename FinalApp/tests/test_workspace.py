@@ -0,0 +1,191 @@
+import json
+import time
+
+from core.app_api import AppAPI
+from core.workspace import GrammarWorkspace
+
+TEXTS = {
+    "A": "S -> aSb | AB\nA -> a | λ\nB -> b | BC\nC -> c",
+    "B": "S -> AS | a\nA -> SA | b",
+    "C": "S -> aA | λ\nA -> bS | CD\nC -> c\nD -> d",
+}
+ALGORITHMS = ("nullable", "first", "useless", "cnf", "ll1")
+
+
+def test_running_total_matches_the_sizes():
+    workspace = GrammarWorkspace()
+    for name, text in TEXTS.items():
+        workspace.add(name, text)
+        for algorithm in ALGORITHMS:
+            first = workspace.result(name, algorithm, lambda alg: AppAPI()._run(alg, algorithm))
+            assert workspace.result(name, algorithm, None) is first
+    sizes = [g["bytes"] for g in workspace.stats()["grammars"]]
+    assert workspace.total_bytes() == sum(sizes) > 0
+
+    workspace.add("B", TEXTS["C"])
+    workspace.remove("A")
+    assert workspace.total_bytes() == sum(g["bytes"] for g in workspace.stats()["grammars"])
+
+
+def test_eviction_keeps_the_total_under_the_limit():
+    workspace = GrammarWorkspace()
+    workspace.add("A", TEXTS["A"])
+    workspace.max_bytes = 3 * workspace.total_bytes()
+    for round_ in range(3):
+        for name, text in TEXTS.items():
+            if round_ == 0:
+                workspace.add(name, text)
+            for algorithm in ALGORITHMS:
+                workspace.result(name, algorithm, lambda alg: AppAPI()._run(alg, algorithm))
+            loaded = [g for g in workspace.stats()["grammars"] if g["loaded"]]
+            assert workspace.total_bytes() == sum(g["bytes"] for g in loaded)
+            assert workspace.total_bytes() <= workspace.max_bytes or len(loaded) == 1
+    assert workspace.evictions > 0
+
+
+def test_compare_resyncs_the_current_grammar():
+    api = AppAPI()
+    for name, text in TEXTS.items():
+        api.load_grammar(text, name)
+    api.select_grammar("A")
+    # Solo cabe una gramática: comparar desaloja la actual
+    api.workspace.max_bytes = 1
+    response = api.compare_grammars(list(TEXTS), "nullable")
+    assert response["status"] == "success"
+    entry = api.workspace.get("A")
+    assert entry.loaded
+    assert api.grammar is entry.grammar and api.alg is entry.alg
+    assert api.run_algorithm("nullable") == response["results"]["A"]
+
+
+def wait_job(api, job_id):
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        status = api.job_status(job_id)
+        if status["state"] != "running":
+            return status["response"]
+        time.sleep(0.01)
+    raise AssertionError("el trabajo no terminó")
+
+
+def test_jobs_use_the_workspace_cache():
+    api = AppAPI()
+    api.load_grammar(TEXTS["A"], "A")
+    response = wait_job(api, api.submit_algorithm("cnf")["job"])
+    assert response["status"] == "success"
+    assert api.workspace.cached("A", "cnf") is response
+    assert api.run_algorithm("cnf") is response
+    assert wait_job(api, api.submit_algorithm("cnf")["job"]) is response
+
+
+class _Window:
+    """Ventana de pywebview mínima: guarda los eventos que recibe."""
+
+    def __init__(self):
+        self.events = []
+
+    def evaluate_js(self, code):
+        self.events.append(code)
+
+
+def test_streamed_jobs_store_the_complete_response():
+    api = AppAPI()
+    api.load_grammar(TEXTS["C"], "C")
+    expected = AppAPI()
+    expected.load_grammar(TEXTS["C"])
+    expected = expected.run_algorithm("useless")
+
+    window = _Window()
+    api.attach_window(window)
+    api.submit_algorithm("useless")
+    deadline = time.monotonic() + 30
+    while not any('"event": "done"' in e for e in window.events):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert api.workspace.cached("C", "useless") == expected
+
+    # La segunda vez se envía la respuesta guardada
+    window.events.clear()
+    api.submit_algorithm("useless")
+    while not any('"event": "done"' in e for e in window.events):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert any('"event": "result"' in e for e in window.events)
+    assert any('"event": "steps"' in e for e in window.events)
+
+
+def job_events(window):
+    prefix = "window.onJobEvent && window.onJobEvent("
+    return [json.loads(e[len(prefix):-1]) for e in window.events]
+
+
+def test_jobs_use_the_id_chosen_by_the_page():
+    api = AppAPI()
+    api.load_grammar(TEXTS["A"], "A")
+    api.run_algorithm("nullable")
+    window = _Window()
+    api.attach_window(window)
+
+    # Trabajo guardado: sus eventos pueden llegar antes que la respuesta
+    assert api.submit_algorithm("nullable", 7) == {"status": "success", "job": 7}
+    deadline = time.monotonic() + 30
+    while not any(e["event"] == "done" for e in job_events(window)):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    events = job_events(window)
+    assert {e["job"] for e in events} == {7}
+    assert [e["event"] for e in events][0] == "result" and events[-1] == {"job": 7, "event": "done",
+                                                                         "status": "success"}
+
+
+def test_job_ids_are_not_reused_while_running():
+    api = AppAPI()
+    api.load_grammar(TEXTS["B"], "B")
+    assert api.submit_algorithm("cnf", 3)["job"] == 3
+    # Sin ventana el trabajo se conserva hasta consultarlo con job_status
+    assert api.submit_algorithm("cnf", 3)["status"] == "error"
+    assert wait_job(api, 3)["status"] == "success"
+    assert api.submit_algorithm("cnf", 3)["job"] == 3
+
+
+def read_all(api, name):
+    opened = api.open_stream(name)
+    assert opened["status"] == "success"
+    steps = []
+    while True:
+        chunk = api.read_stream(opened["stream"], 2)
+        assert chunk["status"] == "success"
+        steps.extend(chunk["steps"])
+        if chunk["done"]:
+            return {"status": "success", "result": {**opened["result"], "steps": steps}}
+
+
+def test_streams_use_the_workspace_cache():
+    api = AppAPI()
+    api.load_grammar(TEXTS["A"], "A")
+    expected = AppAPI()
+    expected.load_grammar(TEXTS["A"])
+
+    streamed = read_all(api, "first")
+    assert streamed == expected.run_algorithm("first")
+    stored = api.workspace.cached("A", "first")
+    assert stored == streamed
+    assert api.run_algorithm("first") is stored
+    # La segunda vez los pasos salen de la respuesta guardada
+    again = read_all(api, "first")
+    assert again == stored
+    assert all(a is b for a, b in zip(again["result"]["steps"], stored["result"]["steps"]))
+
+
+def test_responses_of_a_replaced_grammar_are_not_stored():
+    api = AppAPI()
+    api.load_grammar(TEXTS["A"], "A")
+    opened = api.open_stream("nullable")
+    api.load_grammar(TEXTS["B"], "A")
+    while not api.read_stream(opened["stream"])["done"]:
+        pass
+    assert api.workspace.cached("A", "nullable") is None
+
+    expected = AppAPI()
+    expected.load_grammar(TEXTS["B"])
+    assert api.run_algorithm("nullable") == expected.run_algorithm("nullable")
@@ -0,0 +1,174 @@
+// Lista virtualizada: solo mantiene en el DOM las filas cercanas al área
+// visible de su contenedor con scroll.
+//
+// Las filas se agrupan en bloques de tamaño fijo. Un bloque cercano a la
+// vista se dibuja; uno lejano se vacía y conserva su altura (medida, o
+// estimada si nunca se dibujó), así que la barra de desplazamiento refleja la
+// lista completa. Admite filas de altura variable y listas que crecen con
+// append() (p. ej. los pasos que llegan por bloques).
+//
+// Uso:
+//     const list = new VirtualList(scroller, host, (item, index, list) => nodo);
+//     list.append(items);
+//     list.refresh(index);   // vuelve a dibujar una fila que cambió
+class VirtualList {
+    constructor(scroller, host, renderRow, options = {}) {
+        this.scroller = scroller;
+        this.host = host;
+        this.renderRow = renderRow;
+        this.blockSize = options.blockSize || 50;
+        this.rowHeight = options.rowHeight || 32;
+        this.items = [];
+        this.blocks = [];
+        this.measuredHeight = 0;
+        this.measuredRows = 0;
+        this.scheduled = false;
+
+        // Una lista por contenedor: la anterior quedó fuera del DOM al
+        // reemplazar su contenido
+        const previous = VirtualList.active.get(scroller);
+        if (previous) previous.destroy();
+        VirtualList.active.set(scroller, this);
+
+        this.onScroll = () => this.schedule();
+        scroller.addEventListener("scroll", this.onScroll, {passive: true});
+        window.addEventListener("resize", this.onScroll);
+    }
+
+    get length() {
+        return this.items.length;
+    }
+
+    destroy() {
+        this.scroller.removeEventListener("scroll", this.onScroll);
+        window.removeEventListener("resize", this.onScroll);
+        if (VirtualList.active.get(this.scroller) === this) {
+            VirtualList.active.delete(this.scroller);
+        }
+    }
+
+    append(items) {
+        const firstTouched = Math.max(this.blocks.length - 1, 0);
+        for (const item of items) {
+            let block = this.blocks[this.blocks.length - 1];
+            if (!block || block.count === this.blockSize) {
+                block = {start: this.items.length, count: 0, rendered: false, el: document.createElement("div")};
+                // flow-root evita que los márgenes de las filas escapen del bloque
+                block.el.style.display = "flow-root";
+                this.blocks.push(block);
+                this.host.appendChild(block.el);
+            }
+            this.items.push(item);
+            block.count++;
+            if (block.rendered) {
+                block.el.appendChild(this.renderRow(item, this.items.length - 1, this));
+            }
+        }
+        for (let b = firstTouched; b < this.blocks.length; b++) {
+            const block = this.blocks[b];
+            if (!block.rendered) block.el.style.height = `${block.count * this.estimate()}px`;
+        }
+        this.schedule();
+    }
+
+    refresh(index) {
+        const block = this.blocks[Math.floor(index / this.blockSize)];
+        if (block && block.rendered) this.renderBlock(block);
+    }
+
+    estimate() {
+        return this.measuredRows ? this.measuredHeight / this.measuredRows : this.rowHeight;
+    }
+
+    schedule() {
+        if (this.scheduled) return;
+        this.scheduled = true;
+        requestAnimationFrame(() => this.update());
+    }
+
+    update() {
+        this.scheduled = false;
+        if (!this.host.isConnected) {
+            this.destroy();
+            return;
+        }
+        // Se dibuja una pantalla adicional por encima y por debajo de la vista
+        const view = this.scroller.getBoundingClientRect();
+        const top = view.top - view.height;
+        const bottom = view.bottom + view.height;
+        for (const block of this.blocks) {
+            const rect = block.el.getBoundingClientRect();
+            const visible = rect.bottom >= top && rect.top <= bottom;
+            if (visible && !block.rendered) {
+                this.renderBlock(block);
+            } else if (!visible && block.rendered) {
+                this.clearBlock(block);
+            }
+        }
+    }
+
+    renderBlock(block) {
+        const fragment = document.createDocumentFragment();
+        for (let i = block.start; i < block.start + block.count; i++) {
+            fragment.appendChild(this.renderRow(this.items[i], i, this));
+        }
+        block.el.style.height = "";
+        block.el.replaceChildren(fragment);
+        if (!block.rendered) {
+            this.measuredHeight += block.el.offsetHeight;
+            this.measuredRows += block.count;
+        }
+        block.rendered = true;
+    }
+
+    clearBlock(block) {
+        const height = block.el.offsetHeight;
+        block.el.replaceChildren();
+        block.el.style.height = `${height}px`;
+        block.rendered = false;
+    }
+}
+
+// Lista virtual activa de cada contenedor con scroll
+VirtualList.active = new WeakMap();
+
+// Número de elementos que se muestran de una lista larga antes de desplegarla
+const COLLAPSE_LIMIT = 20;
+
+// Fila "clave → valores" para VirtualList. Los elementos son
+// {key, values, expanded}; las listas de más de COLLAPSE_LIMIT valores se
+// recortan con un enlace que las despliega.
+function keyValueRow(separator, prefix = "", suffix = "", valueClass = "") {
+    return (item, index, list) => {
+        const row = document.createElement("div");
+        row.className = "table-row";
+
+        const key = document.createElement("span");
+        key.className = "table-key";
+        key.textContent = item.key;
+
+        const arrow = document.createElement("span");
+        arrow.className = "arrow";
+        arrow.textContent = "→";
+
+        const value = document.createElement("span");
+        if (valueClass) value.className = valueClass;
+        const hidden = item.expanded ? 0 : Math.max(item.values.length - COLLAPSE_LIMIT, 0);
+        const shown = hidden ? item.values.slice(0, COLLAPSE_LIMIT) : item.values;
+        value.textContent = prefix + shown.join(separator) + (hidden ? separator : suffix);
+        if (hidden) {
+            const more = document.createElement("button");
+            more.className = "expand-btn";
+            more.textContent = `+${hidden} más`;
+            more.onclick = () => {
+                item.expanded = true;
+                list.refresh(index);
+            };
+            value.appendChild(more);
+            value.append(suffix);
+        }
+
+        row.append(key, " ", arrow, " ", value);
+        return row;
+    };
+}
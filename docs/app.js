@@ -1,146 +1,62 @@
-// Global variables
-let pyodide = null;
-let appAPI = null;
+// Pyodide runs in a Web Worker (worker.js); the page talks to it with messages
+const engine = new Worker('worker.js');
+let nextCall = 1;
+const pendingCalls = new Map();
 
-// Initialize Pyodide and load Python modules
-async function initializePyodide() {
-    const loadingIndicator = document.getElementById('loading-indicator');
-    const appControls = document.getElementById('app-controls');
-    
-    try {
-        loadingIndicator.querySelector('p').textContent = 'Cargando Pyodide...';
-        
-        // Load Pyodide
-        pyodide = await loadPyodide();
-        
-        loadingIndicator.querySelector('p').textContent = 'Cargando módulos Python...';
-        
-        // Load Python files
-        const cfgGrammarResponse = await fetch('cfg_grammar.py');
-        const cfgGrammarCode = await cfgGrammarResponse.text();
-        
-        const grammarAlgorithmsResponse = await fetch('grammar_algorithms.py');
-        const grammarAlgorithmsCode = await grammarAlgorithmsResponse.text();
-        
-        // Load modules into Pyodide
-        await pyodide.runPythonAsync(cfgGrammarCode);
-        await pyodide.runPythonAsync(grammarAlgorithmsCode);
-        
-        // Create AppAPI class in Python
-        await pyodide.runPythonAsync(`
-class AppAPI:
-    def __init__(self):
-        self.grammar = None
-        self.alg = None
-
-    def load_grammar(self, productions_text):
-        """Parses grammar from frontend input."""
-        try:
-            lines = [ln.strip() for ln in productions_text.split("\\n") if ln.strip()]
-            if not lines:
-                raise ValueError("No hay ninguna regla.")
-
-            self.grammar = CFGGrammar(productions=lines)
-            self.alg = GrammarAlgorithms(self.grammar)
-            
-            return {
-                "status": "success", 
-                "message": "Gramatica guardada con exito.",
-                "data": self.grammar.to_dict()
-            }
-        except Exception as e:
-            return {"status": "error", "message": str(e)}
-
-    def run_algorithm(self, name):
-        """Runs the requested algorithm and returns structured data."""
-        if not self.grammar or not self.alg:
-            return {"status": "error", "message": "Por favor cargue una gramatica primero."}
-
-        try:
-            result_data = None
-            
-            if name == "terminating":
-                res, steps = self.alg.compute_terminating_variables()
-                result_data = {
-                    "type": "set", 
-                    "title": "Variables Terminables", 
-                    "value": sorted(list(res)),
-                    "steps": steps
-                }
-
-            elif name == "nullable":
-                res, steps = self.alg.compute_nullable_variables()
-                result_data = {
-                    "type": "set", 
-                    "title": "Variables Anulables", 
-                    "value": sorted(list(res)),
-                    "steps": steps
-                }
-
-            elif name == "reachable":
-                res, steps = self.alg.compute_reachable_variables()
-                result_data = {
-                    "type": "set", 
-                    "title": "Variables Alcanzables", 
-                    "value": sorted(list(res)),
-                    "steps": steps
-                }
-
-            elif name == "unit":
-                res = {}
-                steps = []
-                for i, v in enumerate(sorted(self.grammar.variables)):
-                    closure = self.alg.compute_unit_closure(v)
-                    res[v] = sorted(list(closure))
-                    steps.append({
-                        "iteration": f"Clausura {i+1}",
-                        "variables": f"{v} → {{{', '.join(closure)}}}",
-                        "explanation": f"Clausura unitaria de {v}",
-                        "type": "unit"
-                    })
-                result_data = {
-                    "type": "dict", 
-                    "title": "Clausuras unitarias", 
-                    "value": res,
-                    "steps": steps
-                }
-
-            elif name == "useless":
-                new_g, steps = self.alg.eliminate_useless_variables()
-                result_data = {
-                    "type": "grammar", 
-                    "title": "Gramatica Simplificada", 
-                    "value": new_g.to_dict(),
-                    "steps": steps
-                }
-            
-            else:
-                return {"status": "error", "message": f"Unknown algorithm: {name}"}
+// Calls an AppAPI method in the worker; resolves with its result
+function callEngine(method, ...args) {
+    return new Promise((resolve, reject) => {
+        const id = nextCall++;
+        pendingCalls.set(id, {resolve, reject});
+        engine.postMessage({id, method, args});
+    });
+}
 
-            return {"status": "success", "result": result_data}
+const appAPI = {
+    load_grammar: (text, name) => callEngine('load_grammar', text, name),
+    run_algorithm: op => callEngine('run_algorithm', op),
+    select_grammar: name => callEngine('select_grammar', name),
+    remove_grammar: name => callEngine('remove_grammar', name),
+    list_grammars: () => callEngine('list_grammars'),
+    compare_grammars: (names, op) => callEngine('compare_grammars', names, op),
+};
 
-        except Exception as e:
-            return {"status": "error", "message": str(e)}
+engine.onmessage = function(e) {
+    const message = e.data;
+    if (message.id !== undefined) {
+        const call = pendingCalls.get(message.id);
+        pendingCalls.delete(message.id);
+        if (message.error !== undefined) {
+            call.reject(new Error(message.error));
+        } else {
+            call.resolve(message.result);
+        }
+    } else if (message.run !== undefined) {
+        handleRunEvent(message);
+    } else {
+        handleEngineStatus(message);
+    }
+};
 
-# Create global API instance
-api = AppAPI()
-        `);
-        
-        // Get reference to Python API
-        appAPI = pyodide.globals.get('api');
-        
+// Startup progress of the worker
+function handleEngineStatus(message) {
+    const loadingIndicator = document.getElementById('loading-indicator');
+    const appControls = document.getElementById('app-controls');
+    
+    if (message.event === 'loading') {
+        loadingIndicator.querySelector('p').textContent = message.message;
+    } else if (message.event === 'ready') {
         // Hide loading, show controls
         loadingIndicator.style.display = 'none';
         appControls.style.display = 'block';
         
         showToast('Aplicación lista para usar', false);
-        
-    } catch (error) {
-        console.error('Error initializing Pyodide:', error);
+    } else if (message.event === 'failed') {
+        console.error('Error initializing Pyodide:', message.message);
         loadingIndicator.innerHTML = `
             <div style="color: #ef4444;">
                 <p>Error al cargar la aplicación</p>
-                <p style="font-size: 0.8rem;">${error.message}</p>
+                <p style="font-size: 0.8rem;">${message.message}</p>
             </div>
         `;
     }
@@ -166,7 +82,9 @@ function renderResult(data) {
 
     if (data.type === "set") {
         if (data.value.length === 0) {
-            outputContainer.innerHTML += "<em>Conjunto vacío</em>";
+            const empty = document.createElement("em");
+            empty.textContent = "Conjunto vacío";
+            outputContainer.appendChild(empty);
         } else {
             data.value.forEach(item => {
                 const badge = document.createElement("span");
@@ -177,13 +95,29 @@ function renderResult(data) {
         }
     } 
     else if (data.type === "dict") {
-        for (const [key, val] of Object.entries(data.value)) {
-            const row = document.createElement("div");
-            row.className = "table-row";
-            row.innerHTML = `<span class="table-key">${key}</span> <span class="arrow">→</span> <span>{ ${val.join(", ")} }</span>`;
-            outputContainer.appendChild(row);
-        }
+        // Only the visible rows are drawn (see virtual-list.js)
+        const rows = document.createElement("div");
+        outputContainer.appendChild(rows);
+        new VirtualList(outputContainer, rows, keyValueRow(", ", "{ ", " }"))
+            .append(Object.entries(data.value).map(([key, values]) => ({key, values, expanded: false})));
     } 
+    else if (data.type === "table") {
+        const table = document.createElement("table");
+        table.className = "ll1-table";
+        const header = document.createElement("tr");
+        header.innerHTML = "<th></th>" + data.value.columns.map(c => `<th>${c}</th>`).join("");
+        table.appendChild(header);
+        for (const [lhs, row] of Object.entries(data.value.rows)) {
+            const tr = document.createElement("tr");
+            tr.innerHTML = `<th>${lhs}</th>` + data.value.columns.map(c => {
+                const cell = row[c] || [];
+                const cls = cell.length > 1 ? ' class="conflict"' : "";
+                return `<td${cls}>${cell.map(r => `${lhs} → ${r}`).join("<br>")}</td>`;
+            }).join("");
+            table.appendChild(tr);
+        }
+        outputContainer.appendChild(table);
+    }
     else if (data.type === "grammar") {
         renderGrammar(data.value, null, true);
     }
@@ -221,25 +155,25 @@ function renderGrammar(grammarData, customTitle, append = false) {
     prodContainer.style.padding = "10px";
     prodContainer.style.borderRadius = "6px";
 
-    for (const [lhs, rhsList] of Object.entries(grammarData.productions)) {
-        const row = document.createElement("div");
-        row.className = "table-row";
-        const displayRhs = rhsList.map(r => r === "λ" ? "λ" : r).join(" | ");
-        row.innerHTML = `<span class="table-key">${lhs}</span> <span class="arrow">→</span> <span class="prod-list">${displayRhs}</span>`;
-        prodContainer.appendChild(row);
-    }
     outputContainer.appendChild(prodContainer);
+    new VirtualList(outputContainer, prodContainer, keyValueRow(" | ", "", "", "prod-list"))
+        .append(Object.entries(grammarData.productions).map(([key, values]) => ({key, values, expanded: false})));
 }
 
 function renderSteps(steps, title) {
+    startSteps(title);
+    appendSteps(steps || []);
+    finishSteps();
+}
+
+// Steps may arrive in chunks (see handleRunAlgorithm): startSteps prepares
+// the panel, appendSteps adds each chunk and finishSteps handles no steps.
+let stepList = null;
+
+function startSteps(title) {
     const stepsContent = document.getElementById('steps-content');
     stepsContent.innerHTML = "";
     
-    if (!steps || steps.length === 0) {
-        stepsContent.innerHTML = '<p style="color: #94a3b8; font-style: italic;">No hay pasos para mostrar.</p>';
-        return;
-    }
-    
     // Algorithm title
     const h4 = document.createElement("h4");
     h4.style.margin = "0 0 15px 0";
@@ -247,43 +181,57 @@ function renderSteps(steps, title) {
     h4.textContent = title || "Proceso del Algoritmo";
     stepsContent.appendChild(h4);
     
-    // Show each step
-    steps.forEach((step, index) => {
-        const stepDiv = document.createElement("div");
-        stepDiv.className = `step-item ${step.type || ""}`;
-        
-        const header = document.createElement("div");
-        header.className = "step-header";
-        
-        const iteration = document.createElement("span");
-        iteration.className = "step-iteration";
-        iteration.textContent = step.iteration || `Paso ${index + 1}`;
-        
-        const vars = document.createElement("span");
-        vars.className = "step-vars";
-        vars.textContent = step.variables || step.result || "";
-        
-        header.appendChild(iteration);
-        header.appendChild(vars);
-        stepDiv.appendChild(header);
-        
-        if (step.explanation) {
-            const explanation = document.createElement("div");
-            explanation.className = "step-rule";
-            explanation.textContent = step.explanation;
-            stepDiv.appendChild(explanation);
-        }
-        
-        if (step.newVariables && step.newVariables.length > 0) {
-            const newVars = document.createElement("div");
-            newVars.className = "step-rule";
-            newVars.innerHTML = `<strong style="color: #059669;">Añadidas:</strong> ${step.newVariables.join(", ")}`;
-            newVars.style.marginTop = "4px";
-            stepDiv.appendChild(newVars);
-        }
-        
-        stepsContent.appendChild(stepDiv);
-    });
+    // Only the visible steps are drawn (see virtual-list.js)
+    const host = document.createElement("div");
+    stepsContent.appendChild(host);
+    stepList = new VirtualList(document.getElementById('steps-container'), host, renderStep, {rowHeight: 70});
+}
+
+function appendSteps(steps) {
+    stepList.append(steps);
+}
+
+function finishSteps() {
+    if (stepList.length === 0) {
+        document.getElementById('steps-content').innerHTML = '<p style="color: #94a3b8; font-style: italic;">No hay pasos para mostrar.</p>';
+    }
+}
+
+function renderStep(step, index) {
+    const stepDiv = document.createElement("div");
+    stepDiv.className = `step-item ${step.type || ""}`;
+    
+    const header = document.createElement("div");
+    header.className = "step-header";
+    
+    const iteration = document.createElement("span");
+    iteration.className = "step-iteration";
+    iteration.textContent = step.iteration || `Paso ${index + 1}`;
+    
+    const vars = document.createElement("span");
+    vars.className = "step-vars";
+    vars.textContent = step.variables || step.result || "";
+    
+    header.appendChild(iteration);
+    header.appendChild(vars);
+    stepDiv.appendChild(header);
+    
+    if (step.explanation) {
+        const explanation = document.createElement("div");
+        explanation.className = "step-rule";
+        explanation.textContent = step.explanation;
+        stepDiv.appendChild(explanation);
+    }
+    
+    if (step.newVariables && step.newVariables.length > 0) {
+        const newVars = document.createElement("div");
+        newVars.className = "step-rule";
+        newVars.innerHTML = `<strong style="color: #059669;">Añadidas:</strong> ${step.newVariables.join(", ")}`;
+        newVars.style.marginTop = "4px";
+        stepDiv.appendChild(newVars);
+    }
+    
+    return stepDiv;
 }
 
 function clearSteps() {
@@ -291,19 +239,53 @@ function clearSteps() {
     stepsContent.innerHTML = '<p style="color: #94a3b8; font-style: italic; margin: 0;">Seleccione un algoritmo para ver los pasos detallados...</p>';
 }
 
+// Workspace grammars (see AppAPI.select_grammar)
+// Name used by the next load (null: the current grammar's)
+let editingName = null;
+
+function renderGrammarList(names, current) {
+    const grammarSelect = document.getElementById('grammar-select');
+    grammarSelect.innerHTML = "";
+    const options = current !== null && !names.includes(current) ? [...names, current] : names;
+    options.forEach(name => {
+        const option = document.createElement("option");
+        option.value = name;
+        option.textContent = name;
+        grammarSelect.appendChild(option);
+    });
+    if (current !== null) grammarSelect.value = current;
+}
+
+function grammarNames() {
+    return Array.from(document.getElementById('grammar-select').options, o => o.value);
+}
+
+function newGrammarName() {
+    const names = grammarNames();
+    let number = names.length + 1;
+    while (names.includes(`Gramática ${number}`)) number++;
+    return `Gramática ${number}`;
+}
+
+function resetOutput() {
+    document.getElementById('output-container').innerHTML = '<p style="color: #94a3b8; font-style: italic;">Los resultados aparecerán aquí...</p>';
+    clearSteps();
+}
+
 // Event Handlers
 async function handleLoadGrammar() {
     const grammarInput = document.getElementById("grammar-input");
     const text = grammarInput.value;
     
     try {
-        const result = appAPI.load_grammar(text);
-        const res = result.toJs({dict_converter: Object.fromEntries});
+        const res = await appAPI.load_grammar(text, editingName);
         
         if (res.status === "error") {
             showToast(res.message, true);
         } else {
             showToast("Gramática cargada correctamente.");
+            editingName = res.name;
+            renderGrammarList(res.grammars, res.name);
             renderGrammar(res.data, "Estructura Actual de la Gramática");
             clearSteps();
         }
@@ -312,29 +294,97 @@ async function handleLoadGrammar() {
     }
 }
 
-async function handleRunAlgorithm(op) {
+async function handleSelectGrammar(name) {
+    stopRun();
     try {
-        const result = appAPI.run_algorithm(op);
-        const res = result.toJs({dict_converter: Object.fromEntries});
-
+        const res = await appAPI.select_grammar(name);
         if (res.status === "error") {
             showToast(res.message, true);
+            return;
+        }
+        editingName = res.name;
+        document.getElementById("grammar-input").value = res.text;
+        renderGrammarList(res.grammars, res.name);
+        renderGrammar(res.data, "Estructura Actual de la Gramática");
+        clearSteps();
+    } catch (error) {
+        showToast("Error: " + error.message, true);
+    }
+}
+
+function handleNewGrammar() {
+    stopRun();
+    editingName = newGrammarName();
+    renderGrammarList(grammarNames(), editingName);
+    document.getElementById("grammar-input").value = "";
+    resetOutput();
+}
+
+async function handleRemoveGrammar() {
+    if (editingName === null) return;
+    stopRun();
+    try {
+        const res = await appAPI.remove_grammar(editingName);
+        editingName = res.name;
+        if (res.name !== null) {
+            await handleSelectGrammar(res.name);
         } else {
-            renderResult(res.result);
+            renderGrammarList(res.grammars, null);
+            document.getElementById("grammar-input").value = "";
+            resetOutput();
         }
     } catch (error) {
         showToast("Error: " + error.message, true);
     }
 }
 
+// Incremented on every run; the worker drops the steps of older runs
+let currentRun = 0;
+
+function handleRunAlgorithm(op) {
+    currentRun++;
+    engine.postMessage({run: currentRun, op});
+}
+
+// Stops the steps of the current run without starting another one
+function stopRun() {
+    currentRun++;
+    engine.postMessage({run: currentRun, op: null});
+}
+
+// Output of a run, sent by the worker as the result followed by chunks of steps
+function handleRunEvent(message) {
+    if (message.run !== currentRun) return;
+    
+    if (message.event === "result") {
+        renderResult(message.result);
+        startSteps(message.result.title);
+    } else if (message.event === "steps") {
+        appendSteps(message.steps);
+    } else if (message.status === "success") {
+        finishSteps();
+    } else {
+        showToast(message.message, true);
+    }
+}
+
 // Initialize when page loads
 window.addEventListener('DOMContentLoaded', () => {
-    // Initialize Pyodide
-    initializePyodide();
+    // Cache the Pyodide runtime and the app files for later visits
+    if ('serviceWorker' in navigator) {
+        navigator.serviceWorker.register('sw.js').catch(error => {
+            console.warn('Service worker no registrado:', error);
+        });
+    }
     
     // Load grammar button
     document.getElementById("load-btn").addEventListener('click', handleLoadGrammar);
     
+    // Workspace grammar controls
+    document.getElementById("grammar-select").addEventListener('change', e => handleSelectGrammar(e.target.value));
+    document.getElementById("new-grammar-btn").addEventListener('click', handleNewGrammar);
+    document.getElementById("remove-grammar-btn").addEventListener('click', handleRemoveGrammar);
+    
     // Algorithm buttons
     document.querySelectorAll(".op-btn").forEach(btn => {
         btn.addEventListener('click', function() {
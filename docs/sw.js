@@ -0,0 +1,73 @@
+// Service worker that keeps the Pyodide runtime and the app files in the
+// Cache API, so repeat visits start without downloading them again.
+//
+// - Pyodide files come from a versioned CDN URL and never change: they are
+//   precached on install and then served cache-first.
+// - The app's own files (including core.zip) are served network-first, so a
+//   new deployment is picked up immediately, falling back to the cache when
+//   offline.
+
+const PYODIDE_URL = "https://cdn.jsdelivr.net/pyodide/v0.24.1/full/";
+const RUNTIME_CACHE = "pyodide-v0.24.1";
+const APP_CACHE = "cig-app";
+
+const RUNTIME_FILES = [
+    "pyodide.js",
+    "pyodide.asm.js",
+    "pyodide.asm.wasm",
+    "python_stdlib.zip",
+    "pyodide-lock.json",
+].map(name => PYODIDE_URL + name);
+
+self.addEventListener("install", event => {
+    event.waitUntil(
+        caches.open(RUNTIME_CACHE)
+            .then(cache => Promise.all(RUNTIME_FILES.map(url =>
+                cache.add(url).catch(error => console.warn("No se precargó", url, error)))))
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener("activate", event => {
+    // Drop caches of previous Pyodide versions
+    event.waitUntil(
+        caches.keys()
+            .then(keys => Promise.all(keys
+                .filter(key => key !== RUNTIME_CACHE && key !== APP_CACHE)
+                .map(key => caches.delete(key))))
+            .then(() => self.clients.claim())
+    );
+});
+
+self.addEventListener("fetch", event => {
+    const request = event.request;
+    if (request.method !== "GET") return;
+
+    if (request.url.startsWith(PYODIDE_URL)) {
+        event.respondWith(cacheFirst(request));
+    } else if (new URL(request.url).origin === self.location.origin) {
+        event.respondWith(networkFirst(request));
+    }
+});
+
+async function cacheFirst(request) {
+    const cache = await caches.open(RUNTIME_CACHE);
+    const cached = await cache.match(request);
+    if (cached) return cached;
+    const response = await fetch(request);
+    if (response.ok) cache.put(request, response.clone());
+    return response;
+}
+
+async function networkFirst(request) {
+    const cache = await caches.open(APP_CACHE);
+    try {
+        const response = await fetch(request);
+        if (response.ok) cache.put(request, response.clone());
+        return response;
+    } catch (error) {
+        const cached = await cache.match(request);
+        if (cached) return cached;
+        throw error;
+    }
+}
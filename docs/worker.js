@@ -0,0 +1,172 @@
+// Pyodide engine running off the main thread.
+//
+// The Python core (FinalApp/core) arrives as a single archive, core.zip,
+// built by the deploy workflow. Compiled modules are kept in IndexedDB
+// (IDBFS) so repeat visits skip compiling the core; the Pyodide runtime and
+// core.zip themselves are cached by the service worker (sw.js).
+//
+// Messages from the page:
+//   {id, method, args}   Calls an AppAPI method; answered with {id, result}
+//                        or {id, error}.
+//   {run, op}            Runs an algorithm streaming its output as
+//                        {run, event: "result" | "steps" | "done", ...}.
+//                        A newer run stops the steps of the previous one;
+//                        op null only stops them.
+// Startup is reported as {event: "loading" | "ready" | "failed", message}.
+
+const PYODIDE_URL = "https://cdn.jsdelivr.net/pyodide/v0.24.1/full/";
+importScripts(PYODIDE_URL + "pyodide.js");
+
+const APP_DIR = "/home/pyodide/app";
+const PYC_DIR = "/pyc";
+
+// Methods the page may call directly
+const METHODS = new Set([
+    "load_grammar", "run_algorithm", "select_grammar", "remove_grammar", "list_grammars", "compare_grammars",
+]);
+
+let api = null;
+let currentRun = 0;
+
+function toJs(proxy) {
+    const value = proxy.toJs({dict_converter: Object.fromEntries});
+    proxy.destroy();
+    return value;
+}
+
+function syncfs(FS, populate) {
+    return new Promise((resolve, reject) => {
+        FS.syncfs(populate, error => error ? reject(error) : resolve());
+    });
+}
+
+async function fetchCore() {
+    const response = await fetch("core.zip");
+    if (!response.ok) {
+        throw new Error(`No se pudo descargar core.zip (${response.status})`);
+    }
+    return new Uint8Array(await response.arrayBuffer());
+}
+
+async function start() {
+    postMessage({event: "loading", message: "Cargando Pyodide..."});
+    const [pyodide, archive] = await Promise.all([
+        loadPyodide({indexURL: PYODIDE_URL}),
+        fetchCore(),
+    ]);
+
+    postMessage({event: "loading", message: "Cargando módulos Python..."});
+    const FS = pyodide.FS;
+    let persistent = true;
+    FS.mkdir(PYC_DIR);
+    try {
+        FS.mount(FS.filesystems.IDBFS, {}, PYC_DIR);
+        await syncfs(FS, true);
+    } catch (error) {
+        // Without IndexedDB (e.g. private browsing) the core is compiled on every visit
+        console.warn("Caché de módulos no disponible:", error);
+        persistent = false;
+    }
+    FS.writeFile("/tmp/core.zip", archive);
+
+    // The archive's timestamps are kept when unpacking, so the .pyc files
+    // stored in PYC_DIR stay valid until a new core.zip is deployed.
+    pyodide.runPython(`
+import os
+import sys
+import time
+import zipfile
+
+with zipfile.ZipFile("/tmp/core.zip") as archive:
+    for info in archive.infolist():
+        path = os.path.join("${APP_DIR}", info.filename)
+        if info.is_dir():
+            os.makedirs(path, exist_ok=True)
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(archive.read(info))
+        stamp = time.mktime(info.date_time + (0, 0, -1))
+        os.utime(path, (stamp, stamp))
+os.remove("/tmp/core.zip")
+
+sys.dont_write_bytecode = False
+sys.pycache_prefix = "${PYC_DIR}"
+sys.path.insert(0, "${APP_DIR}")
+
+from core.app_api import AppAPI
+
+api = AppAPI()
+`);
+    api = pyodide.globals.get("api");
+
+    if (persistent) {
+        syncfs(FS, false).catch(error => console.warn("No se guardó la caché de módulos:", error));
+    }
+    postMessage({event: "ready"});
+}
+
+async function runStreaming(run, op) {
+    let streamId = null;
+    try {
+        const res = toJs(api.open_stream(op));
+        if (res.status !== "success") {
+            postMessage({run, event: "done", status: res.status, message: res.message});
+            return;
+        }
+        streamId = res.stream;
+        postMessage({run, event: "result", result: res.result});
+
+        while (true) {
+            // Yield so a newer run (a later message) can supersede this one
+            await new Promise(resolve => setTimeout(resolve, 0));
+            if (run !== currentRun) {
+                api.close_stream(streamId);
+                return;
+            }
+            const chunk = toJs(api.read_stream(streamId));
+            if (chunk.status !== "success") {
+                postMessage({run, event: "done", status: chunk.status, message: chunk.message});
+                return;
+            }
+            postMessage({run, event: "steps", steps: chunk.steps});
+            if (chunk.done) break;
+        }
+        postMessage({run, event: "done", status: "success"});
+    } catch (error) {
+        if (streamId !== null) api.close_stream(streamId);
+        postMessage({run, event: "done", status: "error", message: error.message});
+    }
+}
+
+const ready = start().catch(error => {
+    postMessage({event: "failed", message: error.message});
+    throw error;
+});
+
+onmessage = async function(e) {
+    const message = e.data;
+    if (message.run !== undefined) {
+        currentRun = message.run;
+        if (message.op === null) return;
+        try {
+            await ready;
+        } catch (error) {
+            postMessage({run: message.run, event: "done", status: "error", message: error.message});
+            return;
+        }
+        if (message.run === currentRun) runStreaming(message.run, message.op);
+        return;
+    }
+
+    try {
+        await ready;
+        if (!METHODS.has(message.method)) {
+            throw new Error(`Método desconocido: ${message.method}`);
+        }
+        const result = toJs(api[message.method](...(message.args || [])));
+        postMessage({id: message.id, result});
+    } catch (error) {
+        postMessage({id: message.id, error: error.message});
+    }
+};